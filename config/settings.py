@@ -2,6 +2,8 @@
 Настройки для тестов Candy Crush Saga
 """
 
+import os
+
 # Настройки Appium
 APPIUM_CONFIG = {
     'platform_name': 'Android',
@@ -11,17 +13,201 @@ APPIUM_CONFIG = {
     'new_command_timeout': 300,
     'no_reset': True,
     'full_reset': False,
-    'server_url': 'http://localhost:4723'
+    'server_url': os.environ.get('APPIUM_SERVER_URL', 'http://localhost:4723')
 }
 
 # Настройки ожиданий
 TIMEOUTS = {
     'implicit_wait': 10,
     'explicit_wait': 15,
-    'app_launch_wait': 10,
+    'app_launch_deadline': 30,  # Максимальное ожидание готовности приложения
     'element_wait': 5
 }
 
+# Движок ожиданий (utils/waits.py)
+WAITS = {
+    'test_budget': 120,  # Суммарное время ожиданий на один тест, секунды
+    'poll_interval': 0.25,
+    'report_top_n': 10  # Сколько самых затратных условий попадает в отчет теста
+}
+
+# Признаки готовности приложения после запуска
+APP_READINESS = {
+    'poll_interval': 0.5,
+    'surface_markers': ['SurfaceView', 'UnityPlayer'],
+    'stable_frames': 2,  # Сколько подряд одинаковых кадров считаем стабильным экраном
+    'frame_diff_threshold': 2.0,  # Средняя разница яркости (0-255)
+    'frame_compare_size': (64, 64)
+}
+
+# Определение смены экрана по разнице уменьшенных скриншотов и хешу page_source
+SCREEN_CHANGE = {
+    'diff_threshold': 2.0,  # Средняя разница яркости (0-255), выше которой экран считается другим
+    'initial_poll_interval': 0.05,  # Первые опросы частые
+    'max_poll_interval': 1.0,
+    'backoff': 1.5,  # Множитель интервала после каждого опроса без изменений
+    'ignore_regions': []  # Маски анимированных областей: (x1, y1, x2, y2) в долях экрана
+}
+
+# Настройки пула драйверов
+DRIVER_POOL = {
+    'reuse_session': True,  # Одна сессия на воркер pytest вместо сессии на каждый тест
+    'reset_strategy': 'terminate_activate',  # 'terminate_activate' или 'force_stop'
+    'terminate_timeout': 5000  # мс
+}
+
+# Кэш геометрии экрана и проверка отзывчивости
+GEOMETRY_CONFIG = {
+    'probe_command': 'status',  # 'status' - GET /status сервера, 'session' - легкая команда сессии
+    'probe_buckets_ms': [10, 25, 50, 100, 250, 500, 1000]
+}
+
+# Статистика локаторов между прогонами
+LOCATOR_STATS = {
+    'stats_file': 'reports/locator_stats.json',
+    # Файл замеров только этого прогона (у каждого параллельного воркера свой, run_tests.py сливает их в stats_file)
+    'run_file': os.environ.get('LOCATOR_STATS_RUN_FILE'),
+    'prune_after_misses': 5  # Отбрасывать локатор без попаданий после стольких промахов
+}
+
+# Трассировка команд драйвера (включается также флагом pytest --trace-driver)
+TRACING = {
+    'enabled': False,
+    'top_n': 10  # Сколько самых затратных команд показать в сводке
+}
+
+# Способ захвата кадров для анализа: 'appium' - PNG через сессию, 'adb_raw' - adb exec-out screencap
+CAPTURE = {
+    'backend': os.environ.get('CAPTURE_BACKEND', 'appium'),
+    'raw_timeout': 10  # Ожидание завершения screencap, секунды
+}
+
+# Поток кадров MJPEG сервера UiAutomator2 (utils/frame_stream.py)
+FRAME_STREAM = {
+    'device_port': 7810,  # Порт MJPEG сервера UiAutomator2 на устройстве (mjpegServerPort по умолчанию)
+    'host_port': int(os.environ.get('MJPEG_HOST_PORT', 9100)),  # Порт на компьютере для adb forward
+    'framerate': 30,
+    'scaling_factor': 50,  # Масштаб кадров потока в процентах
+    'buffer_size': 300,  # Сколько последних кадров хранить
+    'change_threshold': 8.0,  # Разница яркости (0-255), с которой кадр считается изменившимся
+    'connect_timeout': 5
+}
+
+# Статистика кадра для визуальных проверок (utils/frame_stats.py)
+FRAME_STATS = {
+    'analysis_max_side': 540,  # Кадр уменьшается вдвое, пока большая сторона больше этого значения
+    'black_level': 30,  # Пиксель почти черный, если все каналы ниже
+    'white_level': 225,  # Пиксель почти белый, если все каналы выше
+    'max_black_ratio': 0.8,
+    'max_white_ratio': 0.8,
+    'min_entropy': 2.0,  # Энтропия яркости (бит) - ниже считаем экран пустым
+    'min_colourfulness': 15.0,  # Метрика Хаслера-Зюсструнка
+    'min_colorful_ratio': 0.3,  # Доля цветных (не серых, не темных, не светлых) пикселей
+    'min_game_color_ratio': 0.2,  # Доля пикселей в характерных цветах игры
+    'dominant_color_step': 30,  # Шаг группировки цветов для доминантных
+    'histogram_bins': 32,
+    # Характерные цвета Candy Crush: (min RGB, max RGB)
+    'game_color_ranges': [
+        ((180, 50, 80), (255, 180, 200)),  # Розовые/красные
+        ((50, 100, 180), (150, 200, 255)),  # Синие
+        ((200, 150, 50), (255, 255, 150)),  # Желтые/золотые
+        ((80, 180, 80), (180, 255, 180)),  # Зеленые
+        ((100, 50, 150), (200, 150, 255)),  # Фиолетовые
+        ((200, 100, 50), (255, 180, 100))  # Оранжевые
+    ]
+}
+
+# Сравнение с эталонными скриншотами (utils/visual_regression.py)
+VISUAL_REGRESSION = {
+    'baseline_dir': 'data/baselines',
+    'update_baselines': os.environ.get('UPDATE_BASELINES') == '1',  # Перезаписать эталоны текущими кадрами
+    'analysis_max_side': 540,
+    'tile_size': 16,  # Размер блока на уменьшенном кадре, пиксели
+    'tile_threshold': 12.0,  # Средняя разница яркости блока (0-255), выше которой блок изменился
+    'max_changed_ratio': 0.05,  # Допустимая доля изменившихся блоков
+    'ignore_regions': []  # Анимированные области для всех состояний: (x1, y1, x2, y2) в долях экрана
+}
+
+# Распознавание экрана по перцептивному хешу (utils/screen_recognizer.py)
+SCREEN_RECOGNITION = {
+    'index_file': 'data/screen_index.json',
+    'hash_size': 16,  # dHash 16x16 = 256 бит
+    'max_distance': 40  # Дальше этого расстояния Хэмминга экран считается неизвестным
+}
+
+# Поиск кнопок по шаблонам изображений (utils/template_locator.py)
+TEMPLATE_MATCHING = {
+    'directory': 'data/templates',
+    'reference_width': 1080,  # Ширина экрана, на котором вырезаны шаблоны
+    'scales': [0.7, 0.8, 0.9, 1.0, 1.1, 1.25, 1.4],  # Масштабы относительно reference_width
+    'analysis_max_side': 640,  # Грубый поиск по всем масштабам на уменьшенном кадре
+    'refine_margin': 8,  # Запас окна уточнения на полном кадре, px
+    'threshold': 0.8,  # Минимальная корреляция для совпадения
+    'verify_threshold': 0.75  # Корреляция в закэшированной позиции, при которой поиск не повторяется
+}
+
+# Распознавание игрового поля (utils/board_recognizer.py)
+BOARD_RECOGNITION = {
+    'rows': 9,
+    'cols': 9,
+    'analysis_max_side': 640,  # Кадр уменьшается в целое число раз до этой стороны
+    'min_saturation': 60,  # Насыщенность (max - min канала) пикселя конфеты
+    'min_brightness': 80,
+    'min_density': 0.25,  # Доля пикселей конфет в строке (столбце) поля
+    'max_gap': 0.03,  # Промежуток между конфетами в долях кадра, не разрывающий поле
+    'cell_sample': 0.5,  # Центральная доля клетки, по которой берется цвет
+    'sample_points': 4,  # Точек на сторону выборки в клетке
+    'max_color_distance': 110,  # Дальше от всех цветов палитры - клетка не распознана
+    'candy_colors': {
+        'red': (220, 30, 40),
+        'orange': (250, 140, 20),
+        'yellow': (250, 215, 30),
+        'green': (60, 180, 50),
+        'blue': (30, 120, 230),
+        'purple': (150, 60, 200)
+    }
+}
+
+# Выбор хода на поле (utils/board_moves.py)
+MOVE_SELECTION = {
+    'heuristic': 'bottom'  # cleared / special / bottom - см. HEURISTICS
+}
+
+# Модель поля для тестов без устройства (pages/board_simulator.py)
+BOARD_SIMULATION = {
+    'rows': 9,
+    'cols': 9,
+    'colors': 6,
+    'seed': 42,
+    'max_cascades': 50  # Ограничение волн удаления на один ход
+}
+
+# Частота кадров по SurfaceFlinger (utils/frame_timing.py)
+FRAME_TIMING = {
+    'settle_time': 1.5,  # Сколько собирать кадры после действия, с
+    'poll_interval': 0.5,  # Наибольший интервал чтения буфера во время действия и ожидания, с
+    'buffer_frames': 127,  # Сколько кадров хранит буфер SurfaceFlinger
+    'jank_factor': 1.5,  # Кадр дольше 1.5 периода обновления - рывок
+    'default_period_ns': 16666667,
+    'min_fps': 20,  # Взаимодействие плавное при FPS не ниже
+    'max_jank_ratio': 0.2  # и доле рывков не выше
+}
+
+# Память процесса игры из dumpsys meminfo (utils/memory_sampler.py)
+MEMORY_SAMPLING = {
+    'interval': 1.0,  # Шаг сбора, с
+    'max_pss_growth_percent': 50,  # Допустимый рост PSS за тест
+    'max_java_heap_growth_percent': 100,  # Допустимый рост Java heap за тест
+    'min_samples': 3
+}
+
+# Фоновая запись скриншотов
+SCREENSHOTS = {
+    'directory': 'reports',
+    'writer_workers': 2,
+    'max_pending': 8  # Больше незаписанных кадров - тест ждет (ограничение памяти)
+}
+
 # Настройки отчетов
 REPORTS = {
     'screenshot_on_failure': True,
@@ -33,5 +219,16 @@ REPORTS = {
 DEVICE_CONFIG = {
     'device_name': 'Android Emulator',
     'platform_version': '11.0',  # Можно изменить под свою версию
-    'udid': None  # Автоопределение
+    'udid': os.environ.get('DEVICE_UDID'),  # None - автоопределение
+    'system_port': int(os.environ['APPIUM_SYSTEM_PORT']) if os.environ.get('APPIUM_SYSTEM_PORT') else None
+}
+
+# Параллельный запуск на нескольких устройствах (run_tests.py --parallel)
+PARALLEL_CONFIG = {
+    'base_appium_port': 4723,  # Порт Appium для первого устройства, дальше +1
+    'base_system_port': 8200,  # systemPort UiAutomator2 для первого устройства, дальше +1
+    'base_mjpeg_port': 9100,  # Порт adb forward для потока кадров первого устройства, дальше +1
+    'durations_file': os.environ.get('TEST_DURATIONS_FILE', 'reports/test_durations.json'),
+    'default_test_duration': 30,  # Оценка для тестов без истории, секунды
+    'duration_smoothing': 0.5  # Вес нового замера при обновлении истории
 }
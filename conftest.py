@@ -1,40 +1,132 @@
 import pytest
-import time
 import os
-from appium import webdriver
-from appium.options.android import UiAutomator2Options
-from config.settings import APPIUM_CONFIG, TIMEOUTS
+from utils.driver_pool import DriverPool
+from utils.test_durations import save_durations
+from utils.tracing import CommandTracer, TracingDriver, print_trace_summary
+from utils.screen_geometry import get_screen_geometry
+from utils.locator_stats import save_locator_stats
+from utils.waits import start_test_waits
+from utils.screenshot_writer import get_screenshot_writer, shutdown_screenshot_writer
+from utils.frame_stream import FrameStream
+from utils.memory_sampler import MemorySampler
+from config.settings import DEVICE_CONFIG, TRACING
 
-@pytest.fixture
-def driver():
-    """Создание драйвера для тестов"""
-    
-    # Настройки для Android из конфига
-    options = UiAutomator2Options()
-    options.platform_name = APPIUM_CONFIG['platform_name']
-    options.app_package = APPIUM_CONFIG['app_package']
-    options.app_activity = APPIUM_CONFIG['app_activity']
-    options.automation_name = APPIUM_CONFIG['automation_name']
-    options.new_command_timeout = APPIUM_CONFIG['new_command_timeout']
-    options.no_reset = APPIUM_CONFIG['no_reset']
-    options.full_reset = APPIUM_CONFIG['full_reset']
-    
-    # Подключение к Appium серверу
-    driver = webdriver.Remote(
-        command_executor=APPIUM_CONFIG['server_url'],
-        options=options
+# Длительности тестов текущего прогона (для шардирования в run_tests.py)
+_test_durations = {}
+# Пропущенные и упавшие тесты: их длительность не отражает обычный прогон
+_unrepresentative_tests = set()
+
+def pytest_addoption(parser):
+    """Дополнительные параметры командной строки"""
+    parser.addoption(
+        "--trace-driver", action="store_true", default=TRACING['enabled'],
+        help="Трассировать команды драйвера и паузы (Chrome trace рядом с HTML отчетом)"
     )
+
+def trace_dir(config):
+    """Папка для трасс: рядом с HTML отчетом или reports/"""
+    html_path = config.getoption("htmlpath", None)
+    directory = os.path.dirname(html_path) if html_path else "reports"
+    return directory or "."
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Пул драйверов: одна сессия Appium на воркер pytest"""
+    pool = DriverPool()
+    
+    yield pool
+    
+    # Закрываем сессию после всех тестов
+    pool.close()
+
+@pytest.fixture
+def driver(request, driver_pool):
+    """Драйвер для теста со сброшенным состоянием приложения"""
+    driver, setup_time = driver_pool.acquire()
+    
+    # Время подготовки попадает в отчет теста
+    request.node.user_properties.append(("driver_setup_time", round(setup_time, 3)))
+    launch_time = driver_pool.last_launch_time
+    request.node.user_properties.append(("app_launch_time", round(launch_time, 3) if launch_time is not None else None))
+    request.node.user_properties.append(("app_ready", launch_time is not None))
+    if launch_time is not None:
+        print(f"\n⏱️ Подготовка драйвера: {setup_time:.2f}с (запуск приложения {launch_time:.2f}с)")
+    else:
+        print(f"\n⚠️ Подготовка драйвера: {setup_time:.2f}с, приложение не стало готовым")
     
-    # Настройка implicit wait
-    driver.implicitly_wait(TIMEOUTS['implicit_wait'])
+    # Обертка, замеряющая каждую команду и паузу теста
+    tracer = None
+    if request.config.getoption("--trace-driver"):
+        tracer = CommandTracer(request.node.name)
+        tracer.patch_sleep()
+        driver = TracingDriver(driver, tracer)
     
-    # Ждем загрузки приложения
-    time.sleep(TIMEOUTS['app_launch_wait'])
+    # Приложение перезапущено - геометрию экрана запрашиваем заново
+    geometry = get_screen_geometry(driver)
+    geometry.invalidate()
+    geometry.reset_probes()
+    
+    # Бюджет ожиданий и метрики - отдельно на каждый тест
+    waits = start_test_waits(driver)
     
     yield driver
     
-    # Закрываем драйвер после тестов
-    driver.quit()
+    try:
+        wait_summary = waits.summary()
+        request.node.user_properties.append(("wait_time", wait_summary['total_wait_time']))
+        request.node.user_properties.append(("wait_conditions", wait_summary['conditions']))
+        print(f"\n⏳ Ожидания теста: {wait_summary['total_wait_time']:.2f}с")
+        
+        # Все скриншоты теста должны быть на диске до следующего теста
+        get_screenshot_writer().flush()
+        
+        if geometry.probe_latencies:
+            request.node.user_properties.append(("probe_latency_histogram", geometry.probe_histogram()))
+        
+        if tracer:
+            tracer.restore_sleep()
+            trace_path = tracer.export(trace_dir(request.config))
+            request.node.user_properties.append(("driver_trace", trace_path))
+            print(f"\n🔬 Трасса команд: {trace_path}")
+    finally:
+        # Даже при ошибке отчета: time.sleep возвращается, сессия освобождается для следующего теста
+        if tracer:
+            tracer.restore_sleep()
+        driver_pool.release()
+
+@pytest.fixture
+def frame_stream(driver):
+    """Поток кадров MJPEG на время теста (None, если поток недоступен)"""
+    stream = FrameStream(driver)
+    try:
+        stream.start()
+    except Exception as e:
+        print(f"\n⚠️ Поток кадров недоступен: {e}")
+        yield None
+        return
+    
+    try:
+        yield stream
+        print(f"\n🎞️ Поток кадров: получено {stream.received}, {stream.fps():.1f} кадров/сек")
+    finally:
+        stream.stop()
+
+@pytest.fixture
+def memory_sampler(driver, request):
+    """Сбор dumpsys meminfo игры в фоне на время теста; ряд - в reports/*.json и в отчет"""
+    sampler = MemorySampler(udid=DEVICE_CONFIG['udid']).start()
+    
+    yield sampler
+    
+    sampler.stop()
+    summary = sampler.summary()
+    path = sampler.save(f"memory_{request.node.name}")
+    
+    request.node.user_properties.append(("memory_summary", summary))
+    request.node.user_properties.append(("memory_series", [(s['timestamp'], s['pss_total']) for s in sampler.samples
+                                                            if 'pss_total' in s]))
+    request.node.user_properties.append(("memory_samples_file", path))
+    print(f"\n💾 Образцов памяти: {summary['samples']}, ряд сохранен: {path}")
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_run():
@@ -59,10 +151,41 @@ def pytest_runtest_makereport(item, call):
         driver = item.funcargs.get('driver')
         if driver:
             # Делаем скриншот при падении теста
-            screenshot_name = f"FAILED_{item.name}_{int(time.time())}"
-            screenshot_path = f"reports/{screenshot_name}.png"
             try:
-                driver.save_screenshot(screenshot_path)
+                screenshot_path = get_screenshot_writer().capture(driver, f"FAILED_{item.name}")
                 print(f"\n📸 Скриншот ошибки сохранен: {screenshot_path}")
             except Exception as e:
                 print(f"\n❌ Не удалось сделать скриншот: {e}")
+
+def pytest_runtest_logreport(report):
+    """Копим длительность setup+call+teardown каждого теста"""
+    if report.skipped or report.failed:
+        _unrepresentative_tests.add(report.nodeid)
+    _test_durations[report.nodeid] = _test_durations.get(report.nodeid, 0) + report.duration
+
+def pytest_sessionfinish(session, exitstatus):
+    """Сохраняем длительности и статистику локаторов для следующих прогонов"""
+    # В историю попадают только прошедшие тесты
+    measured = {nodeid: duration for nodeid, duration in _test_durations.items()
+                if nodeid not in _unrepresentative_tests}
+    if measured:
+        try:
+            save_durations(measured)
+        except Exception as e:
+            print(f"\n⚠️ Не удалось сохранить длительности тестов: {e}")
+    
+    shutdown_screenshot_writer()
+    
+    try:
+        save_locator_stats()
+    except Exception as e:
+        print(f"\n⚠️ Не удалось сохранить статистику локаторов: {e}")
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Сводка самых затратных команд драйвера и бесполезных локаторов"""
+    if config.getoption("--trace-driver"):
+        print_trace_summary(TRACING['top_n'])
+    
+    stats = save_locator_stats()
+    if stats is not None:
+        stats.print_report()
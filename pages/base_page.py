@@ -2,37 +2,44 @@
 Базовый класс для всех страниц приложения
 """
 
-import time
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from .gestures import GestureBatch
+from utils.screen_geometry import get_screen_geometry
+from utils.page_snapshot import PageSnapshot
+from utils.locator_stats import get_locator_stats
+from utils.screenshot_writer import get_screenshot_writer
+from utils.screen_recognizer import get_screen_recognizer
+from utils.template_locator import TEMPLATE, get_template_locator
+from utils.waits import get_wait_engine, presence, all_present
 
 class BasePage:
     """Базовый класс для всех Page Object классов"""
     
+    # Метка экрана в индексе распознавания (data/screen_index.json)
+    SCREEN_LABEL = None
+    
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+    
+    @property
+    def waits(self):
+        """Движок ожиданий текущего теста"""
+        return get_wait_engine(self.driver)
         
     def find_element(self, by, value, timeout=10):
         """Найти элемент с ожиданием"""
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            return wait.until(EC.presence_of_element_located((by, value)))
-        except TimeoutException:
+        element = self.waits.until(f"{by}={value}", presence(by, value), timeout)
+        if element is None:
             print(f"❌ Элемент не найден: {by}={value}")
-            return None
+        return element
     
     def find_elements(self, by, value, timeout=10):
         """Найти все элементы с ожиданием"""
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located((by, value)))
-            return self.driver.find_elements(by, value)
-        except TimeoutException:
+        elements = self.waits.until(f"{by}={value}", all_present(by, value), timeout)
+        if not elements:
             print(f"❌ Элементы не найдены: {by}={value}")
             return []
+        return elements
     
     def click_element(self, by, value, timeout=10):
         """Кликнуть на элемент с ожиданием"""
@@ -49,22 +56,94 @@ class BasePage:
     
     def wait_for_element(self, by, value, timeout=10):
         """Ждать появления элемента"""
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            wait.until(EC.presence_of_element_located((by, value)))
+        if self.waits.until(f"{by}={value}", presence(by, value), timeout) is not None:
             print(f"✅ Элемент появился: {by}={value}")
             return True
-        except TimeoutException:
-            print(f"❌ Элемент не появился за {timeout}с: {by}={value}")
-            return False
+        print(f"❌ Элемент не появился за {timeout}с: {by}={value}")
+        return False
+    
+    def find_template(self, name):
+        """Найти кнопку по шаблону на текущем кадре: TemplateMatch в координатах окна или None"""
+        try:
+            return get_template_locator().find(self.driver, name, self.SCREEN_LABEL or type(self).__name__,
+                                               self.screen_size())
+        except Exception as e:
+            print(f"⚠️ Поиск по шаблону {name} не удался: {e}")
+            return None
+    
+    def tap_point(self, template_name, fallback):
+        """Точка тапа по шаблону, а если он не найден - по долям экрана fallback (x, y)"""
+        match = self.find_template(template_name)
+        if match:
+            print(f"🎯 {template_name} найден по шаблону: {match.center} (совпадение {match.score:.2f})")
+            return match.center
+        
+        size = self.screen_size()
+        print(f"⚠️ Шаблон {template_name} не найден, координаты по долям экрана {fallback}")
+        return int(size['width'] * fallback[0]), int(size['height'] * fallback[1])
+    
+    def _locator_condition(self, condition, by, value):
+        """Условие для локатора: шаблоны ищутся по кадру экрана, остальные - через драйвер"""
+        if by != TEMPLATE:
+            return condition(by, value)
+        
+        def template_condition(driver):
+            match = self.find_template(value)
+            if condition is all_present:
+                return [match] if match else []
+            return match
+        return template_condition
+    
+    def _wait_ranked_locators(self, list_name, condition, timeout):
+        """Общий опрос всех локаторов списка в порядке статистики, запись попаданий и промахов"""
+        stats = get_locator_stats()
+        screen = type(self).__name__
+        ranked = stats.rank(screen, list_name, getattr(self, list_name))
+        
+        conditions = [(f"{by}={value}", self._locator_condition(condition, by, value)) for i, (by, value) in ranked]
+        found_name, found_value = self.waits.wait_any(conditions, timeout)
+        
+        # Промахи - локаторы, проверенные раньше сработавшего (или все, если ничего не нашлось)
+        for (i, locator), (name, _) in zip(ranked, conditions):
+            hit = name == found_name
+            stats.record(screen, list_name, locator, hit, self.waits.last_eval_times[name])
+            if hit:
+                return i, found_value
+        
+        return None, found_value
+    
+    def find_by_locators(self, list_name, timeout=3):
+        """Найти элемент по списку локаторов (порядок - по успешности прошлых прогонов)
+        
+        Все локаторы опрашиваются в одном цикле ожидания.
+        Возвращает (номер локатора в исходном списке, элемент) или (None, None)
+        """
+        return self._wait_ranked_locators(list_name, presence, timeout)
+    
+    def find_all_by_locators(self, list_name, timeout=3):
+        """Как find_by_locators, но возвращает все элементы первого сработавшего локатора"""
+        i, elements = self._wait_ranked_locators(list_name, all_present, timeout)
+        return i, elements or []
+    
+    def is_screen(self):
+        """Распознать экран по кадру: True/False, или None если распознать нельзя"""
+        recognizer = get_screen_recognizer()
+        if not self.SCREEN_LABEL or not recognizer.index.has_label(self.SCREEN_LABEL):
+            return None
+        
+        try:
+            label, distance = recognizer.recognize(self.driver)
+        except Exception as e:
+            print(f"⚠️ Не удалось распознать экран: {e}")
+            return None
+        
+        if label is None:
+            return None
+        return label == self.SCREEN_LABEL
     
     def is_element_present(self, by, value):
         """Проверить присутствие элемента без ожидания"""
-        try:
-            self.driver.find_element(by, value)
-            return True
-        except NoSuchElementException:
-            return False
+        return self.waits.check(f"{by}={value}", presence(by, value)) is not None
     
     def get_all_clickable_elements(self):
         """Получить все кликабельные элементы на экране"""
@@ -72,18 +151,29 @@ class BasePage:
     
     def take_screenshot(self, name="screenshot"):
         """Сделать скриншот экрана"""
-        filename = f"reports/{name}_{int(time.time())}.png"
-        self.driver.save_screenshot(filename)
+        filename = get_screenshot_writer().capture(self.driver, name)
         print(f"📸 Скриншот сохранен: {filename}")
         return filename
     
+    def snapshot(self):
+        """Снимок экрана: один page_source, локаторы проверяются локально"""
+        return PageSnapshot.capture(self.driver)
+    
     def get_page_source(self):
         """Получить исходный код страницы для отладки"""
         return self.driver.page_source
     
+    def screen_size(self):
+        """Размер экрана из кэша геометрии сессии"""
+        return get_screen_geometry(self.driver).window_size()
+    
+    def gesture_batch(self, max_pointers=2):
+        """Начать пакет жестов, который уйдет на устройство одним запросом"""
+        return GestureBatch(self.driver, max_pointers)
+    
     def scroll_down(self):
         """Прокрутить экран вниз"""
-        size = self.driver.get_window_size()
+        size = self.screen_size()
         start_x = size['width'] // 2
         start_y = size['height'] * 0.8
         end_y = size['height'] * 0.2
@@ -92,7 +182,7 @@ class BasePage:
     
     def scroll_up(self):
         """Прокрутить экран вверх"""
-        size = self.driver.get_window_size()
+        size = self.screen_size()
         start_x = size['width'] // 2
         start_y = size['height'] * 0.2
         end_y = size['height'] * 0.8
@@ -0,0 +1,136 @@
+"""
+Модель поля "три в ряд" без устройства: обмен, совпадения, удаление, падение, досыпание и каскады
+"""
+
+import numpy as np
+from config.settings import BOARD_SIMULATION
+
+# Пустая клетка (как в utils.board_recognizer)
+EMPTY = 0
+
+
+def as_boards(boards):
+    """Поле (R, C) или пакет полей (N, R, C) -> пакет int8"""
+    boards = np.array(boards, dtype=np.int8)
+    return boards[np.newaxis] if boards.ndim == 2 else boards
+
+def find_matches(boards):
+    """Маска клеток в линиях из 3+ одинаковых конфет для пакета полей"""
+    mask = np.zeros(boards.shape, dtype=bool)
+
+    horizontal = (boards[:, :, :-2] > EMPTY) & (boards[:, :, :-2] == boards[:, :, 1:-1]) & \
+                 (boards[:, :, 1:-1] == boards[:, :, 2:])
+    for offset in range(3):
+        mask[:, :, offset:offset + horizontal.shape[2]] |= horizontal
+
+    vertical = (boards[:, :-2] > EMPTY) & (boards[:, :-2] == boards[:, 1:-1]) & (boards[:, 1:-1] == boards[:, 2:])
+    for offset in range(3):
+        mask[:, offset:offset + vertical.shape[1]] |= vertical
+
+    return mask
+
+def apply_gravity(boards):
+    """Конфеты падают вниз по столбцам, пустые клетки поднимаются наверх (порядок конфет сохраняется)"""
+    order = np.argsort(boards != EMPTY, axis=1, kind='stable')
+    return np.take_along_axis(boards, order, axis=1)
+
+def parse_moves(moves, count):
+    """Ходы {"from": [r, c], "to": [r, c]} (один на все поля или по одному на поле) -> массив (N, 2, 2)"""
+    if isinstance(moves, dict):
+        moves = [moves] * count
+    return np.array([[move['from'], move['to']] for move in moves], dtype=np.intp).reshape(count, 2, 2)
+
+def legal_swaps(boards, moves):
+    """Ход в пределах поля и между соседними непустыми клетками"""
+    rows, cols = boards.shape[1:]
+    inside = ((moves[:, :, 0] >= 0) & (moves[:, :, 0] < rows) & (moves[:, :, 1] >= 0) & (moves[:, :, 1] < cols)).all(axis=1)
+    adjacent = np.abs(moves[:, 0] - moves[:, 1]).sum(axis=1) == 1
+
+    legal = inside & adjacent
+    index = np.arange(len(boards))
+    clipped = np.clip(moves, 0, [rows - 1, cols - 1])
+    first = boards[index, clipped[:, 0, 0], clipped[:, 0, 1]]
+    second = boards[index, clipped[:, 1, 0], clipped[:, 1, 1]]
+    return legal & (first != EMPTY) & (second != EMPTY)
+
+
+class BoardSimulator:
+    """Детерминированная модель полей: одно зерно - одинаковые досыпания и каскады"""
+
+    def __init__(self, colors=None, seed=None):
+        self.colors = colors or BOARD_SIMULATION['colors']
+        self.seed = BOARD_SIMULATION['seed'] if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+
+    def refill(self, boards):
+        """Заполнить пустые клетки случайными конфетами"""
+        empty = boards == EMPTY
+        boards[empty] = self.rng.integers(1, self.colors + 1, int(empty.sum()), dtype=np.int8)
+        return boards
+
+    def random_boards(self, count=1, rows=None, cols=None):
+        """Пакет случайных полей без готовых совпадений"""
+        rows = rows or BOARD_SIMULATION['rows']
+        cols = cols or BOARD_SIMULATION['cols']
+        boards = self.rng.integers(1, self.colors + 1, (count, rows, cols), dtype=np.int8)
+
+        # Перегенерировать клетки совпадений, пока они есть
+        matches = find_matches(boards)
+        while matches.any():
+            boards[matches] = self.rng.integers(1, self.colors + 1, int(matches.sum()), dtype=np.int8)
+            matches = find_matches(boards)
+        return boards
+
+    def resolve(self, boards):
+        """Удалять совпадения, ронять и досыпать конфеты до стабильного поля
+
+        Возвращает (поля, убрано конфет на поле, число каскадов на поле).
+        """
+        cleared = np.zeros(len(boards), dtype=np.int32)
+        cascades = np.zeros(len(boards), dtype=np.int32)
+
+        for _ in range(BOARD_SIMULATION['max_cascades']):
+            matches = find_matches(boards)
+            matched = matches.any(axis=(1, 2))
+            if not matched.any():
+                break
+
+            cleared += matches.sum(axis=(1, 2))
+            cascades += matched
+            boards[matches] = EMPTY
+            # Падение и досыпание только там, где что-то удалено
+            boards[matched] = self.refill(apply_gravity(boards[matched]))
+
+        return boards, cleared, cascades
+
+    def play(self, boards, moves):
+        """Сделать ход на каждом поле пакета
+
+        Ход без совпадения отменяется (как в игре). Возвращает словарь:
+        boards - поля после хода, valid - ход засчитан, cleared - убрано конфет, cascades - волн удаления.
+        """
+        boards = as_boards(boards).copy()
+        moves = parse_moves(moves, len(boards))
+        index = np.arange(len(boards))
+
+        legal = legal_swaps(boards, moves)
+        swapped = boards.copy()
+        (r1, c1), (r2, c2) = moves[legal, 0].T, moves[legal, 1].T
+        swapped[index[legal], r1, c1], swapped[index[legal], r2, c2] = \
+            boards[index[legal], r2, c2], boards[index[legal], r1, c1]
+
+        valid = legal & find_matches(swapped).any(axis=(1, 2))
+        boards[valid] = swapped[valid]
+
+        result_boards, cleared, cascades = self.resolve(boards)
+        return {'boards': result_boards, 'valid': valid, 'cleared': cleared, 'cascades': cascades}
+
+    def play_move(self, board, move):
+        """Один ход на одном поле: {'board', 'valid', 'cleared', 'cascades'}"""
+        result = self.play(board, move)
+        return {
+            'board': result['boards'][0],
+            'valid': bool(result['valid'][0]),
+            'cleared': int(result['cleared'][0]),
+            'cascades': int(result['cascades'][0])
+        }
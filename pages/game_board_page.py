@@ -2,12 +2,35 @@
 Page Object для игрового поля Candy Crush Saga
 """
 
+import random
+import re
 from appium.webdriver.common.appiumby import AppiumBy
+from utils.board_moves import find_moves
+from utils.board_recognizer import recognize_board
+from utils.frames import Frame
+from utils.template_locator import TEMPLATE
 from .base_page import BasePage
 
+
+def parse_moves(text):
+    """Количество ходов из текста счетчика"""
+    numbers = re.findall(r'\d+', text or '')
+    return int(numbers[0]) if numbers else None
+
+def parse_score(text):
+    """Счет из текста (запятые-разделители убираются)"""
+    numbers = re.findall(r'[\d,]+', text or '')
+    for number in numbers:
+        digits = number.replace(',', '')
+        if digits:
+            return int(digits)
+    return None
+
 class GameBoardPage(BasePage):
     """Класс для работы с игровым полем"""
     
+    SCREEN_LABEL = 'game_board'
+    
     # Локаторы игровых элементов
     GAME_BOARD_LOCATORS = [
         (AppiumBy.XPATH, "//*[contains(@resource-id, 'game') or contains(@resource-id, 'board')]"),
@@ -31,15 +54,24 @@ class GameBoardPage(BasePage):
         (AppiumBy.XPATH, "//*[contains(@content-desc, 'pause') or contains(@content-desc, 'Pause')]"),
         (AppiumBy.XPATH, "//*[contains(@text, 'Pause')]"),
         (AppiumBy.XPATH, "//*[contains(@resource-id, 'pause')]"),
+        (TEMPLATE, 'pause_button'),
     ]
     
     def __init__(self, driver):
         super().__init__(driver)
+        # Геометрия поля из последнего распознавания (клетка -> координаты окна)
+        self.board_geometry = None
         
     def is_displayed(self):
         """Проверить что игровое поле отображается"""
         print("🔍 Проверяем отображение игрового поля...")
         
+        # Сначала распознаем экран по одному кадру, XPath - только если экран неизвестен
+        recognized = self.is_screen()
+        if recognized is not None:
+            print("✅ Игровое поле отображается" if recognized else "❌ Игровое поле не найдено")
+            return recognized
+        
         # Ищем признаки игрового поля
         game_board = self.find_game_board()
         moves_counter = self.find_moves_counter()
@@ -59,12 +91,11 @@ class GameBoardPage(BasePage):
         """Найти игровое поле"""
         print("🔍 Ищем игровое поле...")
         
-        for i, (by, value) in enumerate(self.GAME_BOARD_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Игровое поле найдено способом {i+1}")
-                return element
-                
+        i, element = self.find_by_locators('GAME_BOARD_LOCATORS')
+        if element:
+            print(f"✅ Игровое поле найдено способом {i+1}")
+            return element
+            
         print("❌ Игровое поле не найдено")
         return None
     
@@ -72,12 +103,11 @@ class GameBoardPage(BasePage):
         """Найти счетчик ходов"""
         print("🔍 Ищем счетчик ходов...")
         
-        for i, (by, value) in enumerate(self.MOVES_COUNTER_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Счетчик ходов найден способом {i+1}")
-                return element
-                
+        i, element = self.find_by_locators('MOVES_COUNTER_LOCATORS')
+        if element:
+            print(f"✅ Счетчик ходов найден способом {i+1}")
+            return element
+            
         print("❌ Счетчик ходов не найден")
         return None
     
@@ -85,12 +115,11 @@ class GameBoardPage(BasePage):
         """Найти счет"""
         print("🔍 Ищем счет...")
         
-        for i, (by, value) in enumerate(self.SCORE_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Счет найден способом {i+1}")
-                return element
-                
+        i, element = self.find_by_locators('SCORE_LOCATORS')
+        if element:
+            print(f"✅ Счет найден способом {i+1}")
+            return element
+            
         print("❌ Счет не найден")
         return None
     
@@ -99,12 +128,9 @@ class GameBoardPage(BasePage):
         moves_element = self.find_moves_counter()
         if moves_element:
             try:
-                moves_text = moves_element.get_attribute('text') or ''
                 # Извлекаем число из текста
-                import re
-                numbers = re.findall(r'\d+', moves_text)
-                if numbers:
-                    moves = int(numbers[0])
+                moves = parse_moves(moves_element.get_attribute('text'))
+                if moves is not None:
                     print(f"📊 Количество ходов: {moves}")
                     return moves
             except Exception as e:
@@ -118,13 +144,9 @@ class GameBoardPage(BasePage):
         score_element = self.find_score()
         if score_element:
             try:
-                score_text = score_element.get_attribute('text') or ''
-                # Извлекаем число из текста
-                import re
-                numbers = re.findall(r'[\d,]+', score_text)
-                if numbers:
-                    # Убираем запятые и конвертируем в число
-                    score = int(numbers[0].replace(',', ''))
+                # Извлекаем число из текста, запятые убираем
+                score = parse_score(score_element.get_attribute('text'))
+                if score is not None:
                     print(f"📊 Текущий счет: {score}")
                     return score
             except Exception as e:
@@ -133,14 +155,84 @@ class GameBoardPage(BasePage):
         print("❌ Не удалось получить счет")
         return None
     
+    def read_board(self):
+        """Распознать поле по одному кадру: (матрица конфет, геометрия в координатах окна) или (None, None)"""
+        try:
+            with Frame.capture(self.driver) as frame:
+                grid, geometry = recognize_board(frame.image)
+                image_size = frame.size
+        except Exception as e:
+            print(f"❌ Ошибка распознавания поля: {e}")
+            return None, None
+        
+        if grid is None:
+            print("❌ Игровое поле на кадре не найдено")
+            return None, None
+        
+        self.board_geometry = geometry.scaled(image_size, self.screen_size())
+        return grid, self.board_geometry
+    
+    def make_move(self, move, geometry=None):
+        """Сделать ход {"from": [row, col], "to": [row, col]} свайпом между центрами клеток"""
+        geometry = geometry or self.board_geometry
+        if geometry is None:
+            grid, geometry = self.read_board()
+            if geometry is None:
+                return False
+        
+        (from_row, from_col), (to_row, to_col) = move['from'], move['to']
+        if not (geometry.contains(from_row, from_col) and geometry.contains(to_row, to_col)):
+            print(f"❌ Ход за пределами поля {geometry.rows}x{geometry.cols}: {move}")
+            return False
+        if abs(from_row - to_row) + abs(from_col - to_col) != 1:
+            print(f"❌ Клетки хода не соседние: {move}")
+            return False
+        
+        start_x, start_y = geometry.cell_center(from_row, from_col)
+        end_x, end_y = geometry.cell_center(to_row, to_col)
+        
+        try:
+            self.driver.swipe(start_x, start_y, end_x, end_y, 300)
+            print(f"✅ Ход {move['from']} -> {move['to']}")
+            return True
+        except Exception as e:
+            print(f"❌ Ошибка при свайпе: {e}")
+            return False
+    
+    def make_smart_move(self, heuristic=None):
+        """Сделать лучший по эвристике ход из всех, дающих совпадение"""
+        print("🧠 Ищем лучший ход...")
+        
+        grid, geometry = self.read_board()
+        if grid is None:
+            return self.make_random_move()
+        
+        moves = find_moves(grid, heuristic)
+        if not moves:
+            print("⚠️ Ходов с совпадением не найдено, делаем случайный ход")
+            return self.make_random_move()
+        
+        score, move = moves[0]
+        print(f"🧠 Ходов с совпадением: {len(moves)}, лучший {move['from']} -> {move['to']} (оценка {score:.1f})")
+        return self.make_move(move, geometry)
+    
     def make_random_move(self):
         """Сделать случайный ход на игровом поле"""
         print("🎮 Пытаемся сделать случайный ход...")
         
-        # Получаем размер экрана
-        size = self.driver.get_window_size()
+        grid, geometry = self.read_board()
+        if geometry is not None:
+            # Случайная клетка и соседняя с ней по горизонтали или вертикали
+            if random.random() < 0.5:
+                row, col = random.randrange(geometry.rows), random.randrange(geometry.cols - 1)
+                move = {"from": [row, col], "to": [row, col + 1]}
+            else:
+                row, col = random.randrange(geometry.rows - 1), random.randrange(geometry.cols)
+                move = {"from": [row, col], "to": [row + 1, col]}
+            return self.make_move(move, geometry)
         
-        # Предполагаем что игровое поле занимает центральную часть экрана
+        # Поле не распознано - свайп в центре экрана
+        size = self.screen_size()
         center_x = size['width'] // 2
         center_y = size['height'] // 2
         
@@ -162,23 +254,40 @@ class GameBoardPage(BasePage):
         """Кликнуть на кнопку паузы"""
         print("⏸️ Пытаемся поставить на паузу...")
         
-        for i, (by, value) in enumerate(self.PAUSE_BUTTON_LOCATORS):
-            if self.click_element(by, value, timeout=3):
+        i, element = self.find_by_locators('PAUSE_BUTTON_LOCATORS')
+        if element:
+            try:
+                element.click()
                 print(f"✅ Кликнули на паузу способом {i+1}")
                 return True
-                
+            except Exception as e:
+                print(f"❌ Не удалось кликнуть на паузу: {e}")
+                return False
+            
         print("❌ Кнопка паузы не найдена")
         return False
     
     def get_game_state_info(self):
         """Получить информацию о состоянии игры"""
+        # Один page_source вместо отдельного поиска каждого элемента на устройстве
+        snapshot = self.snapshot()
+        matches = snapshot.evaluate_locators(self)
+        
+        board_index, board = matches['GAME_BOARD_LOCATORS']
+        moves_index, moves = matches['MOVES_COUNTER_LOCATORS']
+        score_index, score = matches['SCORE_LOCATORS']
+        
+        for name, index in [("Игровое поле", board_index), ("Счетчик ходов", moves_index), ("Счет", score_index)]:
+            if index is not None:
+                print(f"✅ {name} найден способом {index+1}")
+        
         info = {
-            'has_game_board': self.find_game_board() is not None,
-            'has_moves_counter': self.find_moves_counter() is not None,
-            'has_score': self.find_score() is not None,
-            'moves_count': self.get_moves_count(),
-            'current_score': self.get_score(),
-            'clickable_elements_count': len(self.get_all_clickable_elements())
+            'has_game_board': bool(board),
+            'has_moves_counter': bool(moves),
+            'has_score': bool(score),
+            'moves_count': parse_moves(moves[0].text) if moves else None,
+            'current_score': parse_score(score[0].text) if score else None,
+            'clickable_elements_count': len(snapshot.find_all("//*[@clickable='true']"))
         }
         
         print(f"📊 Состояние игры:")
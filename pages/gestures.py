@@ -0,0 +1,115 @@
+"""
+Пакетные жесты: серия тапов, свайпов и пинчей одним запросом W3C performActions
+"""
+
+import time
+from selenium.webdriver.remote.command import Command
+
+
+class GestureBatch:
+    """Собирает жесты в одну цепочку W3C actions с точными паузами между событиями"""
+
+    def __init__(self, driver, max_pointers=2):
+        self.driver = driver
+        self.pointer_ids = [f"finger{i + 1}" for i in range(max_pointers)]
+        self._ticks = []  # Каждый тик: {pointer_id: действие}
+        self.events = 0
+
+    def _add_tick(self, actions):
+        self._ticks.append(actions)
+
+    def tap(self, x, y, hold_ms=50):
+        """Тап одним пальцем"""
+        finger = self.pointer_ids[0]
+        self._add_tick({finger: {'type': 'pointerMove', 'duration': 0, 'x': int(x), 'y': int(y)}})
+        self._add_tick({finger: {'type': 'pointerDown', 'button': 0}})
+        self._add_tick({finger: {'type': 'pause', 'duration': int(hold_ms)}})
+        self._add_tick({finger: {'type': 'pointerUp', 'button': 0}})
+        self.events += 1
+        return self
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration_ms=500):
+        """Свайп одним пальцем"""
+        finger = self.pointer_ids[0]
+        self._add_tick({finger: {'type': 'pointerMove', 'duration': 0, 'x': int(start_x), 'y': int(start_y)}})
+        self._add_tick({finger: {'type': 'pointerDown', 'button': 0}})
+        self._add_tick({finger: {'type': 'pointerMove', 'duration': int(duration_ms), 'x': int(end_x), 'y': int(end_y)}})
+        self._add_tick({finger: {'type': 'pointerUp', 'button': 0}})
+        self.events += 1
+        return self
+
+    def pinch(self, center_x, center_y, start_distance, end_distance, duration_ms=500):
+        """Пинч двумя пальцами по горизонтали (end > start - зум, end < start - отдаление)"""
+        if len(self.pointer_ids) < 2:
+            raise ValueError("Для пинча нужно минимум 2 указателя")
+
+        first, second = self.pointer_ids[:2]
+        start_half = int(start_distance) // 2
+        end_half = int(end_distance) // 2
+        center_x, center_y = int(center_x), int(center_y)
+
+        self._add_tick({
+            first: {'type': 'pointerMove', 'duration': 0, 'x': center_x - start_half, 'y': center_y},
+            second: {'type': 'pointerMove', 'duration': 0, 'x': center_x + start_half, 'y': center_y},
+        })
+        self._add_tick({first: {'type': 'pointerDown', 'button': 0}, second: {'type': 'pointerDown', 'button': 0}})
+        self._add_tick({
+            first: {'type': 'pointerMove', 'duration': int(duration_ms), 'x': center_x - end_half, 'y': center_y},
+            second: {'type': 'pointerMove', 'duration': int(duration_ms), 'x': center_x + end_half, 'y': center_y},
+        })
+        self._add_tick({first: {'type': 'pointerUp', 'button': 0}, second: {'type': 'pointerUp', 'button': 0}})
+        self.events += 1
+        return self
+
+    def pause(self, duration_ms):
+        """Пауза между жестами"""
+        self._add_tick({pointer: {'type': 'pause', 'duration': int(duration_ms)} for pointer in self.pointer_ids})
+        return self
+
+    @property
+    def intended_duration_ms(self):
+        """Запланированная длительность: сумма самых длинных действий каждого тика"""
+        return sum(max(action.get('duration', 0) for action in tick.values()) for tick in self._ticks)
+
+    def build_payload(self):
+        """Тело запроса performActions"""
+        used = [p for p in self.pointer_ids if any(p in tick for tick in self._ticks)]
+        sources = []
+
+        for pointer in used:
+            # Указатель без действия в тике ждет 0 мс, чтобы тики всех пальцев совпадали
+            actions = [tick.get(pointer, {'type': 'pause', 'duration': 0}) for tick in self._ticks]
+            sources.append({
+                'type': 'pointer',
+                'id': pointer,
+                'parameters': {'pointerType': 'touch'},
+                'actions': actions
+            })
+
+        return {'actions': sources}
+
+    def perform(self):
+        """Отправить все жесты одним запросом и вернуть статистику темпа"""
+        payload = self.build_payload()
+        intended_ms = self.intended_duration_ms
+
+        start_time = time.perf_counter()
+        self.driver.execute(Command.W3C_ACTIONS, payload)
+        actual_duration = time.perf_counter() - start_time
+
+        intended_duration = intended_ms / 1000
+        stats = {
+            'events': self.events,
+            'intended_duration': intended_duration,
+            'actual_duration': actual_duration,
+            'intended_rate': self.events / intended_duration if intended_duration > 0 else None,
+            'achieved_rate': self.events / actual_duration if actual_duration > 0 else None
+        }
+
+        intended_rate = f"{stats['intended_rate']:.1f}" if stats['intended_rate'] else "-"
+        print(f"🤚 Пакет жестов: {self.events} событий за {actual_duration:.3f}с "
+              f"(план {intended_duration:.3f}с), темп {stats['achieved_rate']:.1f}/{intended_rate} событий/сек")
+
+        self._ticks = []
+        self.events = 0
+        return stats
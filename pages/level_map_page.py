@@ -8,6 +8,8 @@ from .base_page import BasePage
 class LevelMapPage(BasePage):
     """Класс для работы с картой уровней"""
     
+    SCREEN_LABEL = 'level_map'
+    
     # Локаторы элементов карты уровней
     LEVEL_BUTTON_LOCATORS = [
         (AppiumBy.XPATH, "//*[contains(@content-desc, 'Level') or contains(@content-desc, 'level')]"),
@@ -29,6 +31,12 @@ class LevelMapPage(BasePage):
         """Проверить что карта уровней отображается"""
         print("🔍 Проверяем отображение карты уровней...")
         
+        # Сначала распознаем экран по одному кадру, XPath - только если экран неизвестен
+        recognized = self.is_screen()
+        if recognized is not None:
+            print("✅ Карта уровней отображается" if recognized else "❌ Карта уровней не найдена")
+            return recognized
+        
         # Ищем кнопки уровней
         level_buttons = self.find_level_buttons()
         back_button = self.find_back_button()
@@ -46,15 +54,10 @@ class LevelMapPage(BasePage):
         """Найти кнопки уровней"""
         print("🔍 Ищем кнопки уровней...")
         
-        all_buttons = []
-        for i, (by, value) in enumerate(self.LEVEL_BUTTON_LOCATORS):
-            elements = self.find_elements(by, value, timeout=3)
-            if elements:
-                print(f"✅ Найдено {len(elements)} кнопок уровней способом {i+1}")
-                all_buttons.extend(elements)
-                break
-                
-        if not all_buttons:
+        i, all_buttons = self.find_all_by_locators('LEVEL_BUTTON_LOCATORS')
+        if all_buttons:
+            print(f"✅ Найдено {len(all_buttons)} кнопок уровней способом {i+1}")
+        else:
             print("❌ Кнопки уровней не найдены")
             
         return all_buttons
@@ -63,12 +66,11 @@ class LevelMapPage(BasePage):
         """Найти кнопку Назад"""
         print("🔍 Ищем кнопку Назад...")
         
-        for i, (by, value) in enumerate(self.BACK_BUTTON_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Кнопка Назад найдена способом {i+1}")
-                return element
-                
+        i, element = self.find_by_locators('BACK_BUTTON_LOCATORS')
+        if element:
+            print(f"✅ Кнопка Назад найдена способом {i+1}")
+            return element
+            
         print("❌ Кнопка Назад не найдена")
         return None
     
@@ -111,10 +113,14 @@ class LevelMapPage(BasePage):
     
     def get_map_info(self):
         """Получить информацию о карте уровней"""
+        # Все локаторы проверяем по одному снимку page_source
+        snapshot = self.snapshot()
+        matches = snapshot.evaluate_locators(self)
+        
         info = {
-            'levels_count': self.get_levels_count(),
-            'has_back_button': self.find_back_button() is not None,
-            'clickable_elements_count': len(self.get_all_clickable_elements())
+            'levels_count': len(matches['LEVEL_BUTTON_LOCATORS'][1]),
+            'has_back_button': bool(matches['BACK_BUTTON_LOCATORS'][1]),
+            'clickable_elements_count': len(snapshot.find_all("//*[@clickable='true']"))
         }
         
         print(f"📊 Информация о карте уровней:")
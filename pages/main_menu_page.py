@@ -3,17 +3,21 @@ Page Object для главного меню Candy Crush Saga
 """
 
 from appium.webdriver.common.appiumby import AppiumBy
+from utils.template_locator import TEMPLATE
 from .base_page import BasePage
 
 class MainMenuPage(BasePage):
     """Класс для работы с главным экраном игры"""
     
+    SCREEN_LABEL = 'main_menu'
+    
     # Локаторы (разные варианты для поиска элементов)
     PLAY_BUTTON_LOCATORS = [
         (AppiumBy.XPATH, "//*[contains(@text, 'Play') or contains(@text, 'PLAY')]"),
         (AppiumBy.XPATH, "//*[contains(@content-desc, 'Play') or contains(@content-desc, 'play')]"),
         (AppiumBy.XPATH, "//*[contains(@resource-id, 'play')]"),
         (AppiumBy.XPATH, "//*[contains(@class, 'Button') and contains(@text, 'Play')]"),
+        (TEMPLATE, 'play_button'),
     ]
     
     SETTINGS_BUTTON_LOCATORS = [
@@ -28,6 +32,10 @@ class MainMenuPage(BasePage):
         (AppiumBy.XPATH, "//*[contains(@resource-id, 'shop')]"),
     ]
     
+    # Доли экрана для тапа, если шаблон кнопки не найден
+    PLAY_TAP_FALLBACK = (0.5, 0.32)
+    MY_ACCOUNT_TAP_FALLBACK = (0.5, 0.42)
+    
     def __init__(self, driver):
         super().__init__(driver)
         
@@ -35,6 +43,12 @@ class MainMenuPage(BasePage):
         """Проверить что главное меню отображается"""
         print("🔍 Проверяем отображение главного меню...")
         
+        # Сначала распознаем экран по одному кадру, XPath - только если экран неизвестен
+        recognized = self.is_screen()
+        if recognized is not None:
+            print("✅ Главное меню отображается" if recognized else "❌ Главное меню не найдено")
+            return recognized
+        
         # Проверяем наличие любого из основных элементов
         play_button = self.find_play_button()
         clickable_elements = self.get_all_clickable_elements()
@@ -52,12 +66,12 @@ class MainMenuPage(BasePage):
         """Найти кнопку Play разными способами"""
         print("🔍 Ищем кнопку Play...")
         
-        for i, (by, value) in enumerate(self.PLAY_BUTTON_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Кнопка Play найдена способом {i+1}: {by}={value}")
-                return element
-                
+        i, element = self.find_by_locators('PLAY_BUTTON_LOCATORS')
+        if element:
+            by, value = self.PLAY_BUTTON_LOCATORS[i]
+            print(f"✅ Кнопка Play найдена способом {i+1}: {by}={value}")
+            return element
+            
         print("❌ Кнопка Play не найдена ни одним способом")
         return None
     
@@ -78,16 +92,23 @@ class MainMenuPage(BasePage):
             print("❌ Кнопка Play не найдена для клика")
             return False
     
+    def play_tap_point(self):
+        """Координаты розовой кнопки Play для тапа"""
+        return self.tap_point('play_button', self.PLAY_TAP_FALLBACK)
+    
+    def my_account_tap_point(self):
+        """Координаты синей кнопки My Account для тапа"""
+        return self.tap_point('my_account_button', self.MY_ACCOUNT_TAP_FALLBACK)
+    
     def find_settings_button(self):
         """Найти кнопку Settings"""
         print("🔍 Ищем кнопку Settings...")
         
-        for i, (by, value) in enumerate(self.SETTINGS_BUTTON_LOCATORS):
-            element = self.find_element(by, value, timeout=3)
-            if element:
-                print(f"✅ Кнопка Settings найдена способом {i+1}")
-                return element
-                
+        i, element = self.find_by_locators('SETTINGS_BUTTON_LOCATORS')
+        if element:
+            print(f"✅ Кнопка Settings найдена способом {i+1}")
+            return element
+            
         print("❌ Кнопка Settings не найдена")
         return None
     
@@ -106,11 +127,15 @@ class MainMenuPage(BasePage):
     
     def get_screen_info(self):
         """Получить информацию об экране для отладки"""
+        # Все локаторы проверяем по одному снимку page_source
+        snapshot = self.snapshot()
+        matches = snapshot.evaluate_locators(self)
+        
         info = {
-            'clickable_elements_count': len(self.get_all_clickable_elements()),
-            'has_play_button': self.find_play_button() is not None,
-            'has_settings_button': self.find_settings_button() is not None,
-            'screen_size': self.driver.get_window_size()
+            'clickable_elements_count': len(snapshot.find_all("//*[@clickable='true']")),
+            'has_play_button': bool(matches['PLAY_BUTTON_LOCATORS'][1]),
+            'has_settings_button': bool(matches['SETTINGS_BUTTON_LOCATORS'][1]),
+            'screen_size': self.screen_size()
         }
         
         print(f"📊 Информация об экране:")
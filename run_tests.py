@@ -7,7 +7,43 @@ import subprocess
 import sys
 import os
 import argparse
+import re
+import time
 from datetime import datetime
+from utils.device_registry import discover_devices, build_workers, is_port_open
+from utils.test_durations import load_durations, save_durations, shard_tests
+from utils.locator_stats import merge_locator_stats
+
+# Наборы тестов
+TEST_FILES = {
+    "all": ["tests/"],
+    "stability": ["tests/test_app_stability.py"],
+    "interactions": ["tests/test_screen_interactions.py"],
+    "performance": ["tests/test_performance.py"],
+    "visual": ["tests/test_visual_validation.py"],
+    "full_suite": ["tests/test_app_stability.py", "tests/test_screen_interactions.py", "tests/test_performance.py", "tests/test_visual_validation.py"]
+}
+
+def pytest_options(verbose=True, report_file=None):
+    """Общие параметры pytest для обычного и параллельного запуска"""
+    options = []
+    
+    # Параметры вывода
+    if verbose:
+        options.extend(["-v", "-s"])  # verbose и показывать print'ы
+    
+    # HTML отчет
+    if report_file:
+        options.extend([f"--html={report_file}", "--self-contained-html"])
+    
+    # Дополнительные параметры
+    options.extend([
+        "--tb=short",  # короткий traceback
+        "-q",  # тихий режим для менее важных сообщений
+        f"--maxfail=10"  # остановка после 10 ошибок
+    ])
+    
+    return options
 
 def run_tests(test_suite="all", html_report=True, verbose=True):
     """Запуск тестов с настройками"""
@@ -21,21 +57,12 @@ def run_tests(test_suite="all", html_report=True, verbose=True):
         os.makedirs(reports_dir)
     
     # Определяем какие тесты запускать
-    test_files = {
-        "all": ["tests/"],
-        "stability": ["tests/test_app_stability.py"],
-        "interactions": ["tests/test_screen_interactions.py"],
-        "performance": ["tests/test_performance.py"],
-        "visual": ["tests/test_visual_validation.py"],
-        "full_suite": ["tests/test_app_stability.py", "tests/test_screen_interactions.py", "tests/test_performance.py", "tests/test_visual_validation.py"]
-    }
-    
-    if test_suite not in test_files:
+    if test_suite not in TEST_FILES:
         print(f"❌ Неизвестный набор тестов: {test_suite}")
-        print(f"Доступные наборы: {list(test_files.keys())}")
+        print(f"Доступные наборы: {list(TEST_FILES.keys())}")
         return False
     
-    files_to_test = test_files[test_suite]
+    files_to_test = TEST_FILES[test_suite]
     
     # Генерируем имя файла отчета
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -46,22 +73,13 @@ def run_tests(test_suite="all", html_report=True, verbose=True):
     # Добавляем файлы для тестирования
     cmd.extend(files_to_test)
     
-    # Параметры вывода
-    if verbose:
-        cmd.extend(["-v", "-s"])  # verbose и показывать print'ы
-    
     # HTML отчет
+    report_file = None
     if html_report:
         report_file = f"{reports_dir}/test_report_{test_suite}_{timestamp}.html"
-        cmd.extend([f"--html={report_file}", "--self-contained-html"])
         print(f"📊 HTML отчет будет сохранен в: {report_file}")
     
-    # Дополнительные параметры
-    cmd.extend([
-        "--tb=short",  # короткий traceback
-        "-q",  # тихий режим для менее важных сообщений
-        f"--maxfail=10"  # остановка после 10 ошибок
-    ])
+    cmd.extend(pytest_options(verbose, report_file))
     
     print(f"🚀 Запускаем набор тестов: {test_suite}")
     print(f"📁 Файлы: {files_to_test}")
@@ -91,6 +109,140 @@ def run_tests(test_suite="all", html_report=True, verbose=True):
         print(f"❌ Ошибка при запуске тестов: {e}")
         return False
 
+def collect_test_ids(files_to_test):
+    """Собрать id тестов набора без запуска"""
+    result = subprocess.run(
+        ["pytest", "--collect-only", "-q", *files_to_test],
+        capture_output=True, text=True
+    )
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+def start_appium_servers(workers):
+    """Поднять Appium на портах воркеров, где он еще не запущен"""
+    servers = []
+    
+    for worker in workers:
+        if is_port_open(worker['appium_port']):
+            continue
+        
+        print(f"🚀 Запускаем Appium на порту {worker['appium_port']}")
+        servers.append(subprocess.Popen(
+            ["appium", "--port", str(worker['appium_port'])],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        ))
+    
+    # Ждем пока все серверы начнут слушать порт
+    deadline = time.time() + 30
+    while time.time() < deadline and not all(is_port_open(w['appium_port']) for w in workers):
+        time.sleep(1)
+    
+    return servers
+
+def run_tests_parallel(test_suite="all", html_report=True, verbose=True, start_appium=False):
+    """Параллельный запуск набора на всех подключенных устройствах"""
+    
+    print("🎮 Candy Crush Saga - Параллельное тестирование")
+    print("=" * 60)
+    
+    reports_dir = "reports"
+    if not os.path.exists(reports_dir):
+        os.makedirs(reports_dir)
+    
+    if test_suite not in TEST_FILES:
+        print(f"❌ Неизвестный набор тестов: {test_suite}")
+        print(f"Доступные наборы: {list(TEST_FILES.keys())}")
+        return False
+    
+    workers = build_workers(discover_devices())
+    if not workers:
+        print("❌ Нет подключенных устройств")
+        return False
+    
+    test_ids = collect_test_ids(TEST_FILES[test_suite])
+    if not test_ids:
+        print("❌ Не найдено ни одного теста")
+        return False
+    
+    # Шардирование по истории длительностей (самые длинные тесты - первыми)
+    shards, loads = shard_tests(test_ids, load_durations(), len(workers))
+    
+    print(f"📱 Устройств: {len(workers)}, тестов: {len(test_ids)}")
+    for worker, shard, load in zip(workers, shards, loads):
+        print(f"   📱 {worker['udid']} (Appium :{worker['appium_port']}): {len(shard)} тестов, ~{load:.0f}с")
+    print("-" * 60)
+    
+    servers = start_appium_servers(workers) if start_appium else []
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    running = []
+    
+    try:
+        for worker, shard in zip(workers, shards):
+            if not shard:
+                continue
+            
+            worker_name = re.sub(r'[^A-Za-z0-9]+', '_', worker['udid'])
+            report_file = None
+            if html_report:
+                report_file = f"{reports_dir}/test_report_{test_suite}_{timestamp}_{worker_name}.html"
+            
+            # Каждый воркер получает свое устройство, порт Appium, systemPort и порт потока кадров
+            env = os.environ.copy()
+            env.update({
+                'APPIUM_SERVER_URL': worker['server_url'],
+                'DEVICE_UDID': worker['udid'],
+                'APPIUM_SYSTEM_PORT': str(worker['system_port']),
+                'MJPEG_HOST_PORT': str(worker['mjpeg_port']),
+                'TEST_DURATIONS_FILE': f"{reports_dir}/test_durations_{worker_name}.json",
+                'LOCATOR_STATS_RUN_FILE': f"{reports_dir}/locator_stats_{worker_name}.json"
+            })
+            
+            log_path = f"{reports_dir}/worker_{worker_name}_{timestamp}.log"
+            log_file = open(log_path, 'w', encoding='utf-8')
+            cmd = ["pytest", *shard, *pytest_options(verbose, report_file)]
+            process = subprocess.Popen(cmd, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+            
+            running.append({
+                'worker': worker, 'name': worker_name, 'process': process, 'log': log_file,
+                'log_path': log_path, 'report': report_file, 'start': time.time(),
+                'durations_file': env['TEST_DURATIONS_FILE'],
+                'locator_stats_file': env['LOCATOR_STATS_RUN_FILE']
+            })
+            print(f"🚀 {worker['udid']}: запущено {len(shard)} тестов, лог: {log_path}")
+        
+        all_passed = True
+        for run in running:
+            returncode = run['process'].wait()
+            run['log'].close()
+            elapsed = time.time() - run['start']
+            status = "✅" if returncode == 0 else "⚠️"
+            print(f"{status} {run['worker']['udid']}: завершено за {elapsed:.0f}с (код {returncode})")
+            if run['report']:
+                print(f"   📊 Отчет: {os.path.abspath(run['report'])}")
+            all_passed = all_passed and returncode == 0
+        
+        # Сливаем замеры воркеров в общую историю
+        for run in running:
+            measured = load_durations(run['durations_file'])
+            if measured:
+                save_durations(measured)
+                os.remove(run['durations_file'])
+        
+        # И статистику локаторов: каждый воркер писал только свои попадания и промахи
+        merge_locator_stats([run['locator_stats_file'] for run in running])
+        
+        print("-" * 60)
+        print("✅ Все тесты прошли успешно!" if all_passed else "⚠️ Некоторые тесты упали")
+        return all_passed
+        
+    except KeyboardInterrupt:
+        print("\n⏹️ Тестирование прервано пользователем")
+        for run in running:
+            run['process'].terminate()
+        return False
+    finally:
+        for server in servers:
+            server.terminate()
+
 def check_environment():
     """Проверка готовности окружения"""
     print("🔍 Проверка окружения...")
@@ -154,6 +306,8 @@ def main():
     parser.add_argument("--no-html", action="store_true", help="Не создавать HTML отчет")
     parser.add_argument("--quiet", action="store_true", help="Тихий режим")
     parser.add_argument("--check-env", action="store_true", help="Только проверить окружение")
+    parser.add_argument("--parallel", action="store_true", help="Запуск на всех подключенных устройствах")
+    parser.add_argument("--start-appium", action="store_true", help="Поднять Appium для каждого устройства")
     
     args = parser.parse_args()
     
@@ -162,6 +316,16 @@ def main():
         success = check_environment()
         sys.exit(0 if success else 1)
     
+    # Параллельный запуск сам находит устройства и порты Appium
+    if args.parallel:
+        success = run_tests_parallel(
+            test_suite=args.suite,
+            html_report=not args.no_html,
+            verbose=not args.quiet,
+            start_appium=args.start_appium
+        )
+        sys.exit(0 if success else 1)
+    
     # Проверяем окружение перед запуском тестов
     if not check_environment():
         print("\n❌ Окружение не готово. Исправьте ошибки и попробуйте снова.")
@@ -0,0 +1,89 @@
+"""
+Тесты ожидания готовности приложения по стабильным кадрам (работают без устройства)
+"""
+
+import io
+import pytest
+from PIL import Image
+from config.settings import APP_READINESS, APPIUM_CONFIG
+from utils.app_readiness import is_app_in_foreground, luma_difference, reduced_luma, wait_for_app_ready
+
+
+def _png(brightness):
+    buffer = io.BytesIO()
+    Image.new('RGB', (540, 1170), (brightness, brightness, brightness)).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class LaunchingDriver:
+    """Запуск игры: активити, затем поверхность Unity, затем заставка с анимацией и стабильный экран"""
+
+    def __init__(self, frames, activity_after=1, surface_after=1):
+        self.frames = frames
+        self.activity_after = activity_after
+        self.surface_after = surface_after
+        self.calls = {'activity': 0, 'source': 0, 'screenshot': 0}
+
+    @property
+    def current_activity(self):
+        self.calls['activity'] += 1
+        return APPIUM_CONFIG['app_activity'] if self.calls['activity'] > self.activity_after else ".Launcher"
+
+    @property
+    def page_source(self):
+        self.calls['source'] += 1
+        if self.calls['source'] > self.surface_after:
+            return '<hierarchy><android.view.SurfaceView class="android.view.SurfaceView"/></hierarchy>'
+        return '<hierarchy/>'
+
+    def get_screenshot_as_png(self):
+        frame = self.frames[min(self.calls['screenshot'], len(self.frames) - 1)]
+        self.calls['screenshot'] += 1
+        return frame
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setitem(APP_READINESS, 'poll_interval', 0.01)
+
+
+class TestAppReadiness:
+    """Сигналы готовности от дешевых к дорогим и стабильные кадры"""
+
+    def test_ready_after_stable_frames(self):
+        """Готово после stable_frames одинаковых кадров подряд, скриншоты только после Unity"""
+        frames = [_png(0), _png(120), _png(200), _png(200), _png(201), _png(201)]
+        driver = LaunchingDriver(frames)
+
+        launch_time = wait_for_app_ready(driver, deadline=5)
+
+        assert launch_time < 1
+        # 3 кадра анимации + 2 стабильных сравнения
+        assert driver.calls['screenshot'] == 5
+        assert driver.calls['activity'] == 2
+        assert driver.calls['source'] == 2
+
+    def test_animation_reaches_deadline(self):
+        """Кадры все время меняются - по дедлайну приложение не готово, времени запуска нет"""
+        driver = LaunchingDriver([_png(value) for value in range(0, 250, 10)])
+
+        assert wait_for_app_ready(driver, deadline=0.3) is None
+        assert driver.calls['screenshot'] > 0
+
+    def test_no_screenshots_before_foreground(self):
+        """Пока активити не на переднем плане, дорогие проверки не делаются"""
+        driver = LaunchingDriver([_png(0)], activity_after=1000)
+
+        wait_for_app_ready(driver, deadline=0.1)
+
+        assert driver.calls['source'] == 0
+        assert driver.calls['screenshot'] == 0
+
+    def test_foreground_and_luma_difference(self):
+        """Активити сравнивается с настройками, разница кадров - средняя разница яркости"""
+        driver = LaunchingDriver([_png(0)], activity_after=0)
+
+        assert is_app_in_foreground(driver)
+        dark = reduced_luma(Image.new('L', (540, 1170), 10))
+        assert luma_difference(dark, dark) == 0
+        assert abs(luma_difference(dark, reduced_luma(Image.new('L', (540, 1170), 30))) - 20) < 1
@@ -5,6 +5,8 @@
 import time
 import pytest
 from utils.helpers import wait_and_screenshot
+from utils.screen_geometry import get_screen_geometry
+from config.settings import MEMORY_SAMPLING
 
 class TestAppStability:
     """Тесты стабильности и надежности приложения"""
@@ -17,7 +19,7 @@ class TestAppStability:
         wait_and_screenshot(driver, "app_launch_check")
         
         # Проверяем базовые параметры
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         page_source = driver.page_source
         
         print(f"📱 Размер экрана: {size}")
@@ -30,7 +32,7 @@ class TestAppStability:
         
         # Проверяем что приложение отвечает на запросы
         try:
-            driver.get_window_size()  # Повторный запрос
+            get_screen_geometry(driver).probe()  # Легкий запрос отзывчивости
             print("✅ Приложение отвечает на запросы")
         except Exception as e:
             assert False, f"Приложение не отвечает: {e}"
@@ -41,7 +43,7 @@ class TestAppStability:
         """Приложение отвечает на базовые взаимодействия"""
         print("\n👆 Тест отзывчивости на взаимодействия")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         interaction_count = 0
         successful_interactions = 0
         
@@ -62,7 +64,7 @@ class TestAppStability:
                 time.sleep(1)
                 
                 # Проверяем что приложение все еще отвечает
-                driver.get_window_size()
+                get_screen_geometry(driver).probe()
                 successful_interactions += 1
                 print(f"   ✅ Взаимодействие {interaction_count} успешно")
                 
@@ -79,8 +81,9 @@ class TestAppStability:
         print("\n🔄 Тест смены ориентации экрана")
         
         # Получаем текущую ориентацию
-        initial_orientation = driver.orientation
-        initial_size = driver.get_window_size()
+        geometry = get_screen_geometry(driver)
+        initial_orientation = geometry.orientation()
+        initial_size = geometry.window_size()
         
         print(f"📱 Начальная ориентация: {initial_orientation}")
         print(f"📱 Начальный размер: {initial_size}")
@@ -94,12 +97,12 @@ class TestAppStability:
             new_orientation = "LANDSCAPE" if initial_orientation == "PORTRAIT" else "PORTRAIT"
             
             print(f"🔄 Меняем ориентацию на: {new_orientation}")
-            driver.orientation = new_orientation
+            geometry.set_orientation(new_orientation)
             time.sleep(3)  # Ждем адаптации
             
             # Проверяем что приложение адаптировалось
-            new_size = driver.get_window_size()
-            current_orientation = driver.orientation
+            new_size = geometry.window_size()
+            current_orientation = geometry.orientation()
             
             print(f"📱 Новая ориентация: {current_orientation}")
             print(f"📱 Новый размер: {new_size}")
@@ -113,10 +116,10 @@ class TestAppStability:
                 assert new_size['height'] > new_size['width'], "В портретной ориентации высота должна быть больше ширины"
             
             # Возвращаем исходную ориентацию
-            driver.orientation = initial_orientation
+            geometry.set_orientation(initial_orientation)
             time.sleep(2)
             
-            final_size = driver.get_window_size()
+            final_size = geometry.window_size()
             print(f"📱 Финальный размер: {final_size}")
             
             print("✅ Смена ориентации обработана корректно")
@@ -130,8 +133,7 @@ class TestAppStability:
         
         # Главное - приложение должно оставаться стабильным
         try:
-            final_check_size = driver.get_window_size()
-            assert final_check_size['width'] > 0, "Приложение должно оставаться стабильным"
+            get_screen_geometry(driver).probe()
             print("✅ Приложение осталось стабильным после тестирования ориентации")
         except Exception as e:
             assert False, f"Приложение стало нестабильным: {e}"
@@ -141,7 +143,8 @@ class TestAppStability:
         print("\n📱 Тест восстановления из фона")
         
         # Запоминаем состояние перед сворачиванием
-        before_size = driver.get_window_size()
+        geometry = get_screen_geometry(driver)
+        before_size = geometry.window_size()
         before_screenshot = wait_and_screenshot(driver, "before_background")
         
         print("📱 Сворачиваем приложение в фон")
@@ -157,14 +160,15 @@ class TestAppStability:
             time.sleep(1)
             
             # Проверяем что приложение восстановилось
-            after_size = driver.get_window_size()
+            size_changed = geometry.resolution_changed()
+            after_size = geometry.window_size()
             after_screenshot = wait_and_screenshot(driver, "after_background")
             
             print(f"📱 Размер до: {before_size}")
             print(f"📱 Размер после: {after_size}")
             
             # Проверяем что размеры совпадают
-            assert after_size == before_size, "Размер экрана должен остаться тем же"
+            assert not size_changed, "Размер экрана должен остаться тем же"
             
             # Проверяем что приложение отвечает
             driver.page_source
@@ -177,20 +181,17 @@ class TestAppStability:
             
             # Пробуем простую проверку отзывчивости
             try:
-                current_size = driver.get_window_size()
-                if current_size['width'] > 0:
-                    background_test_success = True
-                    print("✅ Приложение осталось отзывчивым")
+                geometry.probe()
+                background_test_success = True
+                print("✅ Приложение осталось отзывчивым")
             except Exception as e2:
                 print(f"❌ Приложение не отвечает: {e2}")
         
         # Финальная проверка стабильности
         try:
-            final_size = driver.get_window_size()
+            geometry.probe()
             final_screenshot = wait_and_screenshot(driver, "background_test_final")
             
-            assert final_size['width'] > 0, "Приложение должно быть стабильным"
-            
             if background_test_success:
                 print("✅ Тест восстановления из фона пройден")
             else:
@@ -199,70 +200,53 @@ class TestAppStability:
         except Exception as e:
             assert False, f"Приложение нестабильно после теста фона: {e}"
     
-    def test_memory_usage_stability(self, driver):
-        """Тест стабильности использования памяти"""
+    def test_memory_usage_stability(self, driver, memory_sampler):
+        """Тест стабильности использования памяти (dumpsys meminfo)"""
         print("\n💾 Тест стабильности памяти")
         
-        memory_checks = []
         check_count = 5
+        size = get_screen_geometry(driver).window_size()
         
-        print(f"💾 Выполняем {check_count} проверок памяти с интервалом")
+        print(f"💾 Выполняем {check_count} циклов нагрузки, память собирается в фоне")
         
         for i in range(check_count):
-            print(f"   💾 Проверка памяти {i+1}/{check_count}")
+            print(f"   💾 Цикл {i+1}/{check_count}")
             
             try:
                 # Выполняем некоторые действия для нагрузки
-                size = driver.get_window_size()
                 driver.tap([(size['width']//2, size['height']//2)])
                 
-                # Получаем информацию о памяти (если доступно)
-                page_source_size = len(driver.page_source)
-                
-                memory_info = {
-                    'check': i+1,
-                    'page_source_size': page_source_size,
-                    'screen_width': size['width'],
-                    'screen_height': size['height'],
-                    'timestamp': time.time()
-                }
-                
-                memory_checks.append(memory_info)
-                
-                print(f"      📊 Размер контента: {page_source_size} символов")
-                
-                # Скриншот каждые 2 проверки
+                # Скриншот каждые 2 цикла
                 if i % 2 == 0:
                     wait_and_screenshot(driver, f"memory_check_{i+1}")
                 
-                time.sleep(2)  # Пауза между проверками
+                time.sleep(2)  # Пауза между циклами
                 
             except Exception as e:
-                print(f"   ❌ Ошибка проверки памяти {i+1}: {e}")
-                memory_checks.append({
-                    'check': i+1,
-                    'error': str(e),
-                    'timestamp': time.time()
-                })
+                print(f"   ❌ Ошибка цикла {i+1}: {e}")
         
-        # Анализ результатов
-        successful_checks = [check for check in memory_checks if 'error' not in check]
+        samples = memory_sampler.wait_for_samples(check_count)
+        summary = memory_sampler.summary()
         
         print(f"\n📊 Результаты проверки памяти:")
-        print(f"   - Успешных проверок: {len(successful_checks)}/{check_count}")
+        print(f"   - Образцов: {len(samples)}, ошибок dumpsys: {memory_sampler.errors}")
         
-        if len(successful_checks) >= 2:
-            # Проверяем что размер контента не растет слишком быстро
-            first_size = successful_checks[0]['page_source_size']
-            last_size = successful_checks[-1]['page_source_size']
-            growth = last_size - first_size
+        if len(samples) >= 2:
+            pss = summary['pss_total']
+            assert pss is not None, f"dumpsys meminfo не вернул TOTAL PSS (ошибок: {memory_sampler.errors})"
+            java_heap = summary.get('java_heap')
             
-            print(f"   - Рост размера контента: {growth} символов")
-            print(f"   - Первый размер: {first_size}")
-            print(f"   - Последний размер: {last_size}")
+            print(f"   - PSS: {pss['initial'] / 1024:.1f} -> {pss['final'] / 1024:.1f} МБ ({pss['growth_percent']:+.1f}%)")
+            print(f"   - Наклон PSS: {pss['slope_kb_per_min']:+.0f} КБ/мин")
+            if java_heap:
+                print(f"   - Java heap: {java_heap['initial'] / 1024:.1f} -> {java_heap['final'] / 1024:.1f} МБ")
             
             # Тест проходит если нет чрезмерного роста памяти
-            assert growth < first_size, "Размер контента не должен удваиваться"
+            assert summary['restarts'] == 0, "Процесс игры не должен перезапускаться"
+            assert pss['growth_percent'] < MEMORY_SAMPLING['max_pss_growth_percent'], "PSS не должен заметно расти"
+            if java_heap:
+                assert java_heap['growth_percent'] < MEMORY_SAMPLING['max_java_heap_growth_percent'], \
+                    "Java heap не должен удваиваться"
             print("✅ Память используется стабильно")
         
         else:
@@ -271,4 +255,4 @@ class TestAppStability:
         # Финальная проверка стабильности
         final_screenshot = wait_and_screenshot(driver, "memory_stability_final")
         
-        assert len(successful_checks) >= check_count // 2, "Минимум половина проверок должна быть успешной"
+        assert len(samples) >= check_count // 2, "Минимум половина образцов памяти должна быть собрана"
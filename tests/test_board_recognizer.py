@@ -0,0 +1,128 @@
+"""
+Тесты распознавания игрового поля (работают без устройства)
+"""
+
+import io
+import json
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+from config.settings import BOARD_RECOGNITION
+from pages.game_board_page import GameBoardPage
+from utils.board_recognizer import EMPTY, recognize_board
+
+PALETTE = list(BOARD_RECOGNITION['candy_colors'].values())
+
+
+def board_image(grid, origin=(45, 700), pitch=110, size=(1080, 2340), noise_seed=None):
+    """Синтетический экран: темный фон и круглые конфеты цветов палитры (0 - пустая клетка)"""
+    image = Image.new('RGB', size, (40, 30, 70))
+    draw = ImageDraw.Draw(image)
+    x0, y0 = origin
+    for row, col in zip(*np.nonzero(grid)):
+        left, top = x0 + col * pitch, y0 + row * pitch
+        draw.ellipse([left + 12, top + 12, left + pitch - 12, top + pitch - 12], fill=PALETTE[grid[row, col] - 1])
+
+    if noise_seed is not None:
+        pixels = np.asarray(image).astype(np.int16)
+        noise = np.random.default_rng(noise_seed).integers(-15, 16, pixels.shape)
+        image = Image.fromarray(np.clip(pixels + noise, 0, 255).astype(np.uint8))
+    return image
+
+def random_grid(seed=0):
+    return np.random.default_rng(seed).integers(1, len(PALETTE) + 1, (9, 9)).astype(np.int8)
+
+
+class FakeDriver:
+    """Драйвер со скриншотом поля, записывающий свайпы"""
+
+    session_id = 'board-test'
+
+    def __init__(self, image):
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        self.png = buffer.getvalue()
+        self.swipes = []
+
+    def get_screenshot_as_png(self):
+        return self.png
+
+    def get_window_size(self):
+        return {'width': 1080, 'height': 2340}
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=0):
+        self.swipes.append((start_x, start_y, end_x, end_y))
+
+
+class TestBoardRecognizer:
+    """Прямоугольник поля, классы конфет и преобразование клетка -> пиксели"""
+
+    def test_recognizes_grid_and_rect(self):
+        """Матрица совпадает с нарисованной, прямоугольник - в пределах пары пикселей"""
+        grid = random_grid()
+
+        recognized, geometry = recognize_board(board_image(grid, noise_seed=1))
+
+        assert np.array_equal(recognized, grid)
+        x, y, width, height = geometry.rect
+        assert abs(x - 45) <= 6 and abs(y - 700) <= 6
+        assert abs(width - 990) <= 12 and abs(height - 990) <= 12
+
+    def test_cell_transform(self):
+        """Центр клетки и обратное преобразование точки в клетку"""
+        grid, geometry = recognize_board(board_image(random_grid(2), origin=(100, 500), pitch=96))
+
+        x, y = geometry.cell_center(2, 3)
+        assert abs(x - (100 + 3 * 96 + 48)) <= 4
+        assert abs(y - (500 + 2 * 96 + 48)) <= 4
+        assert geometry.cell_at(x, y) == (2, 3)
+        assert geometry.cell_at(10, 10) is None
+
+        xs, ys = geometry.cell_centers()
+        assert xs.shape == (9, 9)
+        assert abs(xs[2, 3] - x) <= 1 and abs(ys[2, 3] - y) <= 1
+
+    def test_empty_cells(self):
+        """Пустые клетки внутри поля получают класс EMPTY"""
+        grid = random_grid(3)
+        grid[4, 4] = EMPTY
+        grid[1, 7] = EMPTY
+
+        recognized, geometry = recognize_board(board_image(grid))
+
+        assert np.array_equal(recognized, grid)
+
+    def test_no_board(self):
+        """На экране без конфет поле не находится"""
+        assert recognize_board(Image.new('RGB', (1080, 2340), (40, 30, 70))) == (None, None)
+
+    def test_recognition_speed(self):
+        """Распознавание кадра 1080x2340 - несколько миллисекунд"""
+        image = board_image(random_grid())
+        recognize_board(image)
+
+        start = time.perf_counter()
+        for _ in range(20):
+            recognize_board(image)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 20
+
+        print(f"\n🍬 Распознавание поля: {elapsed_ms:.2f}мс")
+        assert elapsed_ms < 50
+
+    def test_moves_from_test_data(self):
+        """Ходы из data/test_data.json: допустимые - свайп между центрами клеток, недопустимые - отказ"""
+        with open("data/test_data.json", 'r', encoding='utf-8') as f:
+            data = json.load(f)['test_data_sets']
+        driver = FakeDriver(board_image(random_grid()))
+        page = GameBoardPage(driver)
+
+        for move in data['positive_tests']['valid_moves']:
+            assert page.make_move(move)
+        for move in data['negative_tests']['invalid_moves']:
+            assert not page.make_move(move)
+
+        assert len(driver.swipes) == len(data['positive_tests']['valid_moves'])
+        start_x, start_y, end_x, end_y = driver.swipes[0]  # {"from": [2, 3], "to": [2, 4]}
+        assert abs(start_x - (45 + 3 * 110 + 55)) <= 6
+        assert abs(start_y - (700 + 2 * 110 + 55)) <= 6
+        assert abs((end_x - start_x) - 110) <= 3 and end_y == start_y
@@ -0,0 +1,114 @@
+"""
+Тесты модели поля "три в ряд" (работают без устройства)
+"""
+
+import json
+import time
+import numpy as np
+from pages.board_simulator import BoardSimulator, apply_gravity, find_matches
+from utils.board_moves import best_moves, find_moves
+
+
+def _test_data():
+    with open("data/test_data.json", 'r', encoding='utf-8') as f:
+        return json.load(f)['test_data_sets']
+
+
+class TestBoardSimulator:
+    """Совпадения, падение, досыпание, каскады и пакетная модель"""
+
+    def test_find_matches(self):
+        """Линии из 3+ по горизонтали и вертикали, пустые клетки не совпадают"""
+        board = np.array([
+            [1, 1, 1, 2],
+            [0, 3, 2, 2],
+            [0, 3, 4, 2],
+            [0, 3, 4, 2],
+        ], dtype=np.int8)
+
+        mask = find_matches(board[np.newaxis])[0]
+
+        expected = np.zeros((4, 4), dtype=bool)
+        expected[0, :3] = True
+        expected[1:, 1] = True
+        expected[:, 3] = True
+        assert np.array_equal(mask, expected)
+
+    def test_gravity(self):
+        """Конфеты падают вниз, порядок в столбце сохраняется"""
+        board = np.array([
+            [1, 0],
+            [0, 2],
+            [3, 0],
+        ], dtype=np.int8)
+
+        assert apply_gravity(board[np.newaxis])[0].tolist() == [[0, 0], [1, 0], [3, 2]]
+
+    def test_random_boards_are_stable(self):
+        """Сгенерированные поля без готовых совпадений и одинаковы при одном зерне"""
+        boards = BoardSimulator(seed=5).random_boards(100)
+
+        assert not find_matches(boards).any()
+        assert np.array_equal(boards, BoardSimulator(seed=5).random_boards(100))
+
+    def test_expected_outcomes_from_test_data(self):
+        """Ходы test_data.json на поле simulation_board дают записанный результат"""
+        data = _test_data()
+        board = np.array(data['simulation_board']['board'], dtype=np.int8)
+        seed = data['simulation_board']['seed']
+
+        for move in data['positive_tests']['valid_moves']:
+            result = BoardSimulator(seed=seed).play_move(board, move)
+            assert result['valid']
+            assert result['cleared'] == move['expected']['cleared']
+            assert result['cascades'] == move['expected']['cascades']
+            assert not find_matches(result['board'][np.newaxis]).any()
+
+        for move in data['negative_tests']['invalid_moves']:
+            result = BoardSimulator(seed=seed).play_move(board, move)
+            assert not result['valid']
+            assert np.array_equal(result['board'], board)
+
+    def test_swap_without_match_is_undone(self):
+        """Обмен соседних клеток без совпадения не меняет поле"""
+        data = _test_data()
+        board = np.array(data['simulation_board']['board'], dtype=np.int8)
+        legal = {(tuple(move['from']), tuple(move['to'])) for score, move in find_moves(board)}
+        move = next({"from": [0, col], "to": [0, col + 1]} for col in range(8)
+                    if ((0, col), (0, col + 1)) not in legal)
+
+        result = BoardSimulator().play_move(board, move)
+
+        assert not result['valid']
+        assert np.array_equal(result['board'], board)
+
+    def test_generator_moves_are_valid(self):
+        """Каждый ход генератора засчитывается моделью, и наоборот - ходов нет только без совпадений"""
+        simulator = BoardSimulator(seed=11)
+        boards = simulator.random_boards(500)
+        moves = best_moves(boards)
+
+        playable = [i for i, move in enumerate(moves) if move is not None]
+        result = simulator.play(boards[playable], [moves[i] for i in playable])
+
+        assert result['valid'].all()
+        assert (result['cleared'] >= 3).all()
+
+    def test_batch_benchmark(self):
+        """Пакетная игра: выбор хода и полный расчет каскадов для тысяч полей"""
+        simulator = BoardSimulator(seed=0)
+        boards = simulator.random_boards(2000)
+
+        start = time.perf_counter()
+        total_cleared = 0
+        for turn in range(5):
+            moves = best_moves(boards)
+            playable = np.array([move is not None for move in moves])
+            result = simulator.play(boards[playable], [move for move in moves if move is not None])
+            boards[playable] = result['boards']
+            total_cleared += int(result['cleared'].sum())
+        elapsed = time.perf_counter() - start
+
+        rate = len(boards) * 5 / elapsed
+        print(f"\n🎲 Ходов в секунду (выбор + каскады): {rate:,.0f}, убрано конфет: {total_cleared}")
+        assert rate > 1000
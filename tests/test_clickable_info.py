@@ -0,0 +1,111 @@
+"""
+Сравнение пакетного и поштучного чтения атрибутов кликабельных элементов (работает без устройства)
+"""
+
+import time
+import pytest
+from utils.helpers import get_all_clickable_info
+from utils.page_snapshot import PageSnapshot
+
+# Имитация сетевой задержки одного запроса к Appium
+ROUND_TRIP = 0.002
+
+
+class RecordedElement:
+    """Живой элемент: каждый get_attribute - отдельный запрос"""
+
+    def __init__(self, node, driver):
+        self.node = node
+        self.driver = driver
+
+    def get_attribute(self, name):
+        self.driver.request()
+        return self.node.get_attribute(name)
+
+
+class RecordedDriver:
+    """Драйвер, отвечающий записанным page_source и считающий запросы"""
+
+    def __init__(self, page_source):
+        self._page_source = page_source
+        self.requests = 0
+
+    def request(self):
+        self.requests += 1
+        time.sleep(ROUND_TRIP)
+
+    @property
+    def page_source(self):
+        self.request()
+        return self._page_source
+
+    def find_elements(self, by, value):
+        self.request()
+        return [RecordedElement(node, self) for node in PageSnapshot(self._page_source).find_all(value)]
+
+
+def _load_source(name):
+    with open(f"data/recordings/{name}", 'r', encoding='utf-8') as f:
+        return f.read()
+
+def _measure(driver, bulk):
+    start_time = time.perf_counter()
+    info = get_all_clickable_info(driver, bulk=bulk)
+    return info, time.perf_counter() - start_time
+
+class TestClickableInfo:
+    """Пакетный режим дает тот же результат за один запрос"""
+
+    @pytest.mark.parametrize("source", ["main_menu_source.xml", "game_board_source.xml"])
+    def test_bulk_matches_per_element(self, source):
+        """Бенчмарк двух режимов на записанном page_source"""
+        page_source = _load_source(source)
+
+        per_element_driver = RecordedDriver(page_source)
+        per_element, per_element_time = _measure(per_element_driver, bulk=False)
+
+        bulk_driver = RecordedDriver(page_source)
+        bulk, bulk_time = _measure(bulk_driver, bulk=True)
+
+        print(f"\n⚡ {source}: {len(bulk)} элементов, поштучно {per_element_driver.requests} запросов "
+              f"за {per_element_time:.3f}с, пакетно {bulk_driver.requests} за {bulk_time:.3f}с")
+
+        assert bulk == per_element
+        assert bulk_driver.requests == 1
+        assert per_element_driver.requests == 1 + 5 * len(per_element)
+        assert bulk_time < per_element_time
+
+    def test_incomplete_node_falls_back(self):
+        """Узел без атрибута bounds дочитывается у живого элемента"""
+        page_source = _load_source("main_menu_source.xml")
+        incomplete_source = page_source.replace('bounds="[290,700][790,800]" ', '', 1)
+
+        driver = RecordedDriver(incomplete_source)
+        info = get_all_clickable_info(driver, bulk=True)
+        play = [item for item in info if item['text'] == 'Play'][0]
+
+        assert play['bounds'] == ''
+        assert play['resource_id'].endswith('play_button')
+        assert driver.requests == 1 + 1 + 5
+
+    def test_changed_screen_falls_back_to_per_element(self):
+        """Живых элементов больше, чем узлов в снимке - без сопоставления по номеру, весь вызов поштучно"""
+        page_source = _load_source("main_menu_source.xml")
+        incomplete_source = page_source.replace('bounds="[290,700][790,800]" ', '', 1)
+
+        driver = RecordedDriver(incomplete_source)
+        # К моменту find_elements поверх меню появилось окно с новой кнопкой в начале дерева
+        changed_source = page_source.replace(
+            'height="2340">', 'height="2340"><android.widget.Button text="Close" content-desc="" '
+                              'resource-id="popup_close" class="android.widget.Button" clickable="true" '
+                              'bounds="[0,0][100,100]"/>', 1)
+        driver.find_elements = lambda by, value: [RecordedElement(node, driver)
+                                                   for node in PageSnapshot(changed_source).find_all(value)]
+
+        info = get_all_clickable_info(driver, bulk=True)
+
+        assert info[0]['resource_id'] == 'popup_close'
+        play = [item for item in info if item['text'] == 'Play'][0]
+        assert play['bounds'] == '[290,700][790,800]'
+        assert [item['text'] for item in info] == [item['text'] for item in
+                                                   get_all_clickable_info(RecordedDriver(changed_source), bulk=False)]
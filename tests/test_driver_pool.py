@@ -0,0 +1,119 @@
+"""
+Тесты пула драйверов с подставной фабрикой сессий (работают без устройства)
+"""
+
+import pytest
+import utils.driver_pool
+from utils.driver_pool import DriverPool
+from config.settings import DRIVER_POOL
+
+
+class FakeDriver:
+    """Сессия, которая записывает команды и может "умереть" """
+
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.reset_fails = False
+        self.commands = []
+
+    @property
+    def current_package(self):
+        if not self.alive:
+            raise RuntimeError("session is gone")
+        return "com.king.candycrushsaga"
+
+    def terminate_app(self, package, timeout=None):
+        if self.reset_fails:
+            raise RuntimeError("terminate failed")
+        self.commands.append('terminate_app')
+
+    def activate_app(self, package):
+        self.commands.append('activate_app')
+
+    def quit(self):
+        self.commands.append('quit')
+
+
+class FakeFactory:
+    """Фабрика сессий вместо create_driver"""
+
+    def __init__(self):
+        self.drivers = []
+
+    def __call__(self):
+        self.drivers.append(FakeDriver(len(self.drivers)))
+        return self.drivers[-1]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(utils.driver_pool, 'wait_for_app_ready', lambda driver: 0.25)
+    return DriverPool(create=FakeFactory())
+
+
+class TestDriverPool:
+    """Переиспользование сессии, сброс приложения и пересоздание"""
+
+    def test_session_reused_with_app_reset(self, pool):
+        """Одна сессия на все тесты, между тестами приложение перезапускается"""
+        first, setup_time = pool.acquire()
+        pool.release()
+        second, _ = pool.acquire()
+        pool.release()
+
+        assert first is second
+        assert pool.sessions_created == 1
+        assert second.commands == ['terminate_app', 'activate_app']
+        assert pool.last_launch_time == 0.25
+        assert setup_time >= 0 and len(pool.setup_times) == 2
+
+    def test_not_ready_app_has_no_launch_time(self, pool, monkeypatch):
+        """Приложение не стало готовым - время запуска не выдумывается"""
+        monkeypatch.setattr(utils.driver_pool, 'wait_for_app_ready', lambda driver: None)
+
+        pool.acquire()
+
+        assert pool.last_launch_time is None
+
+    def test_dead_session_is_recycled(self, pool):
+        """Сессия не отвечает - закрывается и создается новая"""
+        first, _ = pool.acquire()
+        first.alive = False
+
+        second, _ = pool.acquire()
+
+        assert second is not first
+        assert 'quit' in first.commands
+        assert (pool.sessions_created, pool.sessions_recycled) == (2, 1)
+
+    def test_failed_reset_recycles(self, pool):
+        """Приложение не перезапустилось - сессия пересоздается"""
+        first, _ = pool.acquire()
+        first.reset_fails = True
+
+        second, _ = pool.acquire()
+
+        assert second is not first
+        assert pool.sessions_recycled == 1
+
+    def test_without_reuse_each_test_gets_new_session(self, pool, monkeypatch):
+        """reuse_session=False - сессия закрывается после каждого теста"""
+        monkeypatch.setitem(DRIVER_POOL, 'reuse_session', False)
+
+        first, _ = pool.acquire()
+        pool.release()
+        second, _ = pool.acquire()
+
+        assert second is not first
+        assert first.commands == ['quit']
+        assert pool.sessions_recycled == 0
+
+    def test_close_quits_session(self, pool):
+        """close() закрывает сессию, повторный close не падает"""
+        driver, _ = pool.acquire()
+
+        pool.close()
+        pool.close()
+
+        assert driver.commands == ['quit']
@@ -0,0 +1,57 @@
+"""
+Тесты статистики кадра (работают без устройства)
+"""
+
+import time
+from PIL import Image, ImageDraw
+from utils.frame_stats import compute_frame_stats, evaluate_frame
+
+
+def _candy_screen():
+    """Синтетический экран: розовый фон, синие и зеленые плитки, темная панель"""
+    image = Image.new('RGB', (1080, 2340), (230, 120, 170))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, 1080, 200], fill=(20, 20, 20))
+    for i in range(9):
+        for j in range(9):
+            color = (90, 150, 230) if (i + j) % 2 else (120, 220, 120)
+            draw.rectangle([60 + i * 110, 600 + j * 110, 160 + i * 110, 700 + j * 110], fill=color)
+    return image
+
+
+class TestFrameStats:
+    """Проверки кадра по всем пикселям"""
+
+    def test_black_screen(self):
+        """Черный экран - пустой и преимущественно черный"""
+        stats = compute_frame_stats(Image.new('RGB', (1080, 2340), (5, 5, 5)))
+        checks = evaluate_frame(stats)
+
+        assert stats['black_ratio'] == 1.0
+        assert not checks['not_blank']
+        assert not checks['not_mostly_black']
+        assert not checks['has_colors']
+
+    def test_white_screen(self):
+        """Белый экран - преимущественно белый"""
+        checks = evaluate_frame(compute_frame_stats(Image.new('RGB', (1080, 2340), (250, 250, 250))))
+
+        assert not checks['not_mostly_white']
+
+    def test_game_screen(self):
+        """Цветной игровой экран проходит все проверки"""
+        stats = compute_frame_stats(_candy_screen())
+        checks = evaluate_frame(stats)
+
+        assert all(checks.values()), checks
+        assert stats['dominant_colors'][0] == (210, 120, 150)
+        assert sum(stats['luma_histogram']) == stats['analyzed_pixels']
+
+    def test_full_frame_is_fast(self):
+        """Полный кадр считается за десятки миллисекунд"""
+        image = _candy_screen()
+
+        start_time = time.perf_counter()
+        compute_frame_stats(image)
+
+        assert time.perf_counter() - start_time < 0.5
@@ -0,0 +1,100 @@
+"""
+Тесты потока кадров MJPEG (работают без устройства)
+"""
+
+import io
+import subprocess
+import pytest
+import requests
+from PIL import Image
+import utils.frame_stream
+from utils.frame_stream import FrameStream, JpegSplitter
+
+
+def _jpeg(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 128), color).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+def _multipart(frames):
+    parts = []
+    for jpeg in frames:
+        parts.append(b"--BoundaryString\r\nContent-type: image/jpeg\r\n"
+                     + f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg + b"\r\n\r\n")
+    return b"".join(parts)
+
+class SettingsDriver:
+    """Драйвер, принимающий настройки MJPEG"""
+
+    def update_settings(self, settings):
+        self.settings = settings
+
+class FakeAdb:
+    """Подмена adb: forward завершается с заданным кодом, вызовы записываются"""
+
+    def __init__(self):
+        self.forward_code = 0
+        self.calls = []
+
+    def __call__(self, args, udid=None, timeout=30, text=True):
+        self.calls.append(args)
+        code = 0 if "--remove" in args else self.forward_code
+        return subprocess.CompletedProcess(["adb"] + args, code, "", "error: cannot bind listener")
+
+@pytest.fixture
+def adb_calls(monkeypatch):
+    adb = FakeAdb()
+    monkeypatch.setattr(utils.frame_stream, 'adb_command', adb)
+    return adb
+
+class TestFrameStream:
+    """Разбор MJPEG и выборка кадров между метками"""
+
+    def test_splitter_handles_arbitrary_chunks(self):
+        """Кадры собираются из кусков произвольной длины"""
+        frames = [_jpeg((255, 0, 0)), _jpeg((0, 255, 0)), _jpeg((0, 0, 255))]
+        stream = _multipart(frames)
+        splitter = JpegSplitter()
+
+        received = []
+        for offset in range(0, len(stream), 777):
+            received.extend(splitter.feed(stream[offset:offset + 777]))
+
+        assert received == frames
+
+    def test_frames_between_marks_and_visual_change(self):
+        """Кадры между метками и задержка первого изменившегося кадра"""
+        stream = FrameStream(driver=None, buffer_size=10)
+        dark, bright = _jpeg((20, 20, 20)), _jpeg((230, 230, 230))
+
+        stream._append(1.0, dark)
+        stream.marks['tap'] = 1.5
+        stream._append(2.0, dark)
+        stream._append(2.25, bright)
+        stream.marks['done'] = 2.5
+        stream._append(3.0, bright)
+
+        between = stream.frames_between('tap', 'done')
+
+        assert [frame.captured_at for frame in between] == [2.0, 2.25]
+        assert stream.first_change_after('tap', timeout=0) == 0.75
+        assert stream.fps() == 1.5
+
+    def test_failed_forward_raises(self, adb_calls, monkeypatch):
+        """Ошибка adb forward не маскируется - поток не подключается к чужому порту"""
+        adb_calls.forward_code = 1
+        monkeypatch.setattr(requests, 'get', lambda *args, **kwargs: pytest.fail("HTTP без forward"))
+
+        with pytest.raises(RuntimeError, match="forward"):
+            FrameStream(SettingsDriver(), host_port=9100).start()
+
+    def test_forward_removed_when_connect_fails(self, adb_calls, monkeypatch):
+        """Сервер MJPEG не ответил - forward убирается сразу"""
+        def refuse(*args, **kwargs):
+            raise requests.ConnectionError("connection refused")
+        monkeypatch.setattr(requests, 'get', refuse)
+
+        with pytest.raises(requests.ConnectionError):
+            FrameStream(SettingsDriver(), host_port=9100).start()
+
+        assert adb_calls.calls[-1] == ["forward", "--remove", "tcp:9100"]
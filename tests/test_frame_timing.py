@@ -0,0 +1,105 @@
+"""
+Тесты разбора dumpsys SurfaceFlinger --latency (работают без устройства)
+"""
+
+import time
+import numpy as np
+from config.settings import FRAME_TIMING
+from utils.frame_timing import FrameTimingCollector, find_game_layer, frame_timing_stats, parse_latency
+
+
+def _recording(name):
+    with open(f"data/recordings/{name}", 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class RecordedCollector(FrameTimingCollector):
+    """Сборщик, читающий записанный вывод вместо adb"""
+
+    def _dumpsys(self, *args):
+        if args[0] == "--list":
+            return _recording("surfaceflinger_list.txt")
+        return _recording("surfaceflinger_latency.txt")
+
+
+class LiveCollector(FrameTimingCollector):
+    """Сборщик с буфером последних buffer_frames кадров, идущих с частотой 60 Гц"""
+
+    frame_period = 16666666
+
+    def __init__(self, buffer_frames):
+        super().__init__()
+        self.layer = "SurfaceView[game](BLAST)#0"
+        self.buffer_frames = buffer_frames
+        self.started = time.perf_counter_ns()
+
+    def _dumpsys(self, *args):
+        shown = (time.perf_counter_ns() - self.started) // self.frame_period
+        first = max(shown - self.buffer_frames + 1, 0)
+        rows = [f"{t}\t{t}\t{t}" for t in (self.started + k * self.frame_period for k in range(first, shown + 1))]
+        return "\n".join([str(self.frame_period)] + rows) + "\n"
+
+
+class TestFrameTiming:
+    """Разбор записанного вывода и статистика кадров"""
+
+    def test_parse_recorded_latency(self):
+        """Период 60 Гц, пустые строки и непоказанный кадр отброшены"""
+        period, frames = parse_latency(_recording("surfaceflinger_latency.txt"))
+
+        assert period == 16666666
+        assert frames.shape == (119, 3)
+        assert (frames[:, 1] > 0).all()
+        assert (np.diff(frames[:, 1]) > 0).all()
+
+    def test_recorded_stats(self):
+        """119 кадров: 3 кадра по 2 vsync и один на 3 vsync - 4 рывка, 5 пропущенных vsync"""
+        period, frames = parse_latency(_recording("surfaceflinger_latency.txt"))
+
+        stats = frame_timing_stats(frames[:, 1], period)
+
+        assert stats['frames'] == 119
+        assert 55 < stats['fps'] < 60
+        assert abs(stats['p50_ms'] - 16.67) < 0.2
+        assert stats['p99_ms'] > 30
+        assert stats['janky_frames'] == 4
+        assert stats['dropped_vsyncs'] == 5
+        assert stats['vsync_histogram'] == {'1': 114, '2': 3, '3': 1, '4+': 0}
+
+    def test_find_game_layer(self):
+        """Выбирается SurfaceView игры (BLAST), а не фон и не окно активности"""
+        layer = find_game_layer(_recording("surfaceflinger_list.txt"), "com.king.candycrushsaga")
+
+        assert layer == "SurfaceView[com.king.candycrushsaga/com.king.candycrushsaga.CandyCrushSagaActivity](BLAST)#0"
+        assert find_game_layer("StatusBar#0\n", "com.king.candycrushsaga") is None
+
+    def test_empty_and_malformed_output(self):
+        """Пустой вывод и слой без кадров"""
+        assert parse_latency("")[0] is None
+        period, frames = parse_latency("16666666\n0\t0\t0\n")
+        assert period == 16666666 and len(frames) == 0
+        assert frame_timing_stats([], period)['fps'] == 0.0
+
+    def test_measure_with_recorded_output(self):
+        """measure() берет только кадры новее последнего кадра до действия"""
+        collector = RecordedCollector()
+        actions = []
+
+        stats = collector.measure(lambda: actions.append(1), settle=0)
+
+        # Записанный буфер не меняется - новых кадров нет
+        assert actions == [1]
+        assert stats['frames'] == 0
+        assert collector.period == 16666666
+
+    def test_measure_reads_during_blocking_action(self, monkeypatch):
+        """Буфер читается и во время долгого действия - кадры не теряются при переполнении"""
+        monkeypatch.setitem(FRAME_TIMING, 'buffer_frames', 10)
+        collector = LiveCollector(buffer_frames=10)
+
+        stats = collector.measure(lambda: time.sleep(0.6), settle=0.1)
+
+        # Буфер на 10 кадров покрывает ~0.17 с, а действие с ожиданием длится 0.7 с (~42 кадра)
+        assert collector.poll_interval() < 0.1
+        assert stats['frames'] > 30
+        assert stats['dropped_vsyncs'] <= 3
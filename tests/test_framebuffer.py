@@ -0,0 +1,65 @@
+"""
+Тесты разбора вывода adb screencap (работают без устройства)
+"""
+
+import io
+import struct
+import numpy as np
+import pytest
+from utils.framebuffer import RawFramebuffer, parse_header, RGBA_8888, BGRA_8888
+
+
+def _screencap(width, height, pixel_format=RGBA_8888, header_size=16, fill=(10, 20, 30, 255)):
+    header = struct.pack('<III', width, height, pixel_format) + b'\x00' * (header_size - 12)
+    return header + bytes(fill) * (width * height)
+
+
+class ScriptedFramebuffer(RawFramebuffer):
+    """screencap, отдающий заранее заготовленные выводы"""
+
+    def __init__(self, outputs):
+        super().__init__()
+        self.outputs = list(outputs)
+
+    def _open_stream(self):
+        return None, io.BytesIO(self.outputs.pop(0))
+
+
+class TestFramebuffer:
+    """Заголовок, переиспользование буфера и смена размера"""
+
+    @pytest.mark.parametrize("header_size", [12, 16])
+    def test_parse_header(self, header_size):
+        """Заголовок старых и новых версий Android"""
+        data = _screencap(4, 3, header_size=header_size)
+
+        assert parse_header(data, len(data)) == (4, 3, RGBA_8888, header_size)
+
+    def test_buffer_is_reused(self):
+        """Кадры одного размера читаются в тот же буфер"""
+        framebuffer = ScriptedFramebuffer([
+            _screencap(4, 3),
+            _screencap(4, 3, fill=(1, 2, 3, 255)),
+        ])
+
+        first = framebuffer.grab()
+        buffer = framebuffer._buffer
+        second = framebuffer.grab()
+
+        assert framebuffer._buffer is buffer
+        assert np.shares_memory(second, buffer)
+        assert second.shape == (3, 4, 4)
+        assert tuple(second[0, 0]) == (1, 2, 3, 255)
+
+    def test_resize_and_bgra(self):
+        """Смена размера выделяет новый буфер, BGRA приводится к RGBA"""
+        framebuffer = ScriptedFramebuffer([
+            _screencap(4, 3),
+            _screencap(3, 4, pixel_format=BGRA_8888, fill=(30, 20, 10, 255)),
+        ])
+
+        framebuffer.grab()
+        pixels = framebuffer.capture()
+
+        assert pixels.shape == (4, 3, 4)
+        assert tuple(pixels[0, 0]) == (10, 20, 30, 255)
@@ -0,0 +1,61 @@
+"""
+Тесты кадра экрана (работают без устройства)
+"""
+
+import io
+import pytest
+from PIL import Image
+from config.settings import SCREENSHOTS
+from utils.frames import Frame
+from utils.screenshot_writer import get_screenshot_writer
+
+
+def _png(size=(108, 234), color=(200, 40, 120)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class CountingDriver:
+    """Драйвер, считающий запросы скриншотов"""
+
+    def __init__(self):
+        self.screenshots = 0
+
+    def get_screenshot_as_png(self):
+        self.screenshots += 1
+        return _png()
+
+
+class TestFrame:
+    """Один захват на сохранение и анализ"""
+
+    def test_single_capture_for_save_and_analysis(self, tmp_path, monkeypatch):
+        """Сохранение и анализ не запрашивают второй скриншот"""
+        monkeypatch.setitem(SCREENSHOTS, 'directory', str(tmp_path))
+        driver = CountingDriver()
+
+        with Frame.capture(driver) as frame:
+            path = frame.save("frame")
+            assert frame.size == (108, 234)
+            assert frame.rgb.getpixel((10, 10)) == (200, 40, 120)
+
+        get_screenshot_writer().flush()
+
+        assert driver.screenshots == 1
+        with open(path, 'rb') as f:
+            assert Image.open(f).size == (108, 234)
+
+    def test_decode_is_lazy_and_release_frees(self):
+        """Пиксели декодируются по требованию и освобождаются"""
+        frame = Frame(_png())
+
+        assert frame._image is None
+        frame.rgb
+        assert frame._image is not None
+
+        frame.release()
+
+        assert frame.png is None and frame._image is None
+        with pytest.raises(ValueError):
+            frame.image
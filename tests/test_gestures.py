@@ -0,0 +1,74 @@
+"""
+Тесты пакетных жестов W3C actions (работают без устройства)
+"""
+
+import json
+from selenium.webdriver.remote.command import Command
+from pages.gestures import GestureBatch
+
+
+class RecordingDriver:
+    """Драйвер, запоминающий отправленные команды"""
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, command, params=None):
+        self.executed.append((command, json.loads(json.dumps(params))))
+        return {'value': None}
+
+
+class TestGestureBatch:
+    """Тело performActions и статистика темпа"""
+
+    def test_tap_payload(self):
+        """Тап - перемещение, нажатие, удержание и отпускание одного пальца"""
+        payload = GestureBatch(RecordingDriver()).tap(100.7, 200, hold_ms=80).build_payload()
+
+        assert payload == {'actions': [{
+            'type': 'pointer',
+            'id': 'finger1',
+            'parameters': {'pointerType': 'touch'},
+            'actions': [
+                {'type': 'pointerMove', 'duration': 0, 'x': 100, 'y': 200},
+                {'type': 'pointerDown', 'button': 0},
+                {'type': 'pause', 'duration': 80},
+                {'type': 'pointerUp', 'button': 0}
+            ]
+        }]}
+
+    def test_ticks_aligned_across_fingers(self):
+        """Второй палец ждет 0 мс в тиках одиночных жестов - тики всех пальцев совпадают"""
+        batch = GestureBatch(RecordingDriver())
+        batch.tap(10, 10).pause(100).pinch(500, 1000, 200, 600, duration_ms=300)
+
+        first, second = batch.build_payload()['actions']
+
+        assert len(first['actions']) == len(second['actions']) == 9
+        assert second['actions'][:4] == [{'type': 'pause', 'duration': 0}] * 4
+        assert second['actions'][4] == {'type': 'pause', 'duration': 100}
+        assert first['actions'][5]['x'] == 400 and second['actions'][5]['x'] == 600
+        assert first['actions'][7]['x'] == 200 and second['actions'][7]['x'] == 800
+        assert batch.intended_duration_ms == 50 + 100 + 300
+
+    def test_unused_pointer_is_omitted(self):
+        """Палец без действий не попадает в запрос"""
+        payload = GestureBatch(RecordingDriver()).swipe(0, 500, 0, 100, duration_ms=250).build_payload()
+
+        assert [source['id'] for source in payload['actions']] == ['finger1']
+        assert payload['actions'][0]['actions'][2] == {'type': 'pointerMove', 'duration': 250, 'x': 0, 'y': 100}
+
+    def test_perform_sends_one_request(self):
+        """Все жесты уходят одной командой W3C_ACTIONS, затем пакет очищается"""
+        driver = RecordingDriver()
+        batch = GestureBatch(driver)
+        for i in range(5):
+            batch.tap(100 + i, 200).pause(50)
+        expected = batch.build_payload()
+
+        stats = batch.perform()
+
+        assert driver.executed == [(Command.W3C_ACTIONS, expected)]
+        assert stats['events'] == 5
+        assert stats['intended_duration'] == 0.5
+        assert batch.build_payload() == {'actions': []}
@@ -0,0 +1,73 @@
+"""
+Тесты порядка перебора локаторов по статистике прошлых прогонов (работают без устройства)
+"""
+
+import os
+from utils.locator_stats import LocatorStats, merge_locator_stats
+from pages.main_menu_page import MainMenuPage
+
+LOCATORS = MainMenuPage.PLAY_BUTTON_LOCATORS
+
+
+class TestLocatorStats:
+    """Статистика сохраняется между прогонами и меняет порядок локаторов"""
+
+    def test_hits_move_locator_first(self, tmp_path):
+        """Сработавший локатор перебирается первым, остальные сохраняют исходный порядок"""
+        stats = LocatorStats(str(tmp_path / "stats.json"), "1.0")
+        stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[2], True, 0.05)
+
+        order = [i for i, locator in stats.rank("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS)]
+
+        assert order[0] == 2
+        assert order[1:] == [i for i in range(len(LOCATORS)) if i != 2]
+
+    def test_never_matched_are_pruned_and_reported(self, tmp_path):
+        """Локатор без попаданий отбрасывается после порога промахов и попадает в отчет"""
+        path = str(tmp_path / "stats.json")
+        stats = LocatorStats(path, "1.0")
+        stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[1], True, 0.05)
+        for _ in range(5):
+            stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[0], False, 3.0)
+        stats.save()
+
+        reloaded = LocatorStats(path, "1.0")
+        order = [i for i, locator in reloaded.rank("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS)]
+
+        assert order[0] == 1
+        assert 0 not in order
+        assert reloaded.never_matched()[0][2] == LocatorStats.locator_key(LOCATORS[0])
+
+    def test_stats_are_per_app_version(self, tmp_path):
+        """Статистика другой версии приложения не влияет на порядок"""
+        path = str(tmp_path / "stats.json")
+        stats = LocatorStats(path, "1.0")
+        stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[3], True, 0.05)
+        stats.save()
+
+        order = [i for i, locator in LocatorStats(path, "2.0").rank("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS)]
+
+        assert order == list(range(len(LOCATORS)))
+
+    def test_parallel_workers_merge(self, tmp_path):
+        """Воркеры пишут только свои замеры в отдельные файлы, слияние суммирует их с историей"""
+        path = str(tmp_path / "stats.json")
+        history = LocatorStats(path, "1.0")
+        history.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[0], True, 0.05)
+        history.save()
+
+        run_files = []
+        for worker in range(2):
+            run_file = str(tmp_path / f"stats_worker{worker}.json")
+            stats = LocatorStats(path, "1.0", run_file)
+            stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[0], True, 0.05)
+            stats.record("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[1], False, 1.5)
+            stats.save()
+            run_files.append(run_file)
+
+        merge_locator_stats(run_files, path)
+        merged = LocatorStats(path, "1.0")
+
+        assert merged._peek("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[0])['hits'] == 3
+        assert merged._peek("MainMenuPage", "PLAY_BUTTON_LOCATORS", LOCATORS[1]) == {'hits': 0, 'misses': 2, 'miss_time': 3.0}
+        assert not any(os.path.exists(run_file) for run_file in run_files)
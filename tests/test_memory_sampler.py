@@ -0,0 +1,100 @@
+"""
+Тесты разбора dumpsys meminfo и фонового сбора памяти (работают без устройства)
+"""
+
+import json
+from config.settings import SCREENSHOTS
+from utils.memory_sampler import METRICS, MemorySampler, memory_summary, parse_meminfo
+from utils.screenshot_writer import get_screenshot_writer
+
+
+def _recording():
+    with open("data/recordings/meminfo.txt", 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class GrowingSampler(MemorySampler):
+    """Сборщик на записанном выводе, у которого Java heap растет на 1 МБ за образец"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def _dumpsys(self):
+        self.calls += 1
+        growth = 1024 * self.calls
+        return _recording().replace("Java Heap:    18904", f"Java Heap:    {18904 + growth}") \
+                           .replace("TOTAL PSS:   326822", f"TOTAL PSS:   {326822 + growth}")
+
+
+class TestMemorySampler:
+    """Разбор записанного вывода, поток сбора и отчет"""
+
+    def test_parse_recorded_meminfo(self):
+        """PSS, кучи, графика и GL из App Summary и основной таблицы"""
+        sample = parse_meminfo(_recording())
+
+        assert sample == {
+            'pid': 18342,
+            'pss_total': 326822,
+            'java_heap': 18904,
+            'native_heap': 85320,
+            'code': 45788,
+            'stack': 1944,
+            'graphics': 147720,
+            'private_other': 17530,
+            'system': 24584,
+            'gl_mtrack': 61200,
+            'egl_mtrack': 32400,
+            'gfx_dev': 54120
+        }
+
+    def test_no_process(self):
+        """Процесс не запущен - образца нет"""
+        assert parse_meminfo("No process found for: com.king.candycrushsaga\n") is None
+
+    def test_summary_growth_and_slope(self):
+        """Рост в процентах и наклон КБ/мин по ряду"""
+        samples = [{'timestamp': t, 'pid': 1, 'pss_total': 100000 + 500 * t} for t in range(0, 61, 10)]
+
+        summary = memory_summary(samples)
+
+        assert summary['pss_total']['initial'] == 100000
+        assert summary['pss_total']['final'] == 130000
+        assert summary['pss_total']['growth_percent'] == 30.0
+        assert summary['pss_total']['slope_kb_per_min'] == 30000.0
+        assert summary['restarts'] == 0
+
+    def test_summary_without_data(self):
+        """Нет образцов или нет TOTAL PSS - метрики в сводке есть, но со значением None"""
+        empty = memory_summary([])
+        without_total = memory_summary([{'timestamp': 0, 'pid': 1, 'java_heap': 2048},
+                                        {'timestamp': 5, 'pid': 1, 'java_heap': 4096}])
+
+        assert all(empty[metric] is None for metric in METRICS)
+        assert empty['restarts'] == 0
+        assert without_total['pss_total'] is None
+        assert without_total['java_heap']['growth_percent'] == 100.0
+
+    def test_background_sampling(self, tmp_path, monkeypatch):
+        """Поток собирает образцы с шагом interval, ряд сохраняется в JSON"""
+        monkeypatch.setitem(SCREENSHOTS, 'directory', str(tmp_path))
+        sampler = GrowingSampler(interval=0.05)
+
+        with sampler:
+            samples = sampler.wait_for_samples(4, timeout=5)
+            assert len(samples) >= 4
+
+        path = sampler.save("memory_test")
+        get_screenshot_writer().flush()
+
+        samples = sampler.samples
+        timestamps = [sample['timestamp'] for sample in samples]
+        assert timestamps == sorted(timestamps)
+        assert samples[-1]['java_heap'] > samples[0]['java_heap']
+
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert len(report['samples']) == len(samples)
+        assert report['summary']['java_heap']['growth_percent'] > 0
+        assert report['summary']['java_heap']['slope_kb_per_min'] > 0
@@ -0,0 +1,59 @@
+"""
+Тесты локального поиска локаторов по снимку page_source (работают без устройства)
+"""
+
+import pytest
+from utils.page_snapshot import PageSnapshot, parse_bounds
+from pages.main_menu_page import MainMenuPage
+from pages.game_board_page import GameBoardPage, parse_moves, parse_score
+from pages.level_map_page import LevelMapPage
+
+
+def _load_source(name):
+    with open(f"data/recordings/{name}", 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.fixture
+def game_board_snapshot():
+    return PageSnapshot(_load_source("game_board_source.xml"))
+
+@pytest.fixture
+def main_menu_snapshot():
+    return PageSnapshot(_load_source("main_menu_source.xml"))
+
+class TestPageSnapshot:
+    """Все локаторы страницы проверяются по одному page_source"""
+
+    def test_game_board_locators(self, game_board_snapshot):
+        """Локаторы игрового поля находят поле, ходы и счет"""
+        matches = game_board_snapshot.evaluate_locators(GameBoardPage(None))
+
+        moves_index, moves = matches['MOVES_COUNTER_LOCATORS']
+        score_index, score = matches['SCORE_LOCATORS']
+
+        assert matches['GAME_BOARD_LOCATORS'][1]
+        assert moves_index == 0
+        assert parse_moves(moves[0].text) == 23
+        assert score_index == 0
+        assert parse_score(score[0].text) == 12450
+        assert matches['PAUSE_BUTTON_LOCATORS'][0] == 0
+
+    def test_main_menu_locators(self, main_menu_snapshot):
+        """Кнопка Play находится первым локатором с границами и центром"""
+        index, elements = main_menu_snapshot.find_first(MainMenuPage.PLAY_BUTTON_LOCATORS)
+
+        assert index == 0
+        assert elements[0].bounds == (290, 700, 790, 800)
+        assert elements[0].center == (540, 750)
+        assert elements[0].get_attribute('resource-id').endswith('play_button')
+
+    def test_missing_locators_return_empty(self, main_menu_snapshot):
+        """Локаторы чужого экрана ничего не находят"""
+        matches = main_menu_snapshot.evaluate_locators(LevelMapPage(None))
+
+        assert matches['BACK_BUTTON_LOCATORS'] == (None, [])
+
+    def test_parse_bounds(self):
+        """Разбор атрибута bounds"""
+        assert parse_bounds("[0,0][1080,2340]") == (0, 0, 1080, 2340)
+        assert parse_bounds("") is None
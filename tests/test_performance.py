@@ -5,19 +5,28 @@
 import time
 import pytest
 from utils.helpers import wait_and_screenshot
+from utils.screen_geometry import get_screen_geometry
+from pages.base_page import BasePage
+from pages.main_menu_page import MainMenuPage
+from utils.frames import Frame
+from utils.framebuffer import get_framebuffer
+from utils.adb import display_size
+from utils.frame_timing import FrameTimingCollector
+from config.settings import DEVICE_CONFIG, FRAME_TIMING, MEMORY_SAMPLING
 
 class TestPerformance:
     """Тесты производительности и отзывчивости приложения"""
     
-    def test_app_response_time(self, driver):
+    def test_app_response_time(self, driver, frame_stream):
         """Тест времени отклика приложения на действия"""
         print("\n⚡ Тест времени отклика приложения")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         center_x = size['width'] // 2
         center_y = size['height'] // 2
         
         response_times = []
+        visual_response_times = []
         test_actions = 5
         
         print(f"⚡ Измеряем время отклика на {test_actions} действий")
@@ -27,14 +36,14 @@ class TestPerformance:
             
             try:
                 # Измеряем время тапа
+                if frame_stream:
+                    frame_stream.mark(f"tap_{i}")
                 start_time = time.time()
                 driver.tap([(center_x, center_y)])
                 tap_time = time.time() - start_time
                 
-                # Измеряем время получения размера экрана (отклик системы)
-                start_time = time.time()
-                current_size = driver.get_window_size()
-                system_response_time = time.time() - start_time
+                # Измеряем отклик системы легким запросом
+                system_response_time = get_screen_geometry(driver).probe()
                 
                 total_response_time = tap_time + system_response_time
                 response_times.append(total_response_time)
@@ -43,6 +52,15 @@ class TestPerformance:
                 print(f"      - Время отклика системы: {system_response_time:.3f}с")
                 print(f"      - Общее время: {total_response_time:.3f}с")
                 
+                # Визуальный отклик: первый изменившийся кадр потока после тапа
+                if frame_stream:
+                    visual_response = frame_stream.first_change_after(f"tap_{i}")
+                    if visual_response is not None:
+                        visual_response_times.append(visual_response)
+                        print(f"      - Визуальный отклик: {visual_response:.3f}с")
+                    else:
+                        print("      - Визуальный отклик: экран не изменился")
+                
                 time.sleep(0.5)  # Пауза между тестами
                 
             except Exception as e:
@@ -59,6 +77,10 @@ class TestPerformance:
             print(f"   - Минимальный отклик: {min_response:.3f}с")
             print(f"   - Успешных измерений: {len(response_times)}/{test_actions}")
             
+            if visual_response_times:
+                avg_visual = sum(visual_response_times) / len(visual_response_times)
+                print(f"   - Средний визуальный отклик: {avg_visual:.3f}с ({len(visual_response_times)} изменений экрана)")
+            
             # Критерии производительности
             assert avg_response < 2.0, f"Средний отклик ({avg_response:.3f}с) должен быть менее 2 секунд"
             assert max_response < 5.0, f"Максимальный отклик ({max_response:.3f}с) должен быть менее 5 секунд"
@@ -72,11 +94,17 @@ class TestPerformance:
         else:
             assert False, "Не удалось измерить время отклика"
     
-    def test_fps_during_interactions(self, driver):
-        """Тест плавности работы при взаимодействиях"""
+    def test_fps_during_interactions(self, driver, request):
+        """Тест плавности: частота кадров и рывки слоя игры по SurfaceFlinger"""
         print("\n🎬 Тест плавности анимаций")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
+        collector = FrameTimingCollector(udid=DEVICE_CONFIG['udid'])
+        
+        try:
+            collector.find_layer()
+        except Exception as e:
+            pytest.skip(f"Слой игры в SurfaceFlinger недоступен: {e}")
         
         # Серия действий для проверки плавности
         interactions = [
@@ -87,63 +115,42 @@ class TestPerformance:
                                                size['width']//2, int(size['height']*0.7), 1000)),
         ]
         
-        frame_check_results = []
+        frame_check_results = {}
         
         for interaction_name, action in interactions:
             print(f"\n   🎬 Проверка плавности: {interaction_name}")
             
             try:
-                before_screenshot = wait_and_screenshot(driver, f"fps_before_{interaction_name.lower().replace(' ', '_')}")
-                
-                # Засекаем время выполнения действия
-                start_time = time.time()
-                action()
-                action_time = time.time() - start_time
-                
-                # Ждем завершения возможных анимаций
-                time.sleep(1)
-                
-                after_screenshot = wait_and_screenshot(driver, f"fps_after_{interaction_name.lower().replace(' ', '_')}")
-                
-                # Проверяем отзывчивость после действия
-                response_start = time.time()
-                current_size = driver.get_window_size()
-                response_time = time.time() - response_start
-                
-                frame_data = {
-                    'interaction': interaction_name,
-                    'action_time': action_time,
-                    'response_time': response_time,
-                    'total_time': action_time + response_time,
-                    'smooth': action_time < 1.0 and response_time < 0.5
-                }
+                stats = collector.measure(action)
+                stats['smooth'] = (stats['fps'] >= FRAME_TIMING['min_fps'] and
+                                   stats.get('jank_ratio', 1.0) <= FRAME_TIMING['max_jank_ratio'])
+                frame_check_results[interaction_name] = stats
                 
-                frame_check_results.append(frame_data)
-                
-                print(f"      - Время действия: {action_time:.3f}с")
-                print(f"      - Время отклика: {response_time:.3f}с")
-                print(f"      - Плавность: {'✅ Плавно' if frame_data['smooth'] else '⚠️ Не очень плавно'}")
+                print(f"      - Кадров: {stats['frames']}, FPS: {stats['fps']:.1f}")
+                if stats['frames'] >= 2:
+                    print(f"      - Время кадра p50/p95/p99: {stats['p50_ms']:.1f}/{stats['p95_ms']:.1f}/{stats['p99_ms']:.1f}мс")
+                    print(f"      - Рывков: {stats['janky_frames']} ({stats['jank_ratio']:.1%}), пропущено vsync: {stats['dropped_vsyncs']}")
+                print(f"      - Плавность: {'✅ Плавно' if stats['smooth'] else '⚠️ Не очень плавно'}")
                 
             except Exception as e:
                 print(f"   ❌ Ошибка проверки плавности {interaction_name}: {e}")
-                frame_check_results.append({
-                    'interaction': interaction_name,
-                    'error': str(e),
-                    'smooth': False
-                })
+                frame_check_results[interaction_name] = {'error': str(e), 'smooth': False}
+        
+        request.node.user_properties.append(("frame_timing", frame_check_results))
         
         # Анализ результатов плавности
-        smooth_interactions = [r for r in frame_check_results if r.get('smooth', False)]
+        smooth_interactions = [name for name, r in frame_check_results.items() if r.get('smooth', False)]
         
         print(f"\n📊 Результаты плавности:")
         print(f"   - Плавных взаимодействий: {len(smooth_interactions)}/{len(interactions)}")
         
-        if smooth_interactions:
-            avg_action_time = sum(r['action_time'] for r in smooth_interactions) / len(smooth_interactions)
-            avg_response_time = sum(r['response_time'] for r in smooth_interactions) / len(smooth_interactions)
+        measured = [r for r in frame_check_results.values() if r.get('frames', 0) >= 2]
+        if measured:
+            avg_fps = sum(r['fps'] for r in measured) / len(measured)
+            worst_p99 = max(r['p99_ms'] for r in measured)
             
-            print(f"   - Среднее время действий: {avg_action_time:.3f}с")
-            print(f"   - Средний отклик: {avg_response_time:.3f}с")
+            print(f"   - Средний FPS: {avg_fps:.1f}")
+            print(f"   - Худший p99 времени кадра: {worst_p99:.1f}мс")
             
             if len(smooth_interactions) == len(interactions):
                 print("✅ Отличная плавность всех взаимодействий")
@@ -154,71 +161,51 @@ class TestPerformance:
         
         assert len(smooth_interactions) >= 1, "Минимум одно взаимодействие должно быть плавным"
     
-    def test_memory_consumption(self, driver):
-        """Тест потребления памяти в процессе работы"""
+    def test_memory_consumption(self, driver, memory_sampler):
+        """Тест потребления памяти в процессе работы (dumpsys meminfo)"""
         print("\n💾 Тест потребления памяти")
         
-        memory_samples = []
-        sample_count = 8
+        action_count = 8
+        size = get_screen_geometry(driver).window_size()
         
-        print(f"💾 Собираем {sample_count} образцов использования памяти")
+        print(f"💾 Выполняем {action_count} действий, память собирается в фоне")
         
-        for i in range(sample_count):
-            print(f"   💾 Образец памяти {i+1}/{sample_count}")
+        for i in range(action_count):
+            print(f"   💾 Действие {i+1}/{action_count}")
             
             try:
                 # Выполняем некоторые действия
-                size = driver.get_window_size()
                 driver.tap([(size['width']//2, size['height']//2)])
                 
-                # Собираем метрики (доступные через Appium)
-                page_source_size = len(driver.page_source)
-                
-                # Простая оценка "использования памяти" через размер контента
-                memory_sample = {
-                    'sample': i+1,
-                    'page_source_size': page_source_size,
-                    'timestamp': time.time(),
-                    'screen_dimensions': f"{size['width']}x{size['height']}"
-                }
-                
-                memory_samples.append(memory_sample)
-                
-                print(f"      - Размер контента: {page_source_size} символов")
-                
-                # Скриншот каждые 3 образца
+                # Скриншот каждые 3 действия
                 if i % 3 == 0:
                     wait_and_screenshot(driver, f"memory_sample_{i+1}")
                 
-                time.sleep(1)  # Пауза между образцами
+                time.sleep(1)  # Пауза между действиями
                 
             except Exception as e:
-                print(f"   ❌ Ошибка образца памяти {i+1}: {e}")
+                print(f"   ❌ Ошибка действия {i+1}: {e}")
         
-        if len(memory_samples) >= 3:
-            # Анализ потребления памяти
-            sizes = [sample['page_source_size'] for sample in memory_samples]
-            
-            initial_size = sizes[0]
-            final_size = sizes[-1]
-            max_size = max(sizes)
-            min_size = min(sizes)
-            avg_size = sum(sizes) / len(sizes)
-            
-            growth = final_size - initial_size
-            growth_percent = (growth / initial_size) * 100 if initial_size > 0 else 0
+        samples = memory_sampler.wait_for_samples(MEMORY_SAMPLING['min_samples'])
+        summary = memory_sampler.summary()
+        
+        if len(samples) >= MEMORY_SAMPLING['min_samples']:
+            pss = summary['pss_total']
+            assert pss is not None, f"dumpsys meminfo не вернул TOTAL PSS (ошибок: {memory_sampler.errors})"
             
-            print(f"\n📊 Анализ использования памяти:")
-            print(f"   - Начальный размер: {initial_size} символов")
-            print(f"   - Финальный размер: {final_size} символов")
-            print(f"   - Максимальный размер: {max_size} символов")
-            print(f"   - Минимальный размер: {min_size} символов")
-            print(f"   - Средний размер: {avg_size:.0f} символов")
-            print(f"   - Рост: {growth} символов ({growth_percent:+.1f}%)")
+            print(f"\n📊 Анализ использования памяти ({len(samples)} образцов):")
+            print(f"   - PSS начальный: {pss['initial'] / 1024:.1f} МБ")
+            print(f"   - PSS финальный: {pss['final'] / 1024:.1f} МБ")
+            print(f"   - PSS максимальный: {pss['max'] / 1024:.1f} МБ")
+            print(f"   - Рост PSS: {pss['growth_percent']:+.1f}% ({pss['slope_kb_per_min']:+.0f} КБ/мин)")
+            for metric, label in (('java_heap', 'Java heap'), ('native_heap', 'Native heap'),
+                                  ('graphics', 'Графика'), ('gl_mtrack', 'GL')):
+                if summary[metric]:
+                    print(f"   - {label}: {summary[metric]['final'] / 1024:.1f} МБ ({summary[metric]['growth_percent']:+.1f}%)")
             
             # Критерии использования памяти
-            memory_stable = abs(growth_percent) < 50  # Рост менее 50%
-            no_significant_leaks = max_size < initial_size * 2  # Не более чем в 2 раза
+            memory_stable = abs(pss['growth_percent']) < MEMORY_SAMPLING['max_pss_growth_percent']
+            no_significant_leaks = pss['max'] < pss['initial'] * 2  # Не более чем в 2 раза
             
             if memory_stable and no_significant_leaks:
                 print("✅ Использование памяти стабильно")
@@ -227,11 +214,14 @@ class TestPerformance:
             else:
                 print("⚠️ Возможные проблемы с памятью")
             
+            assert pss['initial'] > 0, "PSS процесса должен быть больше нуля"
+            assert summary['restarts'] == 0, "Процесс игры не должен перезапускаться во время теста"
             assert no_significant_leaks, "Не должно быть значительного роста памяти"
+            assert memory_stable, f"Рост PSS должен быть меньше {MEMORY_SAMPLING['max_pss_growth_percent']}%"
             
         else:
             print("⚠️ Недостаточно образцов для анализа памяти")
-            assert len(memory_samples) >= 2, "Минимум 2 образца памяти должно быть собрано"
+            assert len(samples) >= 2, "Минимум 2 образца памяти должно быть собрано"
     
     def test_network_usage(self, driver):
         """Тест сетевой активности приложения"""
@@ -242,6 +232,7 @@ class TestPerformance:
         
         network_tests = []
         test_duration = 15  # секунд
+        main_menu = MainMenuPage(driver)
         
         print(f"🌐 Мониторим сетевую активность в течение {test_duration} секунд")
         
@@ -255,16 +246,14 @@ class TestPerformance:
             
             try:
                 # Выполняем действия которые могут вызвать сетевую активность
-                size = driver.get_window_size()
-                
                 # Тап по кнопкам которые могут инициировать сетевые запросы
-                driver.tap([(size['width']//2, int(size['height']*0.32))])  # Play button
+                driver.tap([main_menu.play_tap_point()])  # Play button
                 time.sleep(1)
-                driver.tap([(size['width']//2, int(size['height']*0.42))])  # My Account
+                driver.tap([main_menu.my_account_tap_point()])  # My Account
                 
                 # Проверяем отзывчивость (косвенный индикатор сетевой активности)
                 response_start = time.time()
-                current_size = driver.get_window_size()
+                get_screen_geometry(driver).probe()
                 page_source = driver.page_source
                 response_time = time.time() - response_start
                 
@@ -320,7 +309,7 @@ class TestPerformance:
         """Тест производительности при интенсивном использовании"""
         print("\n🔥 Тест производительности при интенсивном использовании")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         intensive_duration = 45  # Увеличено с 30 до 45 секунд
         actions_performed = 0
         performance_samples = []
@@ -358,27 +347,30 @@ class TestPerformance:
                     actions_performed += 1
                     
                 elif action_type == 'multi_tap':
-                    for _ in range(3):
+                    # Три тапа одним запросом с паузами 50 мс
+                    batch = BasePage(driver).gesture_batch()
+                    for tap_index in range(3):
                         x = random.randint(int(size['width']*0.3), int(size['width']*0.7))
                         y = random.randint(int(size['height']*0.3), int(size['height']*0.7))
-                        driver.tap([(x, y)])
-                        actions_performed += 1  # Считаем каждый тап в multi_tap
-                        time.sleep(0.05)  # Уменьшено с 0.1 до 0.05
+                        batch.tap(x, y)
+                        if tap_index < 2:
+                            batch.pause(50)
+                    batch.perform()
+                    actions_performed += 3  # Считаем каждый тап в multi_tap
                 
                 action_time = time.time() - action_start
                 
                 # Периодическая проверка производительности
                 if actions_performed % 10 == 0:
-                    perf_check_start = time.time()
-                    current_size = driver.get_window_size()
-                    perf_check_time = time.time() - perf_check_start
+                    geometry = get_screen_geometry(driver)
+                    perf_check_time = geometry.probe()
                     
                     performance_sample = {
                         'actions_count': actions_performed,
                         'elapsed_time': time.time() - start_time,
                         'action_time': action_time,
                         'perf_check_time': perf_check_time,
-                        'stable': current_size == size
+                        'stable': not geometry.resolution_changed()
                     }
                     
                     performance_samples.append(performance_sample)
@@ -420,3 +412,46 @@ class TestPerformance:
         
         assert actions_performed >= 30, f"Должно быть выполнено минимум 30 действий, выполнено: {actions_performed}"
         assert total_time >= intensive_duration * 0.8, f"Тест должен проработать минимум 80% от запланированного времени ({intensive_duration * 0.8:.1f}с), проработал: {total_time:.1f}с"
+    
+    def test_capture_throughput(self, driver):
+        """Сравнение скорости захвата кадров: Appium PNG против adb screencap в буфер NumPy"""
+        print("\n🖼️ Тест скорости захвата кадров")
+        
+        frames_count = 10
+        
+        # Путь Appium: PNG на устройстве -> base64 -> JSON -> декодирование PNG
+        start_time = time.perf_counter()
+        for i in range(frames_count):
+            with Frame.capture(driver, backend='appium') as frame:
+                frame.image
+        appium_time = time.perf_counter() - start_time
+        appium_fps = frames_count / appium_time
+        
+        # Сырой screencap: RGBA сразу в переиспользуемый буфер
+        framebuffer = get_framebuffer(DEVICE_CONFIG['udid'])
+        raw_fps = None
+        try:
+            framebuffer.grab()  # Первый кадр определяет размер буфера
+            start_time = time.perf_counter()
+            for i in range(frames_count):
+                pixels = framebuffer.grab()
+            raw_time = time.perf_counter() - start_time
+            raw_fps = frames_count / raw_time
+        except Exception as e:
+            print(f"   ⚠️ adb screencap недоступен: {e}")
+        
+        print(f"\n📊 Скорость захвата ({frames_count} кадров):")
+        print(f"   - Appium: {appium_fps:.2f} кадров/сек ({appium_time / frames_count * 1000:.0f}мс на кадр)")
+        if raw_fps:
+            print(f"   - adb screencap: {raw_fps:.2f} кадров/сек ({raw_time / frames_count * 1000:.0f}мс на кадр)")
+            print(f"   - Ускорение: x{raw_fps / appium_fps:.1f}")
+            print(f"   - Кадр: {pixels.shape[1]}x{pixels.shape[0]}")
+        
+        assert appium_fps > 0, "Захват через Appium должен работать"
+        assert raw_fps, "Захват через adb screencap должен работать"
+        assert min(pixels.shape[:2]) > 0 and pixels.shape[2] == 4, "Кадр screencap должен быть непустым RGBA"
+        
+        # screencap отдает физическое разрешение дисплея, а не размер окна приложения
+        physical_size = display_size(DEVICE_CONFIG['udid'])
+        if physical_size:
+            assert max(pixels.shape[:2]) == max(physical_size), "Кадр screencap должен совпадать с разрешением дисплея"
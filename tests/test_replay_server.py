@@ -0,0 +1,118 @@
+"""
+Тесты подставного Appium-сервера (работают без устройства)
+"""
+
+import json
+import socket
+import time
+import pytest
+import requests
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from utils.replay_server import ReplayServer, RecordingProxy, save_cassette, load_cassette
+
+SESSION_ID = "recorded-session"
+
+
+def _interaction(method, path, value, body='', duration=0.0):
+    return {
+        'method': method,
+        'path': path,
+        'body': body,
+        'status': 200,
+        'response': json.dumps({'value': value}),
+        'duration': duration
+    }
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    """Небольшая записанная сессия"""
+    path = str(tmp_path / "session.json")
+    save_cassette(path, [
+        _interaction('POST', '/session', {'sessionId': SESSION_ID, 'capabilities': {'platformName': 'Android'}}),
+        _interaction('GET', f'/session/{SESSION_ID}/window/rect', {'x': 0, 'y': 0, 'width': 1080, 'height': 2340}, duration=0.05),
+        _interaction('GET', f'/session/{SESSION_ID}/source', '<hierarchy rotation="0"><node text="Play"/></hierarchy>'),
+        _interaction('GET', f'/session/{SESSION_ID}/source', '<hierarchy rotation="0"><node text="Level 1"/></hierarchy>'),
+        _interaction('DELETE', f'/session/{SESSION_ID}', None),
+    ])
+    return path
+
+def _connect(url):
+    options = UiAutomator2Options()
+    options.platform_name = 'Android'
+    return webdriver.Remote(command_executor=url, options=options)
+
+class TestReplayServer:
+    """Воспроизведение записанной сессии Appium"""
+
+    def test_replays_commands_in_recorded_order(self, cassette_path):
+        """Ответы выдаются в порядке записи, последний повторяется"""
+        with ReplayServer(cassette_path) as server:
+            driver = _connect(server.url)
+
+            assert driver.get_window_size() == {'width': 1080, 'height': 2340}
+            assert 'Play' in driver.page_source
+            assert 'Level 1' in driver.page_source
+            assert 'Level 1' in driver.page_source
+
+            driver.quit()
+            assert server.unmatched == []
+
+    def test_unknown_command_is_reported(self, cassette_path):
+        """Команда без записи возвращает ошибку W3C и попадает в unmatched"""
+        with ReplayServer(cassette_path) as server:
+            driver = _connect(server.url)
+
+            with pytest.raises(Exception):
+                driver.get_screenshot_as_png()
+
+            assert server.unmatched
+            driver.quit()
+
+    def test_recorded_latency_model(self, cassette_path):
+        """Модель 'recorded' воспроизводит записанную длительность команды"""
+        with ReplayServer(cassette_path, latency='recorded') as server:
+            driver = _connect(server.url)
+
+            start_time = time.perf_counter()
+            driver.get_window_size()
+            elapsed = time.perf_counter() - start_time
+
+            driver.quit()
+
+        assert elapsed >= 0.05
+
+    def test_record_then_replay(self, cassette_path, tmp_path):
+        """Прокси записывает трафик, который потом воспроизводится"""
+        recorded_path = str(tmp_path / "recorded.json")
+
+        with ReplayServer(cassette_path) as upstream:
+            with RecordingProxy(upstream.url, recorded_path) as proxy:
+                driver = _connect(proxy.url)
+                size = driver.get_window_size()
+                source = driver.page_source
+                driver.quit()
+
+        paths = [i['path'] for i in load_cassette(recorded_path)['interactions']]
+        assert paths[0] == '/session'
+        assert f'/session/{SESSION_ID}/window/rect' in paths
+
+        with ReplayServer(recorded_path) as server:
+            driver = _connect(server.url)
+            assert driver.get_window_size() == size
+            assert driver.page_source == source
+            driver.quit()
+
+    def test_proxy_reports_unavailable_upstream(self, tmp_path):
+        """Appium недоступен - прокси отвечает ошибкой W3C 500 и ничего не записывает"""
+        # Порт, на котором никто не слушает
+        with socket.socket() as sock:
+            sock.bind(('localhost', 0))
+            port = sock.getsockname()[1]
+
+        with RecordingProxy(f"http://localhost:{port}", str(tmp_path / "recorded.json")) as proxy:
+            response = requests.get(proxy.url + "/status", timeout=5)
+
+            assert response.status_code == 500
+            assert response.json()['value']['error'] == 'unknown error'
+            assert proxy.interactions == []
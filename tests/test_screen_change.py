@@ -0,0 +1,90 @@
+"""
+Тесты определения смены экрана (работают без устройства)
+"""
+
+import io
+from PIL import Image, ImageDraw
+from utils.screen_change import ScreenChangeDetector, screens_differ, screenshot_pixels
+from utils.helpers import capture_screen_state, wait_for_screen_change
+
+
+def _png(color=(40, 40, 40), box=None, box_color=(250, 250, 250)):
+    image = Image.new('RGB', (540, 1170), color)
+    if box:
+        ImageDraw.Draw(image).rectangle(box, fill=box_color)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+class ScriptedDriver:
+    """Драйвер, у которого экран меняется после заданного числа скриншотов"""
+
+    def __init__(self, frames, page_source="<hierarchy/>"):
+        self.frames = frames
+        self.page_source = page_source
+        self.screenshots = 0
+
+    def get_screenshot_as_png(self):
+        frame = self.frames[min(self.screenshots, len(self.frames) - 1)]
+        self.screenshots += 1
+        return frame
+
+
+class TestScreenChange:
+    """Смена экрана, шум и маски анимированных областей"""
+
+    def test_small_noise_is_not_change(self):
+        """Незначительная разница яркости (шум сжатия) не считается сменой"""
+        assert not screens_differ(screenshot_pixels(_png((40, 40, 40))), screenshot_pixels(_png((41, 41, 41))))
+
+    def test_small_dialog_is_change(self):
+        """Небольшое окно поверх экрана - смена, даже если оно не совпадает с границами квантования"""
+        base = screenshot_pixels(_png())
+        dialog = screenshot_pixels(_png(box=(170, 480, 370, 690), box_color=(90, 90, 90)))
+
+        assert screens_differ(base, dialog)
+
+    def test_ignore_region_masks_animation(self):
+        """Изменение в маскированной области не считается сменой экрана"""
+        base = _png()
+        animated = _png(box=(0, 0, 540, 200))
+        mask = [(0.0, 0.0, 1.0, 0.2)]
+
+        assert screens_differ(screenshot_pixels(base), screenshot_pixels(animated))
+        assert not screens_differ(screenshot_pixels(base, mask), screenshot_pixels(animated, mask))
+
+    def test_detects_change_with_timing(self):
+        """Смена экрана обнаруживается и время сообщается в мс"""
+        frames = [_png(), _png(), _png(), _png(box=(100, 400, 440, 800))]
+        detector = ScreenChangeDetector(ScriptedDriver(frames))
+        detector.capture_baseline()
+
+        elapsed_ms = detector.wait_for_change(timeout=5)
+
+        assert elapsed_ms is not None
+        assert detector.polls == 3
+
+    def test_timeout_without_change(self):
+        """Без изменений ожидание завершается по таймауту"""
+        detector = ScreenChangeDetector(ScriptedDriver([_png()]))
+        detector.capture_baseline()
+
+        assert detector.wait_for_change(timeout=0.3) is None
+
+    def test_fast_transition_after_action(self):
+        """Исходное состояние снято до действия - мгновенная смена экрана не теряется"""
+        driver = ScriptedDriver([_png(), _png(box=(100, 400, 440, 800))])
+        initial_state = capture_screen_state(driver)
+
+        # Действие: экран уже сменился к первому опросу
+        assert wait_for_screen_change(driver, initial_state, timeout=1)
+        assert driver.screenshots == 2
+
+    def test_source_baseline_from_before_action(self):
+        """page_source, полученный до действия, тоже годится как исходное состояние"""
+        driver = ScriptedDriver([_png()], page_source="<hierarchy><menu/></hierarchy>")
+        initial_source = driver.page_source
+        driver.page_source = "<hierarchy><level/></hierarchy>"
+
+        assert wait_for_screen_change(driver, initial_source, timeout=1)
@@ -0,0 +1,105 @@
+"""
+Тесты кэша геометрии экрана (работают без устройства)
+"""
+
+import pytest
+from utils.screen_geometry import ScreenGeometry, get_screen_geometry
+
+
+class CountingDriver:
+    """Драйвер, считающий запросы размеров и ориентации"""
+
+    def __init__(self, session_id="session", size=(1080, 2340)):
+        self.session_id = session_id
+        self.size = size
+        self.calls = {'window_size': 0, 'orientation': 0, 'status': 0}
+        self.rotation_locked = False
+        self._orientation = "PORTRAIT"
+
+    def get_window_size(self):
+        self.calls['window_size'] += 1
+        return {'width': self.size[0], 'height': self.size[1]}
+
+    @property
+    def orientation(self):
+        self.calls['orientation'] += 1
+        return self._orientation
+
+    @orientation.setter
+    def orientation(self, value):
+        if self.rotation_locked:
+            raise RuntimeError("rotation locked")
+        self._orientation = value
+        self.size = (max(self.size), min(self.size)) if value == "LANDSCAPE" else (min(self.size), max(self.size))
+
+    def get_status(self):
+        self.calls['status'] += 1
+        return {}
+
+
+class TestScreenGeometry:
+    """Кэш размеров, сброс при смене ориентации и гистограмма проверок"""
+
+    def test_window_size_cached(self):
+        """Размер запрашивается у устройства один раз на сессию"""
+        driver = CountingDriver()
+
+        for _ in range(5):
+            assert get_screen_geometry(driver).window_size() == {'width': 1080, 'height': 2340}
+
+        assert driver.calls['window_size'] == 1
+        assert get_screen_geometry(CountingDriver("other")) is not get_screen_geometry(driver)
+
+    def test_set_orientation_invalidates(self):
+        """После смены ориентации размер и ориентация запрашиваются заново"""
+        driver = CountingDriver()
+        geometry = ScreenGeometry(driver)
+        geometry.window_size()
+
+        geometry.set_orientation("LANDSCAPE")
+
+        assert geometry.window_size() == {'width': 2340, 'height': 1080}
+        assert geometry.orientation() == "LANDSCAPE"
+        assert driver.calls['window_size'] == 2
+
+    def test_failed_orientation_change_invalidates(self):
+        """Неудачная смена ориентации тоже сбрасывает кэш"""
+        driver = CountingDriver()
+        driver.rotation_locked = True
+        geometry = ScreenGeometry(driver)
+        geometry.window_size()
+
+        with pytest.raises(RuntimeError):
+            geometry.set_orientation("LANDSCAPE")
+        geometry.window_size()
+
+        assert driver.calls['window_size'] == 2
+
+    def test_resolution_changed(self):
+        """Смена разрешения обнаруживается и обновляет кэш"""
+        driver = CountingDriver()
+        geometry = ScreenGeometry(driver)
+        geometry.window_size()
+
+        assert not geometry.resolution_changed()
+        driver.size = (720, 1560)
+        assert geometry.resolution_changed()
+        assert geometry.window_size() == {'width': 720, 'height': 1560}
+
+    def test_probe_histogram(self):
+        """Задержки проверок раскладываются по корзинам, сброс перед тестом"""
+        geometry = ScreenGeometry(CountingDriver())
+
+        latency = geometry.probe()
+        geometry.probe_latencies += [0.004, 0.03, 0.2, 5.0]
+        histogram = geometry.probe_histogram()
+
+        assert latency >= 0
+        assert sum(histogram.values()) == 5
+        assert histogram['<=10мс'] >= 1
+        assert histogram['<=50мс'] == 1
+        assert histogram['<=250мс'] == 1
+        assert histogram['>1000мс'] == 1
+
+        geometry.reset_probes()
+        assert sum(geometry.probe_histogram().values()) == 0
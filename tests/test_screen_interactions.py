@@ -5,6 +5,9 @@
 import time
 import pytest
 from utils.helpers import wait_and_screenshot
+from utils.screen_geometry import get_screen_geometry
+from pages.base_page import BasePage
+from pages.main_menu_page import MainMenuPage
 
 class TestScreenInteractions:
     """Тесты взаимодействия с экраном через тапы и жесты"""
@@ -13,11 +16,10 @@ class TestScreenInteractions:
         """Тап по главной кнопке Play (розовая кнопка)"""
         print("\n🎯 Тест тапа по кнопке Play")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         
-        # Координаты розовой кнопки Play
-        play_x = size['width'] // 2
-        play_y = int(size['height'] * 0.32)
+        # Координаты розовой кнопки Play (по шаблону, иначе по долям экрана)
+        play_x, play_y = MainMenuPage(driver).play_tap_point()
         
         print(f"🎯 Координаты кнопки Play: ({play_x}, {play_y})")
         
@@ -45,8 +47,7 @@ class TestScreenInteractions:
                 screen_changed = False
             
             # Проверяем что приложение стабильно
-            current_size = driver.get_window_size()
-            assert current_size == size, "Размер экрана должен остаться тем же"
+            assert not get_screen_geometry(driver).resolution_changed(), "Размер экрана должен остаться тем же"
             
             print(f"📊 Результат тапа по Play: {'Реагирует' if screen_changed else 'Не реагирует'}")
             
@@ -57,11 +58,12 @@ class TestScreenInteractions:
         """Тест тапов по вторичным кнопкам"""
         print("\n🎯 Тест тапов по вторичным кнопкам")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
+        account_x, account_y = MainMenuPage(driver).my_account_tap_point()
         
         # Координаты различных кнопок
         buttons = [
-            ("Синяя кнопка (My Account)", size['width']//2, int(size['height'] * 0.42)),
+            ("Синяя кнопка (My Account)", account_x, account_y),
             ("Левый нижний угол (Настройки)", int(size['width'] * 0.1), int(size['height'] * 0.9)),
             ("Правый верхний угол", int(size['width'] * 0.9), int(size['height'] * 0.1)),
         ]
@@ -103,7 +105,7 @@ class TestScreenInteractions:
         """Тест свайпов в разных направлениях"""
         print("\n👆 Тест жестов свайпа")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         successful_swipes = 0
         
         # Различные направления свайпов
@@ -149,7 +151,7 @@ class TestScreenInteractions:
         """Тест мультитач жестов (зум, пинч)"""
         print("\n🤏 Тест мультитач жестов")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         center_x = size['width'] // 2
         center_y = size['height'] // 2
         
@@ -178,16 +180,13 @@ class TestScreenInteractions:
                 
                 # Попытка выполнить мультитач жест
                 try:
-                    # Используем простую эмуляцию через последовательные тапы
-                    for point in start_points:
-                        driver.tap([point])
-                        time.sleep(0.1)
+                    # Настоящий пинч двумя пальцами одним запросом
+                    start_distance = start_points[1][0] - start_points[0][0]
+                    end_distance = end_points[1][0] - end_points[0][0]
                     
-                    time.sleep(1)
-                    
-                    for point in end_points:
-                        driver.tap([point])
-                        time.sleep(0.1)
+                    BasePage(driver).gesture_batch().pinch(
+                        center_x, center_y, start_distance, end_distance, duration_ms=500
+                    ).perform()
                     
                     print(f"   ✅ {gesture_name}: жест выполнен")
                     
@@ -202,8 +201,7 @@ class TestScreenInteractions:
                 after_source = driver.page_source
                 
                 # Проверяем что приложение осталось стабильным
-                current_size = driver.get_window_size()
-                if current_size == size:
+                if not get_screen_geometry(driver).resolution_changed():
                     successful_multitouch += 1
                     print(f"   ✅ {gesture_name}: приложение стабильно")
                 else:
@@ -219,7 +217,7 @@ class TestScreenInteractions:
         """Тест отзывчивости различных зон экрана"""
         print("\n📍 Тест отзывчивости зон экрана")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         
         # Разделяем экран на зоны (сетка 3x3)
         zones = []
@@ -244,9 +242,8 @@ class TestScreenInteractions:
                 
                 # Проверяем что приложение отвечает
                 after_source = driver.page_source
-                current_size = driver.get_window_size()
                 
-                if current_size == size:
+                if not get_screen_geometry(driver).resolution_changed():
                     responsive_zones += 1
                     
                     if after_source != before_source:
@@ -276,7 +273,7 @@ class TestScreenInteractions:
         """Тест быстрой последовательности тапов"""
         print("\n⚡ Тест быстрых тапов")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         center_x = size['width'] // 2
         center_y = size['height'] // 2
         
@@ -288,21 +285,19 @@ class TestScreenInteractions:
         before_screenshot = wait_and_screenshot(driver, "before_rapid_taps")
         start_time = time.time()
         
+        # Все тапы уходят одним запросом с точными паузами 100 мс
+        batch = BasePage(driver).gesture_batch()
         for i in range(tap_count):
-            try:
-                driver.tap([(center_x, center_y)])
-                successful_taps += 1
-                time.sleep(0.1)  # Очень короткая пауза между тапами
-                
-                if i % 3 == 0:  # Проверяем каждый 3-й тап
-                    current_size = driver.get_window_size()
-                    if current_size != size:
-                        print(f"   ⚠️ Размер экрана изменился на тапе {i+1}")
-                        break
-                        
-            except Exception as e:
-                print(f"   ❌ Ошибка на тапе {i+1}: {e}")
-                break
+            batch.tap(center_x, center_y)
+            if i < tap_count - 1:
+                batch.pause(100)  # Очень короткая пауза между тапами
+        
+        try:
+            batch_stats = batch.perform()
+            successful_taps = tap_count
+        except Exception as e:
+            print(f"   ❌ Ошибка пакета тапов: {e}")
+            batch_stats = None
         
         total_time = time.time() - start_time
         after_screenshot = wait_and_screenshot(driver, "after_rapid_taps")
@@ -310,12 +305,13 @@ class TestScreenInteractions:
         print(f"📊 Результаты быстрых тапов:")
         print(f"   - Выполнено тапов: {successful_taps}/{tap_count}")
         print(f"   - Общее время: {total_time:.2f} секунд")
-        print(f"   - Скорость: {successful_taps/total_time:.1f} тапов/сек")
+        if batch_stats:
+            print(f"   - Скорость: {batch_stats['achieved_rate']:.1f} тапов/сек "
+                  f"(запланировано {batch_stats['intended_rate']:.1f})")
         
         # Проверяем финальную стабильность
         try:
-            final_size = driver.get_window_size()
-            assert final_size == size, "Приложение должно остаться стабильным"
+            assert not get_screen_geometry(driver).resolution_changed(), "Приложение должно остаться стабильным"
             print("✅ Приложение стабильно после быстрых тапов")
         except Exception as e:
             assert False, f"Приложение нестабильно после быстрых тапов: {e}"
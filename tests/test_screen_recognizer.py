@@ -0,0 +1,101 @@
+"""
+Тесты распознавания экрана по dHash (работают без устройства)
+"""
+
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+from utils.screen_recognizer import ScreenIndex, ScreenRecognizer, dhash
+
+
+def _screen(kind, noise_seed=None):
+    """Синтетические экраны: меню (кнопка по центру), карта (дорожка), поле (сетка)"""
+    image = Image.new('RGB', (1080, 2340), (230, 120, 170))
+    draw = ImageDraw.Draw(image)
+    if kind == 'main_menu':
+        draw.rectangle([290, 1500, 790, 1700], fill=(250, 200, 40))
+        draw.ellipse([240, 300, 840, 900], fill=(200, 40, 90))
+    elif kind == 'level_map':
+        for i in range(12):
+            x = 540 + int(300 * np.sin(i / 2))
+            draw.ellipse([x - 60, 2080 - i * 180, x + 60, 2200 - i * 180], fill=(60, 60, 200))
+    elif kind == 'game_board':
+        for i in range(9):
+            for j in range(9):
+                color = (90, 150, 230) if (i + j) % 2 else (120, 220, 120)
+                draw.rectangle([60 + i * 110, 600 + j * 110, 160 + i * 110, 700 + j * 110], fill=color)
+
+    if noise_seed is not None:
+        # Шум сжатия и мелкие анимации
+        pixels = np.asarray(image).astype(np.int16)
+        noise = np.random.default_rng(noise_seed).integers(-6, 7, pixels.shape)
+        image = Image.fromarray(np.clip(pixels + noise, 0, 255).astype(np.uint8))
+
+    return image
+
+
+def _index(tmp_path):
+    index = ScreenIndex(path=str(tmp_path / "screen_index.json"))
+    for label in ('main_menu', 'level_map', 'game_board'):
+        index.add(label, _screen(label))
+    return index
+
+
+class TestScreenRecognizer:
+    """Распознавание по ближайшему хешу"""
+
+    def test_hash_size(self):
+        """dHash 16x16 - 32 байта"""
+        assert dhash(_screen('main_menu')).shape == (32,)
+
+    def test_recognizes_noisy_screens(self, tmp_path):
+        """Каждый экран с шумом узнается по своей метке"""
+        recognizer = ScreenRecognizer(_index(tmp_path))
+
+        for label in ('main_menu', 'level_map', 'game_board'):
+            recognized, distance = recognizer.recognize_image(_screen(label, noise_seed=1))
+            assert recognized == label
+            assert distance <= 10
+
+    def test_unknown_screen(self, tmp_path):
+        """Непохожий экран не получает метку - страница проверяется по XPath"""
+        recognizer = ScreenRecognizer(_index(tmp_path))
+        gradient = Image.fromarray(np.tile(np.linspace(0, 255, 1080).astype(np.uint8), (2340, 1)))
+
+        label, distance = recognizer.recognize_image(gradient)
+
+        assert label is None
+        assert distance > 40
+
+    def test_empty_index(self, tmp_path):
+        """Без индекса распознавание не выполняется"""
+        recognizer = ScreenRecognizer(ScreenIndex.load(str(tmp_path / "missing.json")))
+
+        assert recognizer.recognize_image(_screen('main_menu')) == (None, None)
+        assert recognizer.recognize(driver=None) == (None, None)
+
+    def test_save_and_load(self, tmp_path):
+        """Индекс сохраняется в JSON и читается обратно"""
+        index = _index(tmp_path)
+        index.save()
+
+        loaded = ScreenIndex.load(index.path)
+
+        assert loaded.labels == index.labels
+        assert np.array_equal(loaded.hashes, index.hashes)
+
+    def test_lookup_speed(self, tmp_path):
+        """Поиск по тысяче эталонов - миллисекунды"""
+        index = ScreenIndex(path=str(tmp_path / "screen_index.json"))
+        rng = np.random.default_rng(0)
+        index.labels = [f"screen_{i}" for i in range(1000)]
+        index.hashes = rng.integers(0, 256, (1000, 32), dtype=np.uint8)
+        value = dhash(_screen('game_board'))
+
+        start = time.perf_counter()
+        for _ in range(100):
+            index.nearest(value)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / 100
+
+        print(f"\n🧭 Поиск по 1000 эталонам: {elapsed_ms:.3f}мс")
+        assert elapsed_ms < 20
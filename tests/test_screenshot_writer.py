@@ -0,0 +1,66 @@
+"""
+Тесты фоновой записи скриншотов (работают без устройства)
+"""
+
+import base64
+import os
+import time
+from config.settings import SCREENSHOTS
+from utils.screenshot_writer import ScreenshotWriter, unique_filename
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+
+
+class ScreenshotDriver:
+    """Драйвер, отдающий один и тот же скриншот"""
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(PNG).decode('ascii')
+
+
+class TestScreenshotWriter:
+    """Уникальные имена, запись в фоне и ограничение очереди"""
+
+    def test_unique_filenames_within_one_second(self):
+        """Снимки одной секунды не перезаписывают друг друга"""
+        names = {unique_filename("shot", "png") for _ in range(100)}
+
+        assert len(names) == 100
+
+    def test_capture_writes_after_flush(self, tmp_path, monkeypatch):
+        """После flush все файлы на диске с декодированным содержимым"""
+        monkeypatch.setitem(SCREENSHOTS, 'directory', str(tmp_path))
+        writer = ScreenshotWriter(workers=2, max_pending=4)
+
+        filenames = [writer.capture(ScreenshotDriver(), f"shot_{i}") for i in range(10)]
+        errors = writer.flush()
+        writer.shutdown()
+
+        assert errors == []
+        assert writer.written == 10
+        for filename in filenames:
+            with open(filename, 'rb') as f:
+                assert f.read() == PNG
+
+    def test_backpressure_blocks_when_queue_full(self, tmp_path, monkeypatch):
+        """При заполненной очереди следующий кадр ждет освобождения места"""
+        monkeypatch.setitem(SCREENSHOTS, 'directory', str(tmp_path))
+        writer = ScreenshotWriter(workers=1, max_pending=1)
+        original_write = writer._write_bytes
+
+        def slow_write(filename, data):
+            time.sleep(0.2)
+            original_write(filename, data)
+
+        monkeypatch.setattr(writer, '_write_bytes', slow_write)
+
+        start_time = time.perf_counter()
+        writer.save_png(PNG, "first")
+        queued_time = time.perf_counter() - start_time
+        writer.save_png(PNG, "second")
+        blocked_time = time.perf_counter() - start_time
+        writer.shutdown()
+
+        assert queued_time < 0.1
+        assert blocked_time >= 0.15
+        assert len(os.listdir(tmp_path)) == 2
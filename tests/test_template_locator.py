@@ -0,0 +1,140 @@
+"""
+Тесты поиска кнопок по шаблонам (работают без устройства)
+"""
+
+import io
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+from appium.webdriver.common.appiumby import AppiumBy
+import pages.base_page as base_page
+from pages.main_menu_page import MainMenuPage
+from utils.locator_stats import LocatorStats
+from utils.template_locator import TemplateLocator, gray_array, ncc_map
+
+
+def _draw_button(draw, x, y, scale):
+    """Розовая кнопка с белой надписью-полосками"""
+    width, height = int(420 * scale), int(150 * scale)
+    draw.rounded_rectangle([x, y, x + width, y + height], radius=int(40 * scale), fill=(240, 70, 150))
+    for i in range(4):
+        left = x + int((60 + i * 80) * scale)
+        draw.rectangle([left, y + int(50 * scale), left + int(50 * scale), y + int(100 * scale)], fill=(255, 255, 255))
+
+def _screen(width, height, button_at=None):
+    """Экран с градиентным фоном и кнопкой в точке button_at (в долях экрана)"""
+    gradient = np.linspace(40, 200, height, dtype=np.float32)[:, None]
+    pixels = np.dstack([np.repeat(gradient, width, axis=1) * k for k in (0.5, 0.7, 1.0)]).astype(np.uint8)
+    image = Image.fromarray(pixels)
+    if button_at:
+        _draw_button(ImageDraw.Draw(image), int(width * button_at[0]), int(height * button_at[1]), width / 1080)
+    return image
+
+def _template_dir(tmp_path):
+    """Шаблон вырезан на экране 1080 px"""
+    template = Image.new('RGB', (440, 170), (0, 0, 0))
+    reference = _screen(1080, 2340, (0.3, 0.32))
+    template.paste(reference.crop((314, 739, 754, 909)))
+    template.save(tmp_path / "play_button.png")
+    return str(tmp_path)
+
+
+class FakeDriver:
+    """Драйвер без элементов, отдающий один скриншот"""
+
+    session_id = 'template-test'
+
+    def __init__(self, image):
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        self.png = buffer.getvalue()
+        self.taps = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def find_elements(self, by, value):
+        return []
+
+    def get_screenshot_as_png(self):
+        return self.png
+
+    def get_window_size(self):
+        return {'width': 540, 'height': 1170}
+
+    def tap(self, positions):
+        self.taps.append(positions[0])
+
+
+class TestTemplateLocator:
+    """Пирамида масштабов, NCC и кэш позиций"""
+
+    def test_ncc_exact_match(self):
+        """Вырезанный фрагмент дает корреляцию 1 в своей позиции"""
+        image = gray_array(_screen(300, 400, (0.2, 0.5)))
+        template = image[200:240, 60:180]
+
+        scores = ncc_map(image, template)
+        y, x = np.unravel_index(int(scores.argmax()), scores.shape)
+
+        assert (x, y) == (60, 200)
+        assert scores[y, x] > 0.99
+
+    def test_finds_button_on_other_resolution(self, tmp_path):
+        """Шаблон с экрана 1080 находится на экране 720x1600 с другим соотношением сторон"""
+        locator = TemplateLocator(_template_dir(tmp_path))
+
+        match = locator.locate(_screen(720, 1600, (0.3, 0.4)), 'play_button', 'main_menu')
+
+        assert match is not None
+        assert match.score > 0.8
+        cx, cy = match.center
+        assert abs(cx - (216 + 140)) <= 6
+        assert abs(cy - (640 + 50)) <= 6
+
+    def test_cached_position_is_reverified(self, tmp_path):
+        """Повторный поиск проверяет кэш одной корреляцией; сдвинутая кнопка ищется заново"""
+        locator = TemplateLocator(_template_dir(tmp_path))
+        screen = _screen(1080, 2340, (0.3, 0.32))
+
+        start = time.perf_counter()
+        locator.locate(screen, 'play_button', 'main_menu')
+        search_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        match = locator.locate(screen, 'play_button', 'main_menu')
+        cached_ms = (time.perf_counter() - start) * 1000
+
+        moved = locator.locate(_screen(1080, 2340, (0.3, 0.6)), 'play_button', 'main_menu')
+
+        print(f"\n🎯 Поиск: {search_ms:.1f}мс, проверка кэшированной позиции: {cached_ms:.1f}мс")
+        assert match.cached
+        assert cached_ms < search_ms
+        assert not moved.cached
+        assert abs(moved.center[1] - (int(2340 * 0.6) + 75)) <= 6
+
+    def test_no_match_and_missing_template(self, tmp_path):
+        """Экран без кнопки и отсутствующий шаблон - None"""
+        locator = TemplateLocator(_template_dir(tmp_path))
+
+        assert locator.locate(_screen(1080, 2340), 'play_button') is None
+        assert locator.locate(_screen(1080, 2340), 'no_such_button') is None
+
+    def test_page_template_strategy(self, tmp_path, monkeypatch):
+        """Стратегия ('template', имя) в списке локаторов page object: тап в координатах окна"""
+        locator = TemplateLocator(_template_dir(tmp_path))
+        stats = LocatorStats(str(tmp_path / "stats.json"), 'test')
+        monkeypatch.setattr(base_page, 'get_template_locator', lambda: locator)
+        monkeypatch.setattr(base_page, 'get_locator_stats', lambda: stats)
+        monkeypatch.setattr(MainMenuPage, 'PLAY_BUTTON_LOCATORS', [
+            (AppiumBy.XPATH, "//*[@text='Play']"),
+            ('template', 'play_button'),
+        ])
+        driver = FakeDriver(_screen(1080, 2340, (0.3, 0.32)))
+        page = MainMenuPage(driver)
+
+        assert page.click_play()
+        x, y = driver.taps[0]
+        # Скриншот 1080x2340, окно 540x1170
+        assert abs(x - (324 + 210) // 2) <= 4
+        assert abs(y - (748 + 75) // 2) <= 4
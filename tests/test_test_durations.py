@@ -0,0 +1,71 @@
+"""
+Тесты истории длительностей и шардирования (работают без устройства)
+"""
+
+from utils.test_durations import estimate_duration, load_durations, merge_durations, save_durations, shard_tests
+from config.settings import PARALLEL_CONFIG
+
+
+class TestDurations:
+    """Оценка длительности, сглаживание истории и раскладка по воркерам"""
+
+    def test_shards_are_balanced(self):
+        """Длинные тесты раскладываются так, что воркеры загружены почти поровну"""
+        durations = {f"tests/test_a.py::test_{i}": float(duration)
+                     for i, duration in enumerate([120, 90, 60, 60, 45, 30, 30, 20, 10, 5])}
+
+        shards, loads = shard_tests(sorted(durations), durations, 3)
+
+        assert sorted(nodeid for shard in shards for nodeid in shard) == sorted(durations)
+        assert max(loads) - min(loads) <= 20
+        assert max(loads) < sum(durations.values()) / 3 + 30
+
+    def test_more_workers_than_tests(self):
+        """Лишние воркеры остаются пустыми, пустой список воркеров не падает"""
+        shards, loads = shard_tests(["tests/test_a.py::test_1"], {}, 3)
+
+        assert [len(shard) for shard in shards] == [1, 0, 0]
+        assert shard_tests(["tests/test_a.py::test_1"], {}, 0) == ([], [])
+
+    def test_empty_history_uses_default(self):
+        """Без истории все тесты стоят default_test_duration и делятся между воркерами поровну"""
+        test_ids = [f"tests/test_device.py::test_{i}" for i in range(6)]
+
+        shards, loads = shard_tests(test_ids, load_durations("reports/missing_durations.json"), 3)
+
+        assert [len(shard) for shard in shards] == [2, 2, 2]
+        assert loads == [2 * PARALLEL_CONFIG['default_test_duration']] * 3
+
+    def test_unknown_test_estimates(self):
+        """Без истории теста - среднее по его файлу, без истории файла - значение по умолчанию"""
+        durations = {
+            "tests/test_a.py::test_1": 10.0,
+            "tests/test_a.py::test_2": 30.0
+        }
+
+        assert estimate_duration("tests/test_a.py::test_1", durations) == 10.0
+        assert estimate_duration("tests/test_a.py::test_new", durations) == 20.0
+        assert estimate_duration("tests/test_b.py::test_new", durations) == PARALLEL_CONFIG['default_test_duration']
+
+    def test_merge_smoothing(self):
+        """Новый замер сглаживается с историей, новые тесты добавляются как есть"""
+        weight = PARALLEL_CONFIG['duration_smoothing']
+        history = {"tests/test_a.py::test_1": 10.0, "tests/test_a.py::test_2": 5.0}
+
+        merged = merge_durations(history, {"tests/test_a.py::test_1": 20.0, "tests/test_b.py::test_1": 7.0})
+
+        assert merged["tests/test_a.py::test_1"] == (1 - weight) * 10.0 + weight * 20.0
+        assert merged["tests/test_a.py::test_2"] == 5.0
+        assert merged["tests/test_b.py::test_1"] == 7.0
+        assert history["tests/test_a.py::test_1"] == 10.0
+
+    def test_save_and_load(self, tmp_path):
+        """История дописывается в файл и читается обратно"""
+        path = str(tmp_path / "reports" / "durations.json")
+
+        save_durations({"tests/test_a.py::test_1": 4.0}, path)
+        save_durations({"tests/test_a.py::test_1": 8.0}, path)
+
+        weight = PARALLEL_CONFIG['duration_smoothing']
+        assert load_durations(path) == {"tests/test_a.py::test_1": (1 - weight) * 4.0 + weight * 8.0}
+        assert load_durations(str(tmp_path / "missing.json")) == {}
@@ -0,0 +1,105 @@
+"""
+Тесты трассировки команд драйвера (работают без устройства)
+"""
+
+import json
+import threading
+import time
+from utils.tracing import CommandTracer, TracingDriver
+from utils.screen_geometry import get_screen_geometry
+
+
+class FakeDriver:
+    """Драйвер с командами, свойствами и медленной командой"""
+
+    session_id = "traced-session"
+
+    def __init__(self):
+        self.orientation = "PORTRAIT"
+
+    @property
+    def page_source(self):
+        return "<hierarchy/>"
+
+    def get_window_size(self):
+        return {'width': 1080, 'height': 2340}
+
+    def tap(self, positions):
+        time.sleep(0.02)
+
+
+class TestTracing:
+    """Спаны команд, пауз и формат Chrome trace"""
+
+    def test_commands_and_properties_are_traced(self):
+        """Вызовы методов, чтение и запись свойств-команд становятся спанами"""
+        tracer = CommandTracer("test_example")
+        driver = TracingDriver(FakeDriver(), tracer)
+
+        driver.tap([(1, 1)])
+        assert driver.page_source == "<hierarchy/>"
+        driver.orientation = "LANDSCAPE"
+        assert driver.session_id == "traced-session"
+
+        names = [span['name'] for span in tracer.spans]
+        assert names == ['tap', 'page_source', 'set orientation']
+        assert tracer.spans[0]['end_ns'] - tracer.spans[0]['start_ns'] >= 20_000_000
+
+    def test_page_method_tag(self):
+        """Команда из хелпера помечается вызвавшим методом"""
+        tracer = CommandTracer("test_example")
+        driver = TracingDriver(FakeDriver(), tracer)
+
+        get_screen_geometry(driver).window_size(refresh=True)
+
+        assert tracer.spans[-1]['name'] == 'get_window_size'
+        assert tracer.spans[-1]['tag'] == 'ScreenGeometry.window_size'
+
+    def test_sleep_is_traced_and_restored(self):
+        """Паузы теста попадают в трассу, после restore_sleep - нет"""
+        original_sleep = time.sleep
+        tracer = CommandTracer("test_example")
+
+        tracer.patch_sleep()
+        try:
+            time.sleep(0.01)
+        finally:
+            tracer.restore_sleep()
+        time.sleep(0.01)
+
+        assert time.sleep is original_sleep
+        assert [span['cat'] for span in tracer.spans] == ['sleep']
+
+    def test_background_thread_sleep_not_traced(self):
+        """Паузы фоновых потоков не попадают в трассу теста"""
+        tracer = CommandTracer("test_example")
+
+        tracer.patch_sleep()
+        try:
+            worker = threading.Thread(target=time.sleep, args=(0.01,))
+            worker.start()
+            worker.join()
+            time.sleep(0.01)
+        finally:
+            tracer.restore_sleep()
+
+        assert len(tracer.spans) == 1
+        assert tracer.spans[0]['tid'] == threading.get_ident()
+
+    def test_chrome_trace_export(self, tmp_path):
+        """Файл трассы - Chrome trace: событие теста и спаны в микросекундах"""
+        tracer = CommandTracer("test_example[param 1]")
+        driver = TracingDriver(FakeDriver(), tracer)
+        driver.tap([(1, 1)])
+
+        path = tracer.export(str(tmp_path))
+        with open(path, 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+
+        assert path.endswith("trace_test_example_param_1_.json")
+        events = trace['traceEvents']
+        assert events[0]['cat'] == 'test' and events[0]['name'] == "test_example[param 1]"
+        assert events[1]['name'] == 'tap' and events[1]['ph'] == 'X'
+        assert 15_000 <= events[1]['dur'] <= events[0]['dur']
+        assert events[1]['ts'] >= 0
+        assert events[1]['args']['test'] == "test_example[param 1]"
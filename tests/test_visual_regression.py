@@ -0,0 +1,91 @@
+"""
+Тесты сравнения с эталонными скриншотами (работают без устройства)
+"""
+
+import os
+import time
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from config.settings import SCREENSHOTS
+from utils.screenshot_writer import get_screenshot_writer
+from utils.visual_regression import BaselineStore, VisualRegression, render_heatmap
+
+
+def _screen(box=None):
+    image = Image.new('RGB', (1080, 2340), (230, 120, 170))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([290, 700, 790, 800], fill=(90, 150, 230))
+    if box:
+        draw.rectangle(box, fill=(20, 200, 20))
+    return image
+
+@pytest.fixture
+def regression(tmp_path, monkeypatch):
+    monkeypatch.setitem(SCREENSHOTS, 'directory', str(tmp_path / "reports"))
+    store = BaselineStore(str(tmp_path / "baselines"))
+    VisualRegression(store, update=True).compare("Главный экран", _screen())
+    return VisualRegression(store, update=False)
+
+class TestVisualRegression:
+    """Эталоны, маски и тепловая карта"""
+
+    def test_identical_frame(self, regression):
+        """Кадр без изменений совпадает без поблочного сравнения"""
+        result = regression.compare("Главный экран", _screen())
+
+        assert result['status'] == 'identical'
+        assert result['passed']
+
+    def test_change_fails_with_heatmap(self, regression):
+        """Заметное изменение - регрессия и карта отличий в reports/"""
+        result = regression.compare("Главный экран", _screen(box=(0, 1200, 1080, 1700)))
+        get_screenshot_writer().flush()
+
+        assert not result['passed']
+        assert result['changed_tiles'] > 0
+        assert os.path.exists(result['heatmap'])
+
+    def test_ignore_region(self, regression):
+        """Изменение в маскированной области не считается регрессией"""
+        result = regression.compare("Главный экран", _screen(box=(0, 0, 1080, 300)),
+                                    ignore_regions=[(0.0, 0.0, 1.0, 0.15)])
+
+        assert result['changed_tiles'] == 0
+        assert result['passed']
+
+    def test_compare_is_fast(self, regression):
+        """Сравнение кадра укладывается в десятки миллисекунд"""
+        image = _screen(box=(100, 100, 400, 400))
+
+        start_time = time.perf_counter()
+        regression.compare("Главный экран", image)
+
+        assert time.perf_counter() - start_time < 0.5
+
+    def test_missing_baseline_fails(self, tmp_path):
+        """Без эталона кадр не становится эталоном молча - сравнение не пройдено"""
+        store = BaselineStore(str(tmp_path / "baselines"))
+        result = VisualRegression(store, update=False).compare("Уровень 1", _screen())
+
+        assert result['status'] == 'missing'
+        assert not result['passed']
+        assert not os.path.exists(result['baseline'])
+
+    def test_baseline_per_resolution(self, regression):
+        """Эталон другого разрешения не используется: кадр другого устройства - без эталона"""
+        result = regression.compare("Главный экран", _screen().resize((720, 1560)))
+
+        assert result['status'] == 'missing'
+        assert result['baseline'].endswith("_720x1560.png")
+
+    def test_heatmap_tiles_stay_in_place(self):
+        """Кадр не кратен размеру блока - блок закрашивается на своем месте, а не растягивается"""
+        image = Image.new('RGB', (100, 70), (0, 0, 0))
+        differences = np.zeros((4, 6), dtype=np.float32)
+        differences[3, 5] = 50.0
+
+        red = render_heatmap(image, differences, 12.0, 16)[..., 0] > 0
+
+        assert red[48:64, 80:96].all()
+        assert red.sum() == 16 * 16
@@ -5,8 +5,11 @@
 import time
 import pytest
 from utils.helpers import wait_and_screenshot
-from PIL import Image
-import io
+from utils.screen_geometry import get_screen_geometry
+from utils.frames import Frame
+from utils.frame_stats import evaluate_frame
+from utils.visual_regression import VisualRegression
+from pages.main_menu_page import MainMenuPage
 
 class TestVisualValidation:
     """Тесты визуального контроля и проверки интерфейса"""
@@ -15,34 +18,34 @@ class TestVisualValidation:
         """Проверка присутствия основных элементов на главном экране"""
         print("\n👁️ Тест присутствия элементов главного экрана")
         
-        # Делаем скриншот для анализа
-        screenshot_path = wait_and_screenshot(driver, "main_screen_elements")
-        
-        # Получаем скриншот как изображение для анализа
-        screenshot_png = driver.get_screenshot_as_png()
-        image = Image.open(io.BytesIO(screenshot_png))
+        # Один кадр и для отчета, и для анализа
+        frame = Frame.capture(driver, delay=2)
+        screenshot_path = frame.save("main_screen_elements")
         
         # Анализ изображения
-        width, height = image.size
+        width, height = frame.size
         
         print(f"👁️ Анализируем скриншот размером {width}x{height}")
         
-        # Конвертируем в RGB для анализа цветов
-        rgb_image = image.convert('RGB')
+        # Статистика по всему кадру вместо отдельных точек
+        stats = frame.stats()
+        frame.release()
+        frame_checks = evaluate_frame(stats)
         
         # Проверяем основные характеристики изображения
         visual_checks = {
-            'not_blank': False,
-            'has_colors': False,
+            'not_blank': frame_checks['not_blank'],
+            'has_colors': frame_checks['has_colors'],
             'reasonable_size': False,
-            'not_mostly_black': False,
-            'not_mostly_white': False
+            'not_mostly_black': frame_checks['not_mostly_black'],
+            'not_mostly_white': frame_checks['not_mostly_white']
         }
         
         # Проверка 1: Изображение не пустое
-        if width > 0 and height > 0:
-            visual_checks['not_blank'] = True
-            print("   ✅ Изображение не пустое")
+        if visual_checks['not_blank']:
+            print(f"   ✅ Изображение не пустое (энтропия {stats['entropy']:.2f} бит)")
+        else:
+            print(f"   ⚠️ Изображение почти однородное (энтропия {stats['entropy']:.2f} бит)")
         
         # Проверка 2: Разумный размер экрана
         if width >= 480 and height >= 800:  # Минимальные размеры для мобильного экрана
@@ -51,57 +54,25 @@ class TestVisualValidation:
         else:
             print(f"   ⚠️ Размер экрана маленький: {width}x{height}")
         
-        # Проверка 3: Анализ цветов (простая проверка по углам и центру)
-        sample_points = [
-            (width//4, height//4),      # Левый верхний квадрант
-            (3*width//4, height//4),    # Правый верхний квадрант
-            (width//2, height//2),      # Центр
-            (width//4, 3*height//4),    # Левый нижний квадрант
-            (3*width//4, 3*height//4)   # Правый нижний квадрант
-        ]
-        
-        colors_found = []
-        black_pixels = 0
-        white_pixels = 0
-        total_samples = len(sample_points)
-        
-        for x, y in sample_points:
-            try:
-                r, g, b = rgb_image.getpixel((x, y))
-                colors_found.append((r, g, b))
-                
-                # Считаем черные и белые пиксели
-                if r < 30 and g < 30 and b < 30:  # Почти черный
-                    black_pixels += 1
-                elif r > 225 and g > 225 and b > 225:  # Почти белый
-                    white_pixels += 1
-                    
-            except Exception as e:
-                print(f"   ⚠️ Ошибка анализа пикселя ({x}, {y}): {e}")
-        
-        # Проверка разнообразия цветов
-        unique_colors = len(set(colors_found))
-        if unique_colors >= 3:
-            visual_checks['has_colors'] = True
-            print(f"   ✅ Найдено {unique_colors} различных цветов")
+        # Проверка 3: Цветность всего кадра
+        if visual_checks['has_colors']:
+            print(f"   ✅ Кадр цветной (цветность {stats['colourfulness']:.1f})")
         else:
-            print(f"   ⚠️ Мало цветового разнообразия: {unique_colors} цветов")
+            print(f"   ⚠️ Мало цветового разнообразия (цветность {stats['colourfulness']:.1f})")
         
         # Проверка что экран не преимущественно черный или белый
-        if black_pixels < total_samples * 0.8:
-            visual_checks['not_mostly_black'] = True
-            print("   ✅ Экран не преимущественно черный")
+        if visual_checks['not_mostly_black']:
+            print(f"   ✅ Экран не преимущественно черный ({stats['black_ratio']:.1%} черных пикселей)")
         else:
-            print("   ⚠️ Экран преимущественно черный")
+            print(f"   ⚠️ Экран преимущественно черный ({stats['black_ratio']:.1%} черных пикселей)")
         
-        if white_pixels < total_samples * 0.8:
-            visual_checks['not_mostly_white'] = True
-            print("   ✅ Экран не преимущественно белый")
+        if visual_checks['not_mostly_white']:
+            print(f"   ✅ Экран не преимущественно белый ({stats['white_ratio']:.1%} белых пикселей)")
         else:
-            print("   ⚠️ Экран преимущественно белый")
+            print(f"   ⚠️ Экран преимущественно белый ({stats['white_ratio']:.1%} белых пикселей)")
         
         # Выводим информацию о найденных цветах
-        print(f"   📊 Образцы цветов: {colors_found[:3]}...")  # Показываем первые 3
+        print(f"   📊 Доминантные цвета: {stats['dominant_colors'][:3]}...")  # Показываем первые 3
         
         # Подсчет успешных проверок
         passed_checks = sum(visual_checks.values())
@@ -119,7 +90,7 @@ class TestVisualValidation:
         """Проверка что UI элементы не накладываются друг на друга"""
         print("\n🔲 Тест наложения UI элементов")
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         
         # Делаем серию скриншотов для анализа стабильности UI
         screenshots = []
@@ -127,9 +98,9 @@ class TestVisualValidation:
         for i in range(3):
             print(f"   📸 Скриншот {i+1}/3 для анализа стабильности")
             
-            screenshot_path = wait_and_screenshot(driver, f"ui_stability_{i+1}")
-            screenshot_png = driver.get_screenshot_as_png()
-            screenshots.append(screenshot_png)
+            frame = Frame.capture(driver, delay=2)
+            frame.save(f"ui_stability_{i+1}")
+            screenshots.append(frame.png)
             
             # Небольшое взаимодействие между скриншотами
             if i < 2:
@@ -159,8 +130,7 @@ class TestVisualValidation:
                 ui_stable = variation_percent < 25  # Допускаем до 25%
         
         # Проверка разрешения экрана на стабильность
-        current_size = driver.get_window_size()
-        resolution_stable = current_size == size
+        resolution_stable = not get_screen_geometry(driver).resolution_changed()
         
         print(f"   📱 Стабильность разрешения: {'✅' if resolution_stable else '❌'}")
         
@@ -180,8 +150,7 @@ class TestVisualValidation:
                 time.sleep(0.5)
                 
                 # Проверяем что приложение отвечает
-                test_size = driver.get_window_size()
-                if test_size == size:
+                if not get_screen_geometry(driver).resolution_changed():
                     zones_responsive += 1
                     print(f"   ✅ {zone_name}: отзывчива")
                 else:
@@ -203,7 +172,8 @@ class TestVisualValidation:
         """Тест сравнения с эталонными скриншотами"""
         print("\n📸 Тест регрессии скриншотов")
         
-        # Создаем серию эталонных скриншотов
+        # Кадры состояний сравниваются с эталонами из data/baselines
+        regression = VisualRegression()
         reference_screenshots = []
         
         states_to_capture = [
@@ -212,7 +182,7 @@ class TestVisualValidation:
             ("После возврата", lambda: driver.tap([(size['width']//2, size['height']//2)])),
         ]
         
-        size = driver.get_window_size()
+        size = get_screen_geometry(driver).window_size()
         
         for state_name, action in states_to_capture:
             print(f"   📸 Захват состояния: {state_name}")
@@ -222,24 +192,22 @@ class TestVisualValidation:
                     action()
                     time.sleep(2)  # Ждем стабилизации
                 
-                screenshot_path = wait_and_screenshot(driver, f"regression_{state_name.lower().replace(' ', '_')}")
-                screenshot_png = driver.get_screenshot_as_png()
+                with Frame.capture(driver, delay=2) as frame:
+                    screenshot_path = frame.save(f"regression_{state_name.lower().replace(' ', '_')}")
+                    result = regression.compare(state_name, frame.image)
+                    result['size'] = frame.size
+                    result['path'] = screenshot_path
                 
-                # Простой анализ скриншота
-                image = Image.open(io.BytesIO(screenshot_png))
+                reference_screenshots.append(result)
                 
-                screenshot_info = {
-                    'state': state_name,
-                    'size': image.size,
-                    'mode': image.mode,
-                    'data_size': len(screenshot_png),
-                    'path': screenshot_path
-                }
-                
-                reference_screenshots.append(screenshot_info)
-                
-                print(f"      - Размер изображения: {image.size}")
-                print(f"      - Размер данных: {len(screenshot_png)} байт")
+                print(f"      - Размер изображения: {result['size']}")
+                if result['status'] == 'compared':
+                    print(f"      - Изменившихся блоков: {result['changed_tiles']} ({result['changed_ratio']:.1%}), "
+                          f"максимальная разница {result['max_tile_diff']:.1f}")
+                    if 'heatmap' in result:
+                        print(f"      - Карта отличий: {result['heatmap']}")
+                else:
+                    print(f"      - Результат: {result['status']}")
                 
             except Exception as e:
                 print(f"   ❌ Ошибка захвата {state_name}: {e}")
@@ -259,32 +227,23 @@ class TestVisualValidation:
                 print(f"   ⚠️ Разные размеры скриншотов: {unique_sizes}")
                 size_consistent = False
             
-            # Проверяем разумность размеров данных
-            data_sizes = [info['data_size'] for info in reference_screenshots]
-            avg_data_size = sum(data_sizes) / len(data_sizes)
-            size_variation = (max(data_sizes) - min(data_sizes)) / avg_data_size
+            assert size_consistent, "Размеры скриншотов должны быть консистентными"
             
-            print(f"   📊 Размеры данных: {data_sizes}")
-            print(f"   📊 Средний размер: {avg_data_size:.0f} байт")
-            print(f"   📊 Вариация размера: {size_variation:.1%}")
+            # Без эталонов для этого разрешения сравнивать не с чем
+            missing = [info['baseline'] for info in reference_screenshots if info['status'] == 'missing']
+            if missing:
+                pytest.skip(f"Нет эталонов (запустите с UPDATE_BASELINES=1): {missing}")
             
-            data_reasonable = size_variation < 0.5  # Менее 50% вариации
+            # Проверяем отличия от эталонов
+            regressions = [info for info in reference_screenshots if not info['passed']]
             
-            if data_reasonable:
-                print("   ✅ Размеры данных скриншотов разумны")
+            if regressions:
+                for info in regressions:
+                    print(f"   ❌ Регрессия в состоянии '{info['state']}': {info['status']}")
             else:
-                print("   ⚠️ Большая вариация в размерах данных")
-            
-            # Проверяем что скриншоты не пустые
-            all_non_empty = all(info['data_size'] > 10000 for info in reference_screenshots)  # Минимум 10KB
+                print("   ✅ Все состояния совпадают с эталонами")
             
-            if all_non_empty:
-                print("   ✅ Все скриншоты содержат данные")
-            else:
-                print("   ❌ Некоторые скриншоты слишком малы")
-            
-            assert size_consistent, "Размеры скриншотов должны быть консистентными"
-            assert all_non_empty, "Все скриншоты должны содержать данные"
+            assert not regressions, f"Визуальные отличия от эталонов: {[info['state'] for info in regressions]}"
             
         else:
             assert False, "Должно быть захвачено минимум 2 скриншота"
@@ -294,7 +253,8 @@ class TestVisualValidation:
         print("\n📱 Тест различных разрешений экрана")
         
         # Получаем текущее разрешение
-        original_size = driver.get_window_size()
+        geometry = get_screen_geometry(driver)
+        original_size = geometry.window_size()
         print(f"📱 Исходное разрешение: {original_size}")
         
         # Делаем скриншот исходного разрешения
@@ -304,19 +264,19 @@ class TestVisualValidation:
         orientation_tests = []
         
         try:
-            original_orientation = driver.orientation
+            original_orientation = geometry.orientation()
             print(f"📱 Исходная ориентация: {original_orientation}")
             
             # Пробуем сменить ориентацию
             new_orientation = "LANDSCAPE" if original_orientation == "PORTRAIT" else "PORTRAIT"
             
             print(f"🔄 Пробуем сменить ориентацию на: {new_orientation}")
-            driver.orientation = new_orientation
+            geometry.set_orientation(new_orientation)
             time.sleep(3)
             
             # Проверяем новое разрешение
-            new_size = driver.get_window_size()
-            current_orientation = driver.orientation
+            new_size = geometry.window_size()
+            current_orientation = geometry.orientation()
             
             print(f"📱 Новое разрешение: {new_size}")
             print(f"📱 Новая ориентация: {current_orientation}")
@@ -342,8 +302,7 @@ class TestVisualValidation:
             try:
                 driver.tap([(new_size['width']//2, new_size['height']//2)])
                 time.sleep(1)
-                test_size = driver.get_window_size()
-                orientation_test['app_responsive'] = test_size == new_size
+                orientation_test['app_responsive'] = not geometry.resolution_changed()
             except Exception as e:
                 print(f"   ⚠️ Приложение не отвечает в новом разрешении: {e}")
                 orientation_test['app_responsive'] = False
@@ -352,11 +311,11 @@ class TestVisualValidation:
             
             # Возвращаем исходную ориентацию
             print("🔄 Возвращаем исходную ориентацию")
-            driver.orientation = original_orientation
+            geometry.set_orientation(original_orientation)
             time.sleep(2)
             
-            final_size = driver.get_window_size()
-            final_orientation = driver.orientation
+            final_size = geometry.window_size()
+            final_orientation = geometry.orientation()
             
             print(f"📱 Финальное разрешение: {final_size}")
             print(f"📱 Финальная ориентация: {final_orientation}")
@@ -371,7 +330,7 @@ class TestVisualValidation:
             # Альтернативный тест - проверяем текущее разрешение
             orientation_test = {
                 'original_size': original_size,
-                'current_size': driver.get_window_size(),
+                'current_size': geometry.window_size(refresh=True),
                 'orientation_locked': True,
                 'app_responsive': True
             }
@@ -397,7 +356,8 @@ class TestVisualValidation:
         
         # Проверяем что приложение осталось стабильным
         try:
-            final_check_size = driver.get_window_size()
+            geometry.probe()
+            final_check_size = geometry.window_size()
             stability_check = final_check_size['width'] > 0 and final_check_size['height'] > 0
             
             if stability_check:
@@ -417,11 +377,11 @@ class TestVisualValidation:
         # Собираем скриншоты разных состояний для анализа цветов
         color_analysis_states = [
             ("Главный экран", lambda: None),
-            ("После первого тапа", lambda: driver.tap([(size['width']//2, int(size['height']*0.32))])),
-            ("После второго тапа", lambda: driver.tap([(size['width']//2, int(size['height']*0.42))])),
+            ("После первого тапа", lambda: driver.tap([main_menu.play_tap_point()])),
+            ("После второго тапа", lambda: driver.tap([main_menu.my_account_tap_point()])),
         ]
         
-        size = driver.get_window_size()
+        main_menu = MainMenuPage(driver)
         color_samples = []
         
         for state_name, action in color_analysis_states:
@@ -432,49 +392,35 @@ class TestVisualValidation:
                     action()
                     time.sleep(2)
                 
-                screenshot_png = driver.get_screenshot_as_png()
-                image = Image.open(io.BytesIO(screenshot_png))
-                rgb_image = image.convert('RGB')
-                
-                # Собираем образцы цветов из разных частей экрана
-                sample_points = [
-                    (size['width']//4, size['height']//4),      # Верх-лево
-                    (3*size['width']//4, size['height']//4),    # Верх-право
-                    (size['width']//2, size['height']//2),      # Центр
-                    (size['width']//4, 3*size['height']//4),    # Низ-лево
-                    (3*size['width']//4, 3*size['height']//4),  # Низ-право
-                ]
+                frame = Frame.capture(driver)
+                # Тот же кадр сохраняется для отчета
+                frame.save(f"color_analysis_{state_name.lower().replace(' ', '_')}")
                 
-                state_colors = []
-                for x, y in sample_points:
-                    try:
-                        color = rgb_image.getpixel((x, y))
-                        state_colors.append(color)
-                    except:
-                        pass
+                # Статистика по всем пикселям кадра
+                stats = frame.stats()
+                frame.release()
+                frame_checks = evaluate_frame(stats)
                 
-                # ИСПРАВЛЕНО: более мягкие критерии для определения игровых цветов
-                has_colorful_content = self._has_colorful_content(state_colors)
-                has_game_colors = self._has_candy_crush_colors_flexible(state_colors)
+                has_colorful_content = frame_checks['has_colorful_content']
+                has_game_colors = frame_checks['has_game_colors']
                 
                 color_sample = {
                     'state': state_name,
-                    'colors': state_colors,
-                    'dominant_colors': self._get_dominant_colors(state_colors),
+                    'colorful_ratio': stats['colorful_ratio'],
+                    'game_color_ratio': stats['game_color_ratio'],
+                    'dominant_colors': stats['dominant_colors'],
                     'has_game_colors': has_game_colors,
                     'has_colorful_content': has_colorful_content
                 }
                 
                 color_samples.append(color_sample)
                 
-                print(f"      - Образцов цветов: {len(state_colors)}")
+                print(f"      - Проанализировано пикселей: {stats['analyzed_pixels']}")
+                print(f"      - Цветных пикселей: {stats['colorful_ratio']:.1%}, игровых цветов: {stats['game_color_ratio']:.1%}")
                 print(f"      - Доминантные цвета: {color_sample['dominant_colors'][:3]}")  # Первые 3
                 print(f"      - Есть цветной контент: {'✅' if has_colorful_content else '❌'}")
                 print(f"      - Есть игровые цвета: {'✅' if has_game_colors else '❌'}")
                 
-                # Сохраняем скриншот для анализа
-                wait_and_screenshot(driver, f"color_analysis_{state_name.lower().replace(' ', '_')}")
-                
             except Exception as e:
                 print(f"   ❌ Ошибка анализа цветов {state_name}: {e}")
         
@@ -524,100 +470,3 @@ class TestVisualValidation:
             
         else:
             assert False, "Должно быть проанализировано минимум 2 состояния"
-    
-    def _get_dominant_colors(self, colors):
-        """Получить доминантные цвета из списка"""
-        if not colors:
-            return []
-        
-        # Простая группировка похожих цветов
-        color_groups = {}
-        for r, g, b in colors:
-            # Группируем цвета с допуском ±30
-            key = (r//30*30, g//30*30, b//30*30)
-            if key not in color_groups:
-                color_groups[key] = []
-            color_groups[key].append((r, g, b))
-        
-        # Сортируем группы по количеству цветов
-        sorted_groups = sorted(color_groups.items(), key=lambda x: len(x[1]), reverse=True)
-        
-        return [group[0] for group in sorted_groups[:5]]  # Топ 5 доминантных
-    
-    def _has_colorful_content(self, colors):
-        """Проверить наличие цветного контента (не только черно-белого)"""
-        if not colors:
-            return False
-        
-        colorful_pixels = 0
-        
-        for r, g, b in colors:
-            # Проверяем что цвет не серый/черно-белый
-            is_grayscale = abs(r - g) < 30 and abs(g - b) < 30 and abs(r - b) < 30
-            is_very_dark = r < 50 and g < 50 and b < 50
-            is_very_light = r > 200 and g > 200 and b > 200
-            
-            if not is_grayscale and not is_very_dark and not is_very_light:
-                colorful_pixels += 1
-        
-        # Если хотя бы 30% пикселей цветные
-        return colorful_pixels >= len(colors) * 0.3
-    
-    def _has_candy_crush_colors_flexible(self, colors):
-        """Проверить наличие характерных цветов Candy Crush - гибкая версия"""
-        if not colors:
-            return False
-        
-        # Расширенные характерные цвета с более широкими диапазонами
-        color_ranges = [
-            # Розовые/красные тона
-            {'min': (180, 50, 80), 'max': (255, 180, 200)},
-            # Синие тона  
-            {'min': (50, 100, 180), 'max': (150, 200, 255)},
-            # Желтые/золотые тона
-            {'min': (200, 150, 50), 'max': (255, 255, 150)},
-            # Зеленые тона
-            {'min': (80, 180, 80), 'max': (180, 255, 180)},
-            # Фиолетовые тона
-            {'min': (100, 50, 150), 'max': (200, 150, 255)},
-            # Оранжевые тона
-            {'min': (200, 100, 50), 'max': (255, 180, 100)}
-        ]
-        
-        matches = 0
-        
-        for r, g, b in colors:
-            for color_range in color_ranges:
-                min_r, min_g, min_b = color_range['min']
-                max_r, max_g, max_b = color_range['max']
-                
-                if (min_r <= r <= max_r and 
-                    min_g <= g <= max_g and 
-                    min_b <= b <= max_b):
-                    matches += 1
-                    break  # Найден хотя бы один подходящий цвет
-        
-        # Если найдено хотя бы 20% подходящих цветов
-        return matches >= len(colors) * 0.2
-    
-    def _has_candy_crush_colors(self, colors):
-        """Проверить наличие характерных цветов Candy Crush - старая версия"""
-        if not colors:
-            return False
-        
-        # Характерные цвета Candy Crush Saga
-        candy_colors = [
-            (255, 100, 150),  # Розовый (кнопка Play)
-            (100, 150, 255),  # Синий (кнопки)
-            (255, 200, 100),  # Золотой (логотип)
-            (100, 255, 150),  # Зеленый (фон)
-            (150, 100, 255),  # Фиолетовый (конфеты)
-        ]
-        
-        for r, g, b in colors:
-            for cr, cg, cb in candy_colors:
-                # Проверяем с допуском ±50
-                if abs(r - cr) <= 50 and abs(g - cg) <= 50 and abs(b - cb) <= 50:
-                    return True
-        
-        return False
@@ -0,0 +1,118 @@
+"""
+Тесты движка ожиданий (работают без устройства)
+"""
+
+import time
+import pytest
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import InvalidSessionIdException, StaleElementReferenceException
+from utils.waits import WaitEngine, presence, absence
+from config.settings import TIMEOUTS
+
+
+class FakeDriver:
+    """Драйвер, у которого элементы появляются и исчезают по расписанию"""
+
+    def __init__(self, schedule=None):
+        self.schedule = schedule or {}  # {значение локатора: (появляется через, исчезает через)}
+        self.started = time.perf_counter()
+        self.implicit_waits = []
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    def find_elements(self, by, value):
+        appear, disappear = self.schedule.get(value, (None, None))
+        elapsed = time.perf_counter() - self.started
+        if appear is not None and appear <= elapsed and (disappear is None or elapsed < disappear):
+            return [value]
+        return []
+
+
+class TestWaitEngine:
+    """Общий опрос, неявные ожидания, бюджет и метрики"""
+
+    def test_wait_any_returns_first_satisfied(self):
+        """Из нескольких условий возвращается то, что выполнилось, в общем цикле опроса"""
+        driver = FakeDriver({'//late': (0.3, None)})
+        engine = WaitEngine(driver)
+
+        name, value = engine.wait_any([
+            ('missing', presence(AppiumBy.XPATH, '//missing')),
+            ('late', presence(AppiumBy.XPATH, '//late')),
+        ], timeout=2)
+
+        assert (name, value) == ('late', '//late')
+        assert engine.metrics['missing']['timeouts'] == 0
+        assert engine.spent < 1
+
+    def test_implicit_wait_suspended_and_restored(self):
+        """На время опроса неявное ожидание 0, после - значение из настроек"""
+        driver = FakeDriver()
+        engine = WaitEngine(driver)
+
+        assert engine.until('missing', presence(AppiumBy.XPATH, '//missing'), timeout=0.1) is None
+        assert driver.implicit_waits == [0, TIMEOUTS['implicit_wait']]
+
+    def test_absence(self):
+        """Исчезновение элемента"""
+        driver = FakeDriver({'//toast': (0, 0.3)})
+        engine = WaitEngine(driver)
+
+        assert engine.until('toast gone', absence(AppiumBy.XPATH, '//toast'), timeout=2)
+        assert engine.metrics['toast gone']['calls'] == 1
+        assert engine.metrics['toast gone']['timeouts'] == 0
+
+    def test_budget_limits_timeouts(self):
+        """После исчерпания бюджета ожидания не блокируют"""
+        engine = WaitEngine(FakeDriver(), budget=0.3)
+
+        engine.until('first', presence(AppiumBy.XPATH, '//missing'), timeout=5)
+        start_time = time.perf_counter()
+        engine.until('second', presence(AppiumBy.XPATH, '//missing'), timeout=5)
+
+        assert time.perf_counter() - start_time < 0.1
+        assert engine.summary()['conditions']['second']['timeouts'] == 1
+
+    def test_metrics_per_condition_time(self):
+        """Время условия - только его собственные проверки, а не все ожидание группы"""
+        class SlowDriver(FakeDriver):
+            def find_elements(self, by, value):
+                if value == '//slow':
+                    time.sleep(0.05)
+                return super().find_elements(by, value)
+
+        engine = WaitEngine(SlowDriver({'//fast': (0.3, None)}))
+
+        engine.wait_any([
+            ('fast', presence(AppiumBy.XPATH, '//fast')),
+            ('slow', presence(AppiumBy.XPATH, '//slow')),
+        ], timeout=2)
+
+        assert engine.metrics['slow']['time'] > engine.metrics['fast']['time'] * 5
+        assert engine.metrics['fast']['time'] < 0.05
+
+    def test_dead_session_fails_fast(self):
+        """Сессия закрыта - ошибка сразу, без опроса до таймаута"""
+        class DeadDriver(FakeDriver):
+            def find_elements(self, by, value):
+                raise InvalidSessionIdException("session deleted")
+
+        engine = WaitEngine(DeadDriver())
+        start_time = time.perf_counter()
+
+        with pytest.raises(InvalidSessionIdException):
+            engine.until('element', presence(AppiumBy.XPATH, '//element'), timeout=5)
+        assert time.perf_counter() - start_time < 1
+
+    def test_stale_element_is_retried(self):
+        """Устаревший элемент - условие просто не выполнено"""
+        class StaleDriver(FakeDriver):
+            def find_elements(self, by, value):
+                if time.perf_counter() - self.started < 0.2:
+                    raise StaleElementReferenceException("stale")
+                return [value]
+
+        engine = WaitEngine(StaleDriver())
+
+        assert engine.until('element', presence(AppiumBy.XPATH, '//element'), timeout=2) == '//element'
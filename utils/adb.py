@@ -0,0 +1,45 @@
+"""
+Обертка над adb для команд, которых нет в Appium
+"""
+
+import re
+import subprocess
+from config.settings import DEVICE_CONFIG
+
+
+def adb_args(args, udid=None):
+    """Командная строка adb для выбранного устройства"""
+    cmd = ["adb"]
+
+    udid = udid or DEVICE_CONFIG['udid']
+    if udid:
+        cmd.extend(["-s", udid])
+
+    cmd.extend(args)
+    return cmd
+
+def adb_command(args, udid=None, timeout=30, text=True):
+    """Выполнить команду adb для выбранного устройства"""
+    return subprocess.run(adb_args(args, udid), capture_output=True, text=text, timeout=timeout)
+
+def adb_shell(command, udid=None, timeout=30):
+    """Выполнить shell-команду на устройстве и вернуть stdout"""
+    if isinstance(command, str):
+        command = command.split()
+
+    result = adb_command(["shell"] + list(command), udid=udid, timeout=timeout)
+    return result.stdout
+
+def display_size(udid=None):
+    """Физическое разрешение дисплея из wm size: (ширина, высота) или None"""
+    try:
+        output = adb_shell(["wm", "size"], udid=udid, timeout=10)
+    except Exception as e:
+        print(f"⚠️ Не удалось получить разрешение дисплея: {e}")
+        return None
+
+    # "Physical size: 1080x2400" (+ "Override size: ..." при переопределении)
+    match = re.search(r'Physical size:\s*(\d+)x(\d+)', output)
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
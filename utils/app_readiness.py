@@ -0,0 +1,73 @@
+"""
+Ожидание готовности приложения вместо фиксированной паузы после запуска
+"""
+
+import time
+from config.settings import APPIUM_CONFIG, TIMEOUTS, APP_READINESS
+from utils.frames import Frame
+
+
+def is_app_in_foreground(driver):
+    """Активити игры на переднем плане"""
+    try:
+        activity = driver.current_activity or ''
+    except Exception:
+        return False
+
+    expected = APPIUM_CONFIG['app_activity']
+    return activity == expected or activity.endswith(expected.lstrip('.'))
+
+def has_unity_surface(driver):
+    """В дереве элементов появилась поверхность Unity"""
+    try:
+        page_source = driver.page_source
+    except Exception:
+        return False
+
+    return any(marker in page_source for marker in APP_READINESS['surface_markers'])
+
+def reduced_luma(image):
+    """Уменьшенная копия кадра в оттенках серого для сравнения"""
+    return image.convert('L').resize(APP_READINESS['frame_compare_size']).tobytes()
+
+def luma_difference(pixels_a, pixels_b):
+    """Средняя разница двух уменьшенных копий"""
+    return sum(abs(a - b) for a, b in zip(pixels_a, pixels_b)) / len(pixels_a)
+
+def wait_for_app_ready(driver, deadline=None):
+    """Ждать пока приложение станет интерактивным, вернуть время запуска в секундах или None"""
+    deadline = deadline or TIMEOUTS['app_launch_deadline']
+    poll_interval = APP_READINESS['poll_interval']
+    start_time = time.perf_counter()
+
+    foreground = False
+    surface = False
+    previous_frame = None
+    stable_frames = 0
+
+    while time.perf_counter() - start_time < deadline:
+        # Сигналы проверяем от дешевых к дорогим
+        if not foreground:
+            foreground = is_app_in_foreground(driver)
+        elif not surface:
+            surface = has_unity_surface(driver)
+        else:
+            with Frame.capture(driver) as captured:
+                frame = reduced_luma(captured.image)
+            if previous_frame is not None:
+                if luma_difference(previous_frame, frame) <= APP_READINESS['frame_diff_threshold']:
+                    stable_frames += 1
+                else:
+                    stable_frames = 0
+            previous_frame = frame
+
+            if stable_frames >= APP_READINESS['stable_frames']:
+                launch_time = time.perf_counter() - start_time
+                print(f"🚀 Приложение готово за {launch_time:.2f}с")
+                return launch_time
+
+        time.sleep(poll_interval)
+
+    print(f"⚠️ Приложение не стабилизировалось за {deadline}с "
+          f"(активити: {foreground}, Unity: {surface}, стабильных кадров: {stable_frames})")
+    return None
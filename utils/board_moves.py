@@ -0,0 +1,151 @@
+"""
+Генератор ходов "три в ряд": все обмены соседних конфет, дающие совпадение, сдвигами массивов NumPy
+"""
+
+import numpy as np
+from config.settings import MOVE_SELECTION
+
+# Рамка вокруг поля: -1 не совпадает ни с одной конфетой, 0 (пустая клетка) в совпадения не входит
+PAD = 2
+
+
+def _shift(padded, dr, dc, rows, cols):
+    """Вид поля, сдвинутого на (dr, dc): результат[r, c] = поле[r + dr, c + dc]"""
+    return padded[:, PAD + dr:PAD + dr + rows, PAD + dc:PAD + dc + cols]
+
+def _horizontal_runs(boards):
+    """Длины линий после обмена (r, c) <-> (r, c + 1) для всех клеток всех полей сразу
+
+    first - конфета из (r, c), переехавшая в (r, c + 1); second - из (r, c + 1) в (r, c).
+    along - линия вдоль обмена, across - поперек. Линия короче 3 считается нулем.
+    """
+    count, rows, cols = boards.shape
+    padded = np.pad(boards, ((0, 0), (PAD, PAD), (PAD, PAD)), constant_values=-1)
+
+    def shifted(dr, dc):
+        # Сдвиг относительно левой клетки пары, только столбцы 0..cols-2
+        return _shift(padded, dr, dc, rows, cols)[:, :, :cols - 1]
+
+    first = boards[:, :, :-1]
+    second = boards[:, :, 1:]
+    valid = (first != second) & (first > 0) & (second > 0)
+
+    def run(candy, steps):
+        """1 + число совпадающих клеток подряд в каждом из направлений steps"""
+        length = np.ones(candy.shape, dtype=np.int8)
+        for direction in steps:
+            same = np.ones(candy.shape, dtype=bool)
+            for dr, dc in direction:
+                same &= shifted(dr, dc) == candy
+                length += same
+        return np.where(length >= 3, length, 0)
+
+    runs = {
+        'first_along': run(first, [[(0, 2), (0, 3)]]),
+        'first_across': run(first, [[(-1, 1), (-2, 1)], [(1, 1), (2, 1)]]),
+        'second_along': run(second, [[(0, -1), (0, -2)]]),
+        'second_across': run(second, [[(-1, 0), (-2, 0)], [(1, 0), (2, 0)]])
+    }
+    for name in runs:
+        runs[name] = np.where(valid, runs[name], 0)
+    return runs
+
+def swap_features(boards):
+    """Признаки всех обменов: (горизонтальные (N, R, C-1), вертикальные (N, R-1, C))"""
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim == 2:
+        boards = boards[np.newaxis]
+    count, rows, cols = boards.shape
+
+    horizontal = _horizontal_runs(boards)
+    # Вертикальный обмен - горизонтальный на транспонированном поле
+    vertical = {name: values.swapaxes(1, 2) for name, values in _horizontal_runs(boards.swapaxes(1, 2)).items()}
+
+    # Глубина нижней клетки обмена: ходы внизу чаще дают каскады
+    horizontal['depth'] = np.broadcast_to((np.arange(rows) / max(rows - 1, 1))[None, :, None], (count, rows, cols - 1))
+    vertical['depth'] = np.broadcast_to((np.arange(1, rows) / max(rows - 1, 1))[None, :, None], (count, rows - 1, cols))
+    return horizontal, vertical
+
+
+# Эвристики: признаки обменов -> оценка (больше - лучше); ход без совпадения отсекается отдельно
+
+def _cleared(features):
+    first = features['first_along'] + features['first_across'] - ((features['first_along'] > 0) & (features['first_across'] > 0))
+    second = features['second_along'] + features['second_across'] - ((features['second_along'] > 0) & (features['second_across'] > 0))
+    return (first + second).astype(np.float32)
+
+def cleared_heuristic(features):
+    """Больше убранных конфет"""
+    return _cleared(features)
+
+def special_heuristic(features):
+    """Убранные конфеты плюс бонусы за полосатые (4), цветные бомбы (5) и упакованные (угол) конфеты"""
+    longest = np.maximum.reduce([features[name] for name in
+                                 ('first_along', 'first_across', 'second_along', 'second_across')])
+    wrapped = ((features['first_along'] > 0) & (features['first_across'] > 0)) | \
+              ((features['second_along'] > 0) & (features['second_across'] > 0))
+    return _cleared(features) + 10 * (longest >= 4) + 25 * (longest >= 5) + 15 * wrapped
+
+def bottom_heuristic(features):
+    """Как special, но при равенстве - ход ниже по полю"""
+    return special_heuristic(features) + 3 * features['depth']
+
+HEURISTICS = {
+    'cleared': cleared_heuristic,
+    'special': special_heuristic,
+    'bottom': bottom_heuristic
+}
+
+
+def _heuristic(heuristic):
+    heuristic = heuristic or MOVE_SELECTION['heuristic']
+    return HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+
+def _legal(features):
+    return (features['first_along'] > 0) | (features['first_across'] > 0) | \
+           (features['second_along'] > 0) | (features['second_across'] > 0)
+
+def score_moves(boards, heuristic=None):
+    """Оценки обменов (горизонтальные, вертикальные); -inf - обмен без совпадения"""
+    heuristic = _heuristic(heuristic)
+    scores = []
+    for features in swap_features(boards):
+        score = np.asarray(heuristic(features), dtype=np.float32)
+        scores.append(np.where(_legal(features), score, -np.inf))
+    return tuple(scores)
+
+def _move(direction, row, col):
+    if direction == 0:
+        return {"from": [int(row), int(col)], "to": [int(row), int(col) + 1]}
+    return {"from": [int(row), int(col)], "to": [int(row) + 1, int(col)]}
+
+def best_moves(boards, heuristic=None):
+    """Лучший ход для каждого поля пакета: список {"from": [r, c], "to": [r, c]} или None"""
+    horizontal, vertical = score_moves(boards, heuristic)
+    count = horizontal.shape[0]
+    flat = np.concatenate([horizontal.reshape(count, -1), vertical.reshape(count, -1)], axis=1)
+    best = flat.argmax(axis=1)
+    split = horizontal[0].size
+
+    moves = []
+    for board, index in enumerate(best):
+        if not np.isfinite(flat[board, index]):
+            moves.append(None)
+        elif index < split:
+            moves.append(_move(0, *np.unravel_index(index, horizontal.shape[1:])))
+        else:
+            moves.append(_move(1, *np.unravel_index(index - split, vertical.shape[1:])))
+    return moves
+
+def find_moves(grid, heuristic=None):
+    """Все ходы одного поля с совпадением: [(оценка, ход)] от лучшего к худшему"""
+    horizontal, vertical = score_moves(grid, heuristic)
+    moves = []
+    for direction, scores in enumerate((horizontal[0], vertical[0])):
+        for row, col in zip(*np.nonzero(np.isfinite(scores))):
+            moves.append((float(scores[row, col]), _move(direction, row, col)))
+    return sorted(moves, key=lambda item: -item[0])
+
+def best_move(grid, heuristic=None):
+    """Лучший ход поля или None"""
+    return best_moves(grid, heuristic)[0]
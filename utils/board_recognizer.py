@@ -0,0 +1,174 @@
+"""
+Распознавание игрового поля по скриншоту: прямоугольник поля, сетка клеток и матрица цветов конфет
+"""
+
+import numpy as np
+from config.settings import BOARD_RECOGNITION
+
+# Номер класса 0 - пустая или нераспознанная клетка, далее конфеты в порядке candy_colors
+EMPTY = 0
+
+
+def candy_names():
+    """Названия классов по номерам"""
+    return ['empty'] + list(BOARD_RECOGNITION['candy_colors'])
+
+def reduced_rgb(image):
+    """RGB кадра, уменьшенного в целое число раз, и коэффициент уменьшения"""
+    image = image.convert('RGB') if image.mode != 'RGB' else image
+
+    factor = 1
+    while max(image.size) // factor > BOARD_RECOGNITION['analysis_max_side']:
+        factor *= 2
+    if factor > 1:
+        image = image.reduce(factor)
+
+    return np.asarray(image), factor
+
+def candy_mask(pixels):
+    """Насыщенные и не темные пиксели - конфеты"""
+    # Поканально быстрее, чем max/min по последней оси
+    r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    channel_max = np.maximum(np.maximum(r, g), b)
+    saturation = channel_max - np.minimum(np.minimum(r, g), b)
+    return (saturation > BOARD_RECOGNITION['min_saturation']) & (channel_max > BOARD_RECOGNITION['min_brightness'])
+
+def _runs(active):
+    """Отрезки подряд идущих True: массив [(начало, конец)]"""
+    padded = np.concatenate([[False], active, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges.reshape(-1, 2)
+
+def board_extent(profile, cells):
+    """Начало и шаг клеток вдоль одной оси по доле конфет в строках (столбцах)
+
+    Конфеты разделены узкими промежутками, поэтому отрезки с промежутками меньше max_gap
+    объединяются; шаг считается по размеру конфеты и числу клеток.
+    """
+    runs = _runs(profile > BOARD_RECOGNITION['min_density'])
+    if not len(runs):
+        return None
+
+    max_gap = BOARD_RECOGNITION['max_gap'] * len(profile)
+    groups = np.split(runs, np.flatnonzero(runs[1:, 0] - runs[:-1, 1] > max_gap) + 1)
+    group = max(groups, key=lambda runs: runs[-1, 1] - runs[0, 0])
+    start, end = int(group[0, 0]), int(group[-1, 1])
+
+    if len(group) >= 2 and cells > 1:
+        candy = float(np.median(group[:, 1] - group[:, 0]))
+        pitch = (end - start - candy) / (cells - 1)
+        if pitch >= candy:
+            return start - (pitch - candy) / 2, pitch
+
+    return float(start), (end - start) / cells
+
+def detect_board_rect(pixels, rows, cols):
+    """Прямоугольник поля (x, y, ширина, высота) на уменьшенном кадре или None"""
+    mask = candy_mask(pixels)
+
+    vertical = board_extent(mask.mean(axis=1), rows)
+    if vertical is None:
+        return None
+    top, row_pitch = vertical
+
+    band = mask[max(int(top), 0):int(top + row_pitch * rows)]
+    horizontal = board_extent(band.mean(axis=0), cols)
+    if horizontal is None:
+        return None
+    left, col_pitch = horizontal
+
+    return left, top, col_pitch * cols, row_pitch * rows
+
+def classify_cells(pixels, rect, rows, cols):
+    """Матрица классов конфет rows x cols по среднему цвету центра каждой клетки"""
+    x, y, width, height = rect
+    sample = BOARD_RECOGNITION['cell_sample']
+    steps = BOARD_RECOGNITION['sample_points']
+
+    # Сетка точек в центральной части каждой клетки: (rows, cols, steps, steps)
+    offsets = (np.arange(steps) + 0.5) / steps * sample + (1 - sample) / 2
+    ys = y + (np.arange(rows)[:, None] + offsets[None, :]) * height / rows
+    xs = x + (np.arange(cols)[:, None] + offsets[None, :]) * width / cols
+    ys = np.clip(ys.astype(np.intp), 0, pixels.shape[0] - 1)
+    xs = np.clip(xs.astype(np.intp), 0, pixels.shape[1] - 1)
+
+    samples = pixels[ys[:, None, :, None], xs[None, :, None, :]].astype(np.float32)
+    colors = samples.mean(axis=(2, 3))  # (rows, cols, 3)
+
+    palette = np.array(list(BOARD_RECOGNITION['candy_colors'].values()), dtype=np.float32)
+    distances = np.linalg.norm(colors[:, :, None, :] - palette[None, None, :, :], axis=3)
+    grid = distances.argmin(axis=2).astype(np.int8) + 1
+
+    saturation = colors.max(axis=2) - colors.min(axis=2)
+    unknown = (distances.min(axis=2) > BOARD_RECOGNITION['max_color_distance']) | \
+              (saturation < BOARD_RECOGNITION['min_saturation'])
+    grid[unknown] = EMPTY
+    return grid
+
+def recognize_board(image, rows=None, cols=None, rect=None):
+    """Матрица конфет и геометрия поля по кадру: (grid, BoardGeometry) или (None, None)
+
+    rect - известный прямоугольник поля (x, y, ширина, высота) в пикселях кадра,
+    иначе поле ищется по плотности насыщенных пикселей.
+    """
+    rows = rows or BOARD_RECOGNITION['rows']
+    cols = cols or BOARD_RECOGNITION['cols']
+    pixels, factor = reduced_rgb(image)
+
+    if rect is not None:
+        reduced_rect = tuple(value / factor for value in rect)
+    else:
+        reduced_rect = detect_board_rect(pixels, rows, cols)
+        if reduced_rect is None:
+            return None, None
+
+    grid = classify_cells(pixels, reduced_rect, rows, cols)
+    geometry = BoardGeometry(tuple(value * factor for value in reduced_rect), rows, cols)
+    return grid, geometry
+
+
+class BoardGeometry:
+    """Преобразование клетка <-> пиксели для найденного поля"""
+
+    def __init__(self, rect, rows, cols):
+        self.rect = rect  # (x, y, ширина, высота)
+        self.rows = rows
+        self.cols = cols
+
+    @property
+    def cell_size(self):
+        x, y, width, height = self.rect
+        return width / self.cols, height / self.rows
+
+    def contains(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def cell_center(self, row, col):
+        """Центр клетки (x, y)"""
+        x, y, width, height = self.rect
+        cell_width, cell_height = self.cell_size
+        return int(x + (col + 0.5) * cell_width), int(y + (row + 0.5) * cell_height)
+
+    def cell_centers(self):
+        """Центры всех клеток: массивы xs и ys формы (rows, cols)"""
+        x, y, width, height = self.rect
+        cell_width, cell_height = self.cell_size
+        cols, rows = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        return x + (cols + 0.5) * cell_width, y + (rows + 0.5) * cell_height
+
+    def cell_at(self, px, py):
+        """Клетка (row, col) под точкой или None"""
+        x, y, width, height = self.rect
+        cell_width, cell_height = self.cell_size
+        row, col = int((py - y) // cell_height), int((px - x) // cell_width)
+        return (row, col) if self.contains(row, col) else None
+
+    def scaled(self, image_size, window_size):
+        """Геометрия в координатах окна Appium вместо пикселей скриншота"""
+        sx = window_size['width'] / image_size[0]
+        sy = window_size['height'] / image_size[1]
+        x, y, width, height = self.rect
+        return BoardGeometry((x * sx, y * sy, width * sx, height * sy), self.rows, self.cols)
+
+    def __repr__(self):
+        return f"<BoardGeometry {self.rows}x{self.cols} rect={tuple(round(v) for v in self.rect)}>"
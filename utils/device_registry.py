@@ -0,0 +1,54 @@
+"""
+Реестр подключенных устройств для параллельного запуска
+"""
+
+import socket
+import subprocess
+from config.settings import PARALLEL_CONFIG
+
+
+def discover_devices():
+    """Список udid устройств в состоянии 'device' из adb devices"""
+    try:
+        result = subprocess.run(["adb", "devices"], capture_output=True, text=True, timeout=15)
+    except Exception as e:
+        print(f"❌ Не удалось получить список устройств: {e}")
+        return []
+
+    return parse_adb_devices(result.stdout)
+
+def parse_adb_devices(output):
+    """Разобрать вывод adb devices"""
+    devices = []
+
+    for line in output.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == 'device':
+            devices.append(parts[0])
+
+    return devices
+
+def build_workers(devices):
+    """Назначить каждому устройству свой порт Appium, systemPort UiAutomator2 и порт потока кадров"""
+    workers = []
+
+    for i, udid in enumerate(devices):
+        appium_port = PARALLEL_CONFIG['base_appium_port'] + i
+        workers.append({
+            'udid': udid,
+            'appium_port': appium_port,
+            'system_port': PARALLEL_CONFIG['base_system_port'] + i,
+            'mjpeg_port': PARALLEL_CONFIG['base_mjpeg_port'] + i,
+            'server_url': f"http://localhost:{appium_port}"
+        })
+
+    return workers
+
+def is_port_open(port, host='localhost'):
+    """Проверить что на порту кто-то слушает"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(3)
+    try:
+        return sock.connect_ex((host, port)) == 0
+    finally:
+        sock.close()
@@ -0,0 +1,128 @@
+"""
+Пул драйверов: одна сессия UiAutomator2 на воркер pytest
+"""
+
+import time
+from appium import webdriver
+from appium.options.android import UiAutomator2Options
+from config.settings import APPIUM_CONFIG, TIMEOUTS, DRIVER_POOL, DEVICE_CONFIG
+from utils.adb import adb_shell
+from utils.app_readiness import wait_for_app_ready
+
+
+def create_driver():
+    """Создать новую сессию Appium по настройкам из конфига"""
+
+    # Настройки для Android из конфига
+    options = UiAutomator2Options()
+    options.platform_name = APPIUM_CONFIG['platform_name']
+    options.app_package = APPIUM_CONFIG['app_package']
+    options.app_activity = APPIUM_CONFIG['app_activity']
+    options.automation_name = APPIUM_CONFIG['automation_name']
+    options.new_command_timeout = APPIUM_CONFIG['new_command_timeout']
+    options.no_reset = APPIUM_CONFIG['no_reset']
+    options.full_reset = APPIUM_CONFIG['full_reset']
+
+    # Конкретное устройство при параллельном запуске
+    if DEVICE_CONFIG['udid']:
+        options.udid = DEVICE_CONFIG['udid']
+    if DEVICE_CONFIG['system_port']:
+        options.system_port = DEVICE_CONFIG['system_port']
+
+    # Подключение к Appium серверу
+    driver = webdriver.Remote(
+        command_executor=APPIUM_CONFIG['server_url'],
+        options=options
+    )
+
+    # Настройка implicit wait
+    driver.implicitly_wait(TIMEOUTS['implicit_wait'])
+
+    return driver
+
+class DriverPool:
+    """Переиспользует одну сессию и сбрасывает приложение между тестами"""
+
+    def __init__(self, create=create_driver):
+        self._create = create
+        self._driver = None
+        self.sessions_created = 0
+        self.sessions_recycled = 0
+        self.setup_times = []
+        self.last_launch_time = None
+
+    def acquire(self):
+        """Выдать рабочий драйвер и время его подготовки в секундах"""
+        start_time = time.perf_counter()
+
+        if self._driver is None:
+            self._new_session()
+        elif not self.is_healthy():
+            print("♻️ Сессия не отвечает - пересоздаем")
+            self.recycle()
+        else:
+            try:
+                self.reset_app()
+            except Exception as e:
+                print(f"♻️ Не удалось сбросить приложение ({e}) - пересоздаем сессию")
+                self.recycle()
+
+        # Ждем пока приложение станет интерактивным (None - не дождались)
+        self.last_launch_time = wait_for_app_ready(self._driver)
+
+        setup_time = time.perf_counter() - start_time
+        self.setup_times.append(setup_time)
+        return self._driver, setup_time
+
+    def release(self):
+        """Вернуть драйвер в пул после теста"""
+        if not DRIVER_POOL['reuse_session']:
+            self._quit()
+
+    def is_healthy(self):
+        """Проверить что сессия жива и отвечает на команды"""
+        try:
+            self._driver.current_package
+            return True
+        except Exception:
+            return False
+
+    def reset_app(self):
+        """Перезапустить приложение внутри текущей сессии"""
+        app_package = APPIUM_CONFIG['app_package']
+
+        if DRIVER_POOL['reset_strategy'] == 'force_stop':
+            adb_shell(["am", "force-stop", app_package])
+            adb_shell(["am", "start", "-n", f"{app_package}/{APPIUM_CONFIG['app_activity']}"])
+        else:
+            self._driver.terminate_app(app_package, timeout=DRIVER_POOL['terminate_timeout'])
+            self._driver.activate_app(app_package)
+
+    def recycle(self):
+        """Закрыть сломанную сессию и открыть новую"""
+        self._quit()
+        self.sessions_recycled += 1
+        self._new_session()
+
+    def close(self):
+        """Закрыть пул и вывести статистику подготовки"""
+        self._quit()
+
+        if self.setup_times:
+            total = sum(self.setup_times)
+            print(f"\n⏱️ Пул драйверов: сессий создано {self.sessions_created}, "
+                  f"пересоздано {self.sessions_recycled}")
+            print(f"⏱️ Подготовка тестов: всего {total:.1f}с, "
+                  f"в среднем {total / len(self.setup_times):.2f}с")
+
+    def _new_session(self):
+        self._driver = self._create()
+        self.sessions_created += 1
+
+    def _quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                print(f"⚠️ Ошибка закрытия сессии: {e}")
+            self._driver = None
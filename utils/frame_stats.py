@@ -0,0 +1,83 @@
+"""
+Статистика кадра по всем пикселям (NumPy): доли черного и белого, гистограмма, энтропия, цветность
+"""
+
+import numpy as np
+from config.settings import FRAME_STATS
+
+
+def frame_array(image):
+    """RGB пиксели кадра, уменьшенного вдвое нужное число раз (уровень пирамиды)"""
+    image = image.convert('RGB') if image.mode != 'RGB' else image
+
+    factor = 1
+    while max(image.size) // factor > FRAME_STATS['analysis_max_side']:
+        factor *= 2
+    if factor > 1:
+        image = image.reduce(factor)
+
+    return np.asarray(image)
+
+def compute_frame_stats(image):
+    """Статистика всего кадра"""
+    pixels = frame_array(image)
+    rgb = pixels.reshape(-1, 3).astype(np.int16)
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    channel_max = rgb.max(axis=1)
+    channel_min = rgb.min(axis=1)
+
+    luma = (0.299 * r + 0.587 * g + 0.114 * b).astype(np.uint8)
+    counts = np.bincount(luma, minlength=256)
+    probabilities = counts[counts > 0] / luma.size
+    entropy = float(-(probabilities * np.log2(probabilities)).sum())
+
+    # Цветность по Хаслеру-Зюсструнку
+    rg = r - g
+    yb = 0.5 * (r + g) - b
+    colourfulness = float(np.hypot(rg.std(), yb.std()) + 0.3 * np.hypot(rg.mean(), yb.mean()))
+
+    # Цветной пиксель: не серый, не очень темный и не очень светлый
+    grayscale = (channel_max - channel_min) < 30
+    very_dark = channel_max < 50
+    very_light = channel_min > 200
+    colorful = ~(grayscale | very_dark | very_light)
+
+    in_game_colors = np.zeros(len(rgb), dtype=bool)
+    for low, high in FRAME_STATS['game_color_ranges']:
+        in_game_colors |= np.all((rgb >= low) & (rgb <= high), axis=1)
+
+    histogram, _ = np.histogram(luma, bins=FRAME_STATS['histogram_bins'], range=(0, 256))
+
+    return {
+        'size': image.size,
+        'analyzed_pixels': int(luma.size),
+        'mean_luma': float(luma.mean()),
+        'black_ratio': float((channel_max < FRAME_STATS['black_level']).mean()),
+        'white_ratio': float((channel_min > FRAME_STATS['white_level']).mean()),
+        'luma_histogram': histogram.tolist(),
+        'entropy': entropy,
+        'colourfulness': colourfulness,
+        'colorful_ratio': float(colorful.mean()),
+        'game_color_ratio': float(in_game_colors.mean()),
+        'dominant_colors': dominant_colors(rgb)
+    }
+
+def dominant_colors(rgb, top=5):
+    """Самые частые группы цветов (с шагом dominant_color_step)"""
+    step = FRAME_STATS['dominant_color_step']
+    groups = (rgb // step) * step
+    keys = (groups[:, 0].astype(np.int32) << 16) | (groups[:, 1].astype(np.int32) << 8) | groups[:, 2]
+    values, counts = np.unique(keys, return_counts=True)
+    order = np.argsort(counts)[::-1][:top]
+    return [(int(key >> 16), int((key >> 8) & 0xFF), int(key & 0xFF)) for key in values[order]]
+
+def evaluate_frame(stats):
+    """Визуальные проверки кадра по порогам из настроек"""
+    return {
+        'not_blank': stats['entropy'] >= FRAME_STATS['min_entropy'],
+        'has_colors': stats['colourfulness'] >= FRAME_STATS['min_colourfulness'],
+        'not_mostly_black': stats['black_ratio'] < FRAME_STATS['max_black_ratio'],
+        'not_mostly_white': stats['white_ratio'] < FRAME_STATS['max_white_ratio'],
+        'has_colorful_content': stats['colorful_ratio'] >= FRAME_STATS['min_colorful_ratio'],
+        'has_game_colors': stats['game_color_ratio'] >= FRAME_STATS['min_game_color_ratio']
+    }
@@ -0,0 +1,197 @@
+"""
+Непрерывный поток кадров MJPEG сервера UiAutomator2 в кольцевой буфер с метками времени
+"""
+
+import threading
+import time
+from collections import deque
+import requests
+from config.settings import FRAME_STREAM
+from utils.adb import adb_command
+from utils.app_readiness import reduced_luma, luma_difference
+from utils.frames import Frame
+
+JPEG_START = b'\xff\xd8'
+JPEG_END = b'\xff\xd9'
+
+
+class JpegSplitter:
+    """Выделяет JPEG кадры из потока multipart/x-mixed-replace по маркерам начала и конца"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        """Добавить кусок потока, вернуть список готовых кадров"""
+        self._buffer.extend(chunk)
+        frames = []
+
+        while True:
+            start = self._buffer.find(JPEG_START)
+            if start < 0:
+                # Заголовки multipart без начала кадра не нужны
+                del self._buffer[:max(len(self._buffer) - 1, 0)]
+                break
+
+            end = self._buffer.find(JPEG_END, start + 2)
+            if end < 0:
+                del self._buffer[:start]
+                break
+
+            frames.append(bytes(self._buffer[start:end + 2]))
+            del self._buffer[:end + 2]
+
+        return frames
+
+
+class FrameStream:
+    """Фоновое чтение MJPEG потока; метки mark() позволяют взять кадры между двумя действиями
+
+    Сессия драйвера не меняется: поток берется с порта MJPEG сервера UiAutomator2 на устройстве
+    через adb forward, частота и масштаб задаются через настройки сессии.
+    """
+
+    def __init__(self, driver, host_port=None, buffer_size=None, udid=None):
+        self.driver = driver
+        self.udid = udid
+        self.host_port = host_port or FRAME_STREAM['host_port']
+        self.url = f"http://127.0.0.1:{self.host_port}"
+        self._frames = deque(maxlen=buffer_size or FRAME_STREAM['buffer_size'])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._response = None
+        self.marks = {}
+        self.received = 0
+        self.error = None
+
+    def start(self):
+        """Включить поток и дождаться первого кадра"""
+        self.driver.update_settings({
+            'mjpegServerFramerate': FRAME_STREAM['framerate'],
+            'mjpegScalingFactor': FRAME_STREAM['scaling_factor']
+        })
+        result = adb_command(["forward", f"tcp:{self.host_port}", f"tcp:{FRAME_STREAM['device_port']}"], udid=self.udid)
+        if result.returncode != 0:
+            raise RuntimeError(f"adb forward tcp:{self.host_port} не выполнен: {result.stderr.strip()}")
+
+        try:
+            self._response = requests.get(self.url, stream=True, timeout=FRAME_STREAM['connect_timeout'])
+            self._response.raise_for_status()
+        except Exception:
+            self._remove_forward()
+            raise
+
+        self._thread = threading.Thread(target=self._run, name="frame-stream", daemon=True)
+        self._thread.start()
+
+        deadline = time.perf_counter() + FRAME_STREAM['connect_timeout']
+        while not self.received and time.perf_counter() < deadline:
+            time.sleep(0.05)
+
+        if not self.received:
+            self.stop()
+            raise RuntimeError(f"Поток кадров {self.url} не прислал ни одного кадра")
+
+        print(f"🎞️ Поток кадров запущен: {self.url}")
+        return self
+
+    def _run(self):
+        splitter = JpegSplitter()
+        try:
+            for chunk in self._response.iter_content(chunk_size=65536):
+                if self._stop.is_set():
+                    break
+                for jpeg in splitter.feed(chunk):
+                    self._append(time.perf_counter(), jpeg)
+        except Exception as e:
+            if not self._stop.is_set():
+                self.error = e
+                print(f"⚠️ Поток кадров прерван: {e}")
+
+    def _append(self, timestamp, jpeg):
+        with self._lock:
+            self._frames.append((timestamp, jpeg))
+            self.received += 1
+
+    def stop(self):
+        """Остановить чтение и убрать adb forward"""
+        self._stop.set()
+        if self._response is not None:
+            self._response.close()
+        if self._thread is not None:
+            self._thread.join(timeout=FRAME_STREAM['connect_timeout'])
+        self._remove_forward()
+
+    def _remove_forward(self):
+        adb_command(["forward", "--remove", f"tcp:{self.host_port}"], udid=self.udid)
+
+    def mark(self, label):
+        """Запомнить момент действия"""
+        self.marks[label] = time.perf_counter()
+        return self.marks[label]
+
+    def _time(self, point):
+        return self.marks[point] if isinstance(point, str) else point
+
+    def frames_between(self, start, end=None):
+        """Кадры между двумя метками (или моментами perf_counter); end=None - до последнего кадра"""
+        start_time = self._time(start)
+        end_time = self._time(end) if end is not None else float('inf')
+
+        with self._lock:
+            frames = [(timestamp, jpeg) for timestamp, jpeg in self._frames if start_time <= timestamp <= end_time]
+
+        # Frame хранит закодированный кадр как есть: PIL открывает и JPEG
+        return [Frame(png=jpeg, captured_at=timestamp) for timestamp, jpeg in frames]
+
+    def wait_for_frames(self, start, count=1, timeout=2.0):
+        """Дождаться count кадров после метки, вернуть их"""
+        deadline = time.perf_counter() + timeout
+        while True:
+            frames = self.frames_between(start)
+            if len(frames) >= count or time.perf_counter() >= deadline:
+                return frames
+            time.sleep(0.02)
+
+    def first_change_after(self, label, threshold=None, timeout=2.0):
+        """Задержка (с) от метки до первого кадра, отличающегося от последнего кадра до метки"""
+        threshold = threshold if threshold is not None else FRAME_STREAM['change_threshold']
+        mark_time = self._time(label)
+
+        with self._lock:
+            before = [jpeg for timestamp, jpeg in self._frames if timestamp < mark_time]
+        if not before:
+            return None
+
+        with Frame(png=before[-1]) as reference:
+            reference_luma = reduced_luma(reference.image)
+
+        deadline = mark_time + timeout
+        checked = 0
+        while True:
+            frames = self.frames_between(mark_time)
+            for frame in frames[checked:]:
+                with frame:
+                    if luma_difference(reference_luma, reduced_luma(frame.image)) > threshold:
+                        return frame.captured_at - mark_time
+            checked = len(frames)
+
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(0.02)
+
+    def fps(self):
+        """Фактическая частота кадров по буферу"""
+        with self._lock:
+            if len(self._frames) < 2:
+                return 0.0
+            duration = self._frames[-1][0] - self._frames[0][0]
+            return (len(self._frames) - 1) / duration if duration > 0 else 0.0
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
@@ -0,0 +1,148 @@
+"""
+Реальная частота кадров и рывки по dumpsys SurfaceFlinger --latency для слоя игры
+"""
+
+import threading
+import numpy as np
+from config.settings import APPIUM_CONFIG, FRAME_TIMING
+from utils.adb import adb_shell
+
+# Кадр, еще не показанный на экране (fence не сработал)
+PENDING = 2 ** 63 - 1
+
+
+def parse_latency(output):
+    """Вывод --latency -> (период обновления нс, массив (N, 3) desired/actual/ready нс)
+
+    Пустые строки буфера (нули) и еще не показанные кадры отбрасываются.
+    """
+    lines = [line.split() for line in output.strip().splitlines() if line.strip()]
+    if not lines or len(lines[0]) != 1:
+        return None, np.zeros((0, 3), dtype=np.int64)
+
+    period = int(lines[0][0])
+    rows = [[int(value) for value in line] for line in lines[1:] if len(line) == 3]
+    frames = np.array(rows, dtype=np.int64).reshape(-1, 3)
+
+    shown = (frames[:, 1] > 0) & (frames[:, 1] != PENDING) & (frames[:, 0] != PENDING)
+    return period, frames[shown]
+
+def find_game_layer(layers_output, package=None):
+    """Слой SurfaceView игры из dumpsys SurfaceFlinger --list (Unity рисует в SurfaceView)"""
+    package = package or APPIUM_CONFIG['app_package']
+    layers = [line.strip() for line in layers_output.splitlines() if package in line]
+
+    # Сначала SurfaceView (в новых Android - слой BLAST), фоновые слои не подходят
+    candidates = [layer for layer in layers if 'SurfaceView' in layer and 'Background' not in layer]
+    candidates.sort(key=lambda layer: ('BLAST' not in layer, len(layer)))
+    if candidates:
+        return candidates[0]
+    return layers[0] if layers else None
+
+def frame_timing_stats(present_times, period):
+    """Распределение интервалов между показанными кадрами: FPS, перцентили, рывки"""
+    present_times = np.unique(np.asarray(present_times, dtype=np.int64))
+    period_ms = period / 1e6
+
+    if len(present_times) < 2:
+        return {'frames': int(len(present_times)), 'fps': 0.0, 'refresh_period_ms': round(period_ms, 3)}
+
+    intervals = np.diff(present_times) / 1e6
+    duration = (present_times[-1] - present_times[0]) / 1e9
+    vsyncs = np.maximum(np.rint(intervals / period_ms), 1).astype(np.int64)
+    janky = intervals > period_ms * FRAME_TIMING['jank_factor']
+
+    histogram = {str(count): int((vsyncs == count).sum()) for count in range(1, 4)}
+    histogram['4+'] = int((vsyncs >= 4).sum())
+
+    return {
+        'frames': int(len(present_times)),
+        'duration_s': round(float(duration), 3),
+        'fps': round(float((len(present_times) - 1) / duration), 2),
+        'refresh_period_ms': round(period_ms, 3),
+        'p50_ms': round(float(np.percentile(intervals, 50)), 2),
+        'p95_ms': round(float(np.percentile(intervals, 95)), 2),
+        'p99_ms': round(float(np.percentile(intervals, 99)), 2),
+        'max_ms': round(float(intervals.max()), 2),
+        'janky_frames': int(janky.sum()),
+        'jank_ratio': round(float(janky.mean()), 4),
+        'dropped_vsyncs': int((vsyncs - 1).sum()),
+        'vsync_histogram': histogram
+    }
+
+
+class FrameTimingCollector:
+    """Кадры слоя игры между началом и концом взаимодействия
+
+    Буфер SurfaceFlinger хранит ~127 кадров (2 с при 60 Гц, 1 с при 120 Гц), поэтому
+    он читается в отдельном потоке и во время самого действия, и во время ожидания;
+    интервал чтения не больше половины времени, которое покрывает буфер.
+    Кадры разных чтений склеиваются по времени показа.
+    """
+
+    def __init__(self, package=None, udid=None):
+        self.package = package or APPIUM_CONFIG['app_package']
+        self.udid = udid
+        self.layer = None
+        self.period = None
+
+    def _dumpsys(self, *args):
+        return adb_shell(["dumpsys", "SurfaceFlinger"] + list(args), udid=self.udid, timeout=10)
+
+    def find_layer(self):
+        """Найти слой игры (один раз)"""
+        if self.layer is None:
+            self.layer = find_game_layer(self._dumpsys("--list"), self.package)
+            if self.layer is None:
+                raise RuntimeError(f"Слой {self.package} не найден в SurfaceFlinger")
+            print(f"🎞️ Слой игры: {self.layer}")
+        return self.layer
+
+    def read(self):
+        """Текущее содержимое буфера задержек слоя: массив (N, 3)"""
+        # Имя слоя с пробелами и скобками - в кавычках для shell устройства
+        period, frames = parse_latency(self._dumpsys("--latency", f"'{self.find_layer()}'"))
+        if period:
+            self.period = period
+        return frames
+
+    def poll_interval(self):
+        """Интервал чтения буфера для текущей частоты обновления"""
+        period = self.period or FRAME_TIMING['default_period_ns']
+        buffer_time = FRAME_TIMING['buffer_frames'] * period / 1e9
+        return min(FRAME_TIMING['poll_interval'], buffer_time / 2)
+
+    def _poll(self, last_before, present_times, stop):
+        """Читать буфер до сигнала stop; после сигнала - последнее чтение"""
+        while True:
+            stopping = stop.is_set()
+            try:
+                frames = self.read()
+                present_times.update(int(value) for value in frames[frames[:, 1] > last_before, 1])
+            except Exception as e:
+                print(f"⚠️ Не удалось прочитать кадры SurfaceFlinger: {e}")
+            if stopping:
+                break
+            stop.wait(self.poll_interval())
+
+    def measure(self, action, settle=None):
+        """Выполнить действие и собрать кадры до конца ожидания: статистика кадров"""
+        settle = FRAME_TIMING['settle_time'] if settle is None else settle
+
+        before = self.read()
+        last_before = int(before[:, 1].max()) if len(before) else 0
+        present_times = set()
+
+        # Буфер читается и пока выполняется блокирующее действие (долгий свайп, ожидание анимации)
+        stop = threading.Event()
+        poller = threading.Thread(target=self._poll, args=(last_before, present_times, stop),
+                                  name="frame-timing", daemon=True)
+        poller.start()
+        try:
+            action()
+            stop.wait(settle)
+        finally:
+            stop.set()
+            poller.join()
+
+        return frame_timing_stats(sorted(present_times), self.period or FRAME_TIMING['default_period_ns'])
@@ -0,0 +1,117 @@
+"""
+Захват кадра через adb exec-out screencap: сырые RGBA байты сразу в заранее выделенный буфер NumPy
+"""
+
+import struct
+import subprocess
+import numpy as np
+from config.settings import CAPTURE
+from utils.adb import adb_args
+
+# Форматы пикселей screencap (android PixelFormat), 4 байта на пиксель
+RGBA_8888 = 1
+RGBX_8888 = 2
+BGRA_8888 = 5
+SUPPORTED_FORMATS = (RGBA_8888, RGBX_8888, BGRA_8888)
+
+# Заголовок: ширина, высота, формат (+ цветовое пространство начиная с Android 12)
+HEADER_SIZES = (12, 16)
+
+_framebuffers = {}
+
+
+def parse_header(data, total_size):
+    """(ширина, высота, формат, размер заголовка) по началу вывода screencap и его полной длине"""
+    width, height, pixel_format = struct.unpack_from('<III', data)
+    if pixel_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Неподдерживаемый формат screencap: {pixel_format}")
+
+    header_size = total_size - width * height * 4
+    if header_size not in HEADER_SIZES:
+        raise ValueError(f"Неожиданный размер вывода screencap: {total_size} байт для {width}x{height}")
+
+    return width, height, pixel_format, header_size
+
+def get_framebuffer(udid=None):
+    """Захват сырых кадров для устройства (один буфер на устройство)"""
+    framebuffer = _framebuffers.get(udid)
+    if framebuffer is None:
+        framebuffer = RawFramebuffer(udid)
+        _framebuffers[udid] = framebuffer
+    return framebuffer
+
+
+class RawFramebuffer:
+    """Кадры screencap в одном переиспользуемом буфере; размер определяется по первому кадру"""
+
+    def __init__(self, udid=None):
+        self.udid = udid
+        self.width = None
+        self.height = None
+        self.pixel_format = None
+        self.header_size = None
+        self.captures = 0
+        self._buffer = None
+
+    def _open_stream(self):
+        """Поток stdout процесса screencap"""
+        process = subprocess.Popen(
+            adb_args(["exec-out", "screencap"], self.udid),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        return process, process.stdout
+
+    def _close_stream(self, process):
+        if process is not None:
+            process.stdout.close()
+            process.wait(timeout=CAPTURE['raw_timeout'])
+
+    def _allocate(self, data):
+        """Разобрать заголовок и выделить буфер под кадры такого размера"""
+        self.width, self.height, self.pixel_format, self.header_size = parse_header(data, len(data))
+        self._buffer = np.empty(len(data), dtype=np.uint8)
+        self._buffer[:] = np.frombuffer(data, dtype=np.uint8)
+        print(f"🖼️ screencap: {self.width}x{self.height}, формат {self.pixel_format}, заголовок {self.header_size} байт")
+
+    def _read(self):
+        """Прочитать следующий кадр прямо в буфер (после первого кадра без промежуточных копий)"""
+        process, stream = self._open_stream()
+        try:
+            if self._buffer is None:
+                self._allocate(stream.read())
+                return
+
+            view = memoryview(self._buffer)
+            total = 0
+            while total < len(view):
+                read = stream.readinto(view[total:])
+                if not read:
+                    break
+                total += read
+            rest = stream.read()
+        finally:
+            self._close_stream(process)
+
+        # Размер кадра изменился (смена разрешения) - выделяем буфер заново
+        if total != len(view) or rest:
+            self._allocate(bytes(view[:total]) + rest)
+            return
+
+        # Поворот экрана меняет ширину и высоту местами при том же объеме
+        width, height, pixel_format = struct.unpack_from('<III', self._buffer)
+        if (width, height, pixel_format) != (self.width, self.height, self.pixel_format):
+            self.width, self.height, self.pixel_format, self.header_size = parse_header(self._buffer, total)
+
+    def grab(self):
+        """Кадр (высота, ширина, 4) RGBA как представление буфера - действителен до следующего захвата"""
+        self._read()
+        self.captures += 1
+
+        pixels = self._buffer[self.header_size:].reshape(self.height, self.width, 4)
+        if self.pixel_format == BGRA_8888:
+            return pixels[..., [2, 1, 0, 3]]
+        return pixels
+
+    def capture(self):
+        """Кадр RGBA в отдельном массиве (можно хранить между захватами)"""
+        return np.array(self.grab(), copy=True)
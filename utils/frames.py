@@ -0,0 +1,117 @@
+"""
+Кадр экрана: один захват для сохранения в отчет и для анализа изображения
+"""
+
+import io
+import time
+from PIL import Image
+from config.settings import CAPTURE, DEVICE_CONFIG
+from utils.framebuffer import get_framebuffer
+from utils.frame_stats import compute_frame_stats
+from utils.screenshot_writer import get_screenshot_writer
+
+
+class Frame:
+    """Один кадр экрана (PNG от Appium или RGBA пиксели от screencap)
+
+    Недостающее представление получается при первом обращении, память освобождает release()
+    """
+
+    def __init__(self, png=None, pixels=None, captured_at=None):
+        self._png = png
+        self.pixels = pixels
+        self.captured_at = captured_at if captured_at is not None else time.perf_counter()
+        self.path = None
+        self._image = None
+        self._rgb = None
+        self._stats = None
+
+    @classmethod
+    def capture(cls, driver, delay=0, backend=None):
+        """Подождать delay секунд и получить один кадр выбранным способом захвата"""
+        if delay:
+            time.sleep(delay)
+
+        backend = backend or CAPTURE['backend']
+        if backend == 'adb_raw':
+            try:
+                return cls(pixels=get_framebuffer(DEVICE_CONFIG['udid']).capture())
+            except Exception as e:
+                print(f"⚠️ screencap недоступен, скриншот через Appium: {e}")
+
+        return cls(png=driver.get_screenshot_as_png())
+
+    @property
+    def png(self):
+        """PNG кадра (для сырых пикселей кодируется один раз)"""
+        if self._png is None and self.pixels is not None:
+            buffer = io.BytesIO()
+            self.image.save(buffer, format='PNG')
+            self._png = buffer.getvalue()
+        return self._png
+
+    @property
+    def image(self):
+        """Декодированное изображение (декодируется один раз)"""
+        if self._image is None:
+            if self.pixels is not None:
+                self._image = Image.fromarray(self.pixels, 'RGBA')
+            elif self._png is not None:
+                self._image = Image.open(io.BytesIO(self._png))
+                self._image.load()
+            else:
+                raise ValueError("Кадр уже освобожден")
+        return self._image
+
+    @property
+    def rgb(self):
+        """Изображение в RGB для анализа цветов"""
+        if self._rgb is None:
+            image = self.image
+            self._rgb = image if image.mode == 'RGB' else image.convert('RGB')
+        return self._rgb
+
+    @property
+    def size(self):
+        return self.image.size
+
+    @property
+    def data_size(self):
+        """Размер PNG в байтах"""
+        png = self.png
+        return len(png) if png is not None else 0
+
+    def stats(self):
+        """Статистика всего кадра (считается один раз)"""
+        if self._stats is None:
+            self._stats = compute_frame_stats(self.image)
+        return self._stats
+
+    def save(self, name="screenshot"):
+        """Сохранить PNG через фоновую запись без повторного захвата, вернуть имя файла"""
+        writer = get_screenshot_writer()
+        if self._png is None and self.pixels is not None:
+            # PNG кодируется в пуле записи, а не в потоке теста
+            self.path = writer.save_pixels(self.pixels, name)
+        else:
+            self.path = writer.save_png(self.png, name)
+        print(f"📸 Скриншот: {self.path}")
+        return self.path
+
+    def release(self):
+        """Освободить пиксели и PNG"""
+        if self._rgb is not None and self._rgb is not self._image:
+            self._rgb.close()
+        if self._image is not None:
+            self._image.close()
+        self._image = None
+        self._rgb = None
+        self._png = None
+        self.pixels = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
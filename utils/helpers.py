@@ -7,89 +7,141 @@ import json
 import os
 from datetime import datetime
 from appium.webdriver.common.appiumby import AppiumBy
+from utils.screen_geometry import get_screen_geometry
+from utils.page_snapshot import PageSnapshot
+from utils.screen_change import ScreenChangeDetector
+from utils.screenshot_writer import get_screenshot_writer, unique_filename
+from utils.waits import get_wait_engine, presence, clickable, absence
 
 def wait_and_screenshot(driver, name="screenshot", delay=2):
     """Подождать и сделать скриншот"""
     time.sleep(delay)
-    timestamp = int(time.time())
-    filename = f"reports/{name}_{timestamp}.png"
-    driver.save_screenshot(filename)
+    filename = get_screenshot_writer().capture(driver, name)
     print(f"📸 Скриншот: {filename}")
     return filename
 
 def find_element_with_text(driver, text, timeout=10):
     """Найти элемент содержащий текст"""
     xpath = f"//*[contains(@text, '{text}') or contains(@content-desc, '{text}')]"
-    try:
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        wait = WebDriverWait(driver, timeout)
-        element = wait.until(EC.presence_of_element_located((AppiumBy.XPATH, xpath)))
-        print(f"✅ Найден элемент с текстом: {text}")
-        return element
-    except:
+    element = get_wait_engine(driver).until(f"text={text}", presence(AppiumBy.XPATH, xpath), timeout)
+    
+    if element is None:
         print(f"❌ Элемент с текстом '{text}' не найден")
         return None
+    
+    print(f"✅ Найден элемент с текстом: {text}")
+    return element
 
 def click_if_present(driver, xpath, timeout=5):
     """Кликнуть на элемент если он есть"""
+    element = get_wait_engine(driver).until(f"clickable {xpath}", clickable(AppiumBy.XPATH, xpath), timeout)
+    if element is None:
+        print(f"❌ Не удалось кликнуть: {xpath}")
+        return False
+
     try:
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        wait = WebDriverWait(driver, timeout)
-        element = wait.until(EC.element_to_be_clickable((AppiumBy.XPATH, xpath)))
         element.click()
         print(f"✅ Кликнули на элемент: {xpath}")
         return True
-    except:
+    except Exception:
         print(f"❌ Не удалось кликнуть: {xpath}")
         return False
 
-def get_all_clickable_info(driver):
-    """Получить информацию о всех кликабельных элементах"""
-    elements = driver.find_elements(AppiumBy.XPATH, "//*[@clickable='true']")
+CLICKABLE_XPATH = "//*[@clickable='true']"
+
+# Атрибуты элемента: ключ в отчете -> имя атрибута UiAutomator2
+CLICKABLE_ATTRIBUTES = {
+    'text': 'text',
+    'content_desc': 'content-desc',
+    'resource_id': 'resource-id',
+    'class': 'class',
+    'bounds': 'bounds'
+}
+
+def _element_info(index, element):
+    """Атрибуты одного элемента (для живого элемента - запрос на каждый атрибут)"""
+    info = {'index': index}
+    for key, attribute in CLICKABLE_ATTRIBUTES.items():
+        info[key] = element.get_attribute(attribute) or ''
+    return info
+
+def get_all_clickable_info(driver, bulk=True):
+    """Получить информацию о всех кликабельных элементах
+    
+    bulk=True - все атрибуты из одного снимка page_source; поштучные запросы
+    только для узлов, у которых в снимке нет нужных атрибутов. Если живых элементов
+    не столько же, сколько узлов в снимке (экран успел измениться), весь вызов
+    выполняется поштучно: сопоставлять узлы по номеру нельзя.
+    """
+    if not bulk:
+        return _get_clickable_info_per_element(driver)
+    
+    try:
+        nodes = PageSnapshot.capture(driver).find_all(CLICKABLE_XPATH)
+    except Exception as e:
+        print(f"⚠️ Снимок page_source недоступен, поштучный режим: {e}")
+        return _get_clickable_info_per_element(driver)
+    
+    info = []
+    live_elements = None
+    
+    for i, node in enumerate(nodes):
+        if all(attribute in node.attributes for attribute in CLICKABLE_ATTRIBUTES.values()):
+            info.append(_element_info(i, node))
+            continue
+        
+        # Неполный узел: дочитываем атрибуты у живого элемента
+        try:
+            if live_elements is None:
+                live_elements = driver.find_elements(AppiumBy.XPATH, CLICKABLE_XPATH)
+                if len(live_elements) != len(nodes):
+                    print(f"⚠️ Экран изменился после снимка ({len(nodes)} узлов, "
+                          f"{len(live_elements)} элементов), поштучный режим")
+                    return _get_clickable_info_per_element(driver, live_elements)
+            info.append(_element_info(i, live_elements[i]))
+        except Exception as e:
+            print(f"Ошибка получения информации об элементе {i}: {e}")
+    
+    return info
+
+def _get_clickable_info_per_element(driver, elements=None):
+    """Поштучный режим: запрос get_attribute на каждый атрибут каждого элемента"""
+    if elements is None:
+        elements = driver.find_elements(AppiumBy.XPATH, CLICKABLE_XPATH)
     info = []
     
     for i, element in enumerate(elements):
         try:
-            element_info = {
-                'index': i,
-                'text': element.get_attribute('text') or '',
-                'content_desc': element.get_attribute('content-desc') or '',
-                'resource_id': element.get_attribute('resource-id') or '',
-                'class': element.get_attribute('class') or '',
-                'bounds': element.get_attribute('bounds') or ''
-            }
-            info.append(element_info)
+            info.append(_element_info(i, element))
         except Exception as e:
             print(f"Ошибка получения информации об элементе {i}: {e}")
     
     return info
 
-def wait_for_screen_change(driver, initial_source, timeout=10):
-    """Ждать изменения экрана"""
-    start_time = time.time()
+def capture_screen_state(driver, ignore_regions=None):
+    """Снять исходное состояние экрана до действия (для wait_for_screen_change)"""
+    return ScreenChangeDetector(driver, ignore_regions).capture_baseline()
+
+def wait_for_screen_change(driver, initial_state, timeout=10):
+    """Ждать изменения экрана относительно состояния, снятого до действия
+
+    initial_state - результат capture_screen_state() или page_source, полученный до действия.
+    """
+    if isinstance(initial_state, ScreenChangeDetector):
+        detector = initial_state
+    else:
+        detector = ScreenChangeDetector(driver).use_source_baseline(initial_state)
     
-    while time.time() - start_time < timeout:
-        current_source = driver.page_source
-        if current_source != initial_source:
-            print("✅ Экран изменился")
-            return True
-        time.sleep(1)
+    if detector.wait_for_change(timeout) is not None:
+        return True
     
     print("❌ Экран не изменился за отведенное время")
     return False
 
 def save_page_source(driver, name="page_source"):
     """Сохранить исходный код страницы"""
-    timestamp = int(time.time())
-    filename = f"reports/{name}_{timestamp}.xml"
-    
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
+        filename = get_screenshot_writer().save_text(driver.page_source, name, "xml")
         print(f"📄 Исходный код сохранен: {filename}")
         return filename
     except Exception as e:
@@ -98,7 +150,7 @@ def save_page_source(driver, name="page_source"):
 
 def swipe_screen(driver, direction="down"):
     """Свайп по экрану в указанном направлении"""
-    size = driver.get_window_size()
+    size = get_screen_geometry(driver).window_size()
     
     if direction == "down":
         start_x = size['width'] // 2
@@ -134,7 +186,7 @@ def swipe_screen(driver, direction="down"):
 
 def tap_center(driver):
     """Тап по центру экрана"""
-    size = driver.get_window_size()
+    size = get_screen_geometry(driver).window_size()
     center_x = size['width'] // 2
     center_y = size['height'] // 2
     
@@ -148,15 +200,9 @@ def tap_center(driver):
 
 def wait_for_element_disappear(driver, xpath, timeout=10):
     """Ждать исчезновения элемента"""
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        try:
-            driver.find_element(AppiumBy.XPATH, xpath)
-            time.sleep(1)  # Элемент еще есть, ждем
-        except:
-            print(f"✅ Элемент исчез: {xpath}")
-            return True
+    if get_wait_engine(driver).until(f"absence {xpath}", absence(AppiumBy.XPATH, xpath), timeout):
+        print(f"✅ Элемент исчез: {xpath}")
+        return True
     
     print(f"❌ Элемент не исчез за {timeout}с: {xpath}")
     return False
@@ -164,7 +210,7 @@ def wait_for_element_disappear(driver, xpath, timeout=10):
 def create_test_report(test_name, results):
     """Создать отчет о тесте"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"reports/test_report_{test_name}_{timestamp}.json"
+    filename = unique_filename(f"test_report_{test_name}", "json")
     
     report = {
         'test_name': test_name,
@@ -0,0 +1,192 @@
+"""
+Статистика локаторов между прогонами: порядок перебора по успешности прошлых запусков
+"""
+
+import json
+import os
+import re
+from config.settings import APPIUM_CONFIG, LOCATOR_STATS
+from utils.adb import adb_shell
+
+# Общий экземпляр на процесс pytest
+_stats = None
+
+
+def get_app_version():
+    """versionName установленного приложения или 'unknown'"""
+    try:
+        output = adb_shell(["dumpsys", "package", APPIUM_CONFIG['app_package']], timeout=15)
+        match = re.search(r'versionName=(\S+)', output)
+        if match:
+            return match.group(1)
+    except Exception as e:
+        print(f"⚠️ Не удалось определить версию приложения: {e}")
+    return 'unknown'
+
+def get_locator_stats():
+    """Статистика локаторов текущей версии приложения (загружается один раз)"""
+    global _stats
+    if _stats is None:
+        _stats = LocatorStats(LOCATOR_STATS['stats_file'], get_app_version(), LOCATOR_STATS['run_file'])
+    return _stats
+
+def save_locator_stats():
+    """Сохранить статистику, если она использовалась в прогоне, и вернуть ее"""
+    if _stats is not None and _stats.dirty:
+        _stats.save()
+    return _stats
+
+def load_stats_file(path):
+    """Содержимое файла статистики или {}"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Не удалось прочитать статистику локаторов {path}: {e}")
+        return {}
+
+def write_stats_file(path, data):
+    """Записать статистику в файл"""
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def add_counts(target, counts):
+    """Прибавить попадания, промахи и время промахов из counts к target"""
+    for version, screens in counts.items():
+        for screen, lists in screens.items():
+            for list_name, locators in lists.items():
+                for locator_key, entry in locators.items():
+                    total = target.setdefault(version, {}).setdefault(screen, {}).setdefault(list_name, {}).setdefault(
+                        locator_key, {'hits': 0, 'misses': 0, 'miss_time': 0.0}
+                    )
+                    total['hits'] += entry['hits']
+                    total['misses'] += entry['misses']
+                    total['miss_time'] = round(total['miss_time'] + entry['miss_time'], 3)
+    return target
+
+def merge_locator_stats(run_files, path=None):
+    """Слить замеры воркеров в общую статистику; файлы воркеров удаляются"""
+    path = path or LOCATOR_STATS['stats_file']
+    data = load_stats_file(path)
+    merged = False
+
+    for run_file in run_files:
+        if os.path.exists(run_file):
+            add_counts(data, load_stats_file(run_file))
+            os.remove(run_file)
+            merged = True
+
+    if merged:
+        write_stats_file(path, data)
+    return data
+
+
+class LocatorStats:
+    """Попадания и промахи локаторов по версии приложения, экрану и списку локаторов
+
+    С run_path история из path только читается, а замеры этого прогона пишутся в run_path:
+    параллельные воркеры не перезаписывают общий файл друг друга.
+    """
+
+    def __init__(self, path, app_version, run_path=None):
+        self.path = path
+        self.run_path = run_path
+        self.app_version = app_version
+        self.dirty = False
+        self._data = load_stats_file(path)
+        self._run = {}
+
+    @staticmethod
+    def locator_key(locator):
+        by, value = locator
+        return f"{by}={value}"
+
+    def _entry(self, data, screen, list_name, locator):
+        lists = data.setdefault(self.app_version, {}).setdefault(screen, {})
+        return lists.setdefault(list_name, {}).setdefault(
+            self.locator_key(locator), {'hits': 0, 'misses': 0, 'miss_time': 0.0}
+        )
+
+    def _peek(self, screen, list_name, locator):
+        lists = self._data.get(self.app_version, {}).get(screen, {})
+        return lists.get(list_name, {}).get(self.locator_key(locator))
+
+    def record(self, screen, list_name, locator, hit, elapsed):
+        """Записать результат одной попытки поиска"""
+        for data in (self._data, self._run):
+            entry = self._entry(data, screen, list_name, locator)
+            if hit:
+                entry['hits'] += 1
+            else:
+                entry['misses'] += 1
+                entry['miss_time'] = round(entry['miss_time'] + elapsed, 3)
+        self.dirty = True
+
+    def rank(self, screen, list_name, locators):
+        """Локаторы [(исходный номер, локатор)] в порядке перебора
+
+        Сначала те, что чаще срабатывали, затем непроверенные в исходном порядке,
+        затем дешевые промахи. Локаторы, ни разу не сработавшие за prune_after_misses
+        попыток, отбрасываются, если в списке есть работающий локатор.
+        """
+        ranked = []
+        any_hits = False
+
+        for i, locator in enumerate(locators):
+            entry = self._peek(screen, list_name, locator) or {'hits': 0, 'misses': 0, 'miss_time': 0.0}
+            attempts = entry['hits'] + entry['misses']
+            any_hits = any_hits or entry['hits'] > 0
+            hit_rate = entry['hits'] / attempts if attempts else None
+            ranked.append((i, locator, entry, hit_rate))
+
+        if any_hits:
+            ranked = [
+                item for item in ranked
+                if item[2]['hits'] > 0 or item[2]['misses'] < LOCATOR_STATS['prune_after_misses']
+            ]
+
+        def sort_key(item):
+            i, locator, entry, hit_rate = item
+            if hit_rate is None:
+                return (1, 0, i)
+            if entry['hits']:
+                return (0, -hit_rate, i)
+            return (2, entry['miss_time'] / entry['misses'], i)
+
+        return [(i, locator) for i, locator, entry, hit_rate in sorted(ranked, key=sort_key)]
+
+    def never_matched(self):
+        """Локаторы текущей версии, которые ни разу не сработали"""
+        report = []
+
+        for screen, lists in self._data.get(self.app_version, {}).items():
+            for list_name, locators in lists.items():
+                for locator_key, entry in locators.items():
+                    if entry['hits'] == 0 and entry['misses'] > 0:
+                        report.append((screen, list_name, locator_key, entry['misses'], entry['miss_time']))
+
+        return sorted(report, key=lambda item: -item[4])
+
+    def save(self):
+        """Записать статистику на диск (с run_path - только замеры этого прогона)"""
+        if self.run_path:
+            write_stats_file(self.run_path, self._run)
+        else:
+            write_stats_file(self.path, self._data)
+        self.dirty = False
+
+    def print_report(self):
+        """Вывести локаторы, которые только тратят время на таймауты"""
+        never_matched = self.never_matched()
+        if not never_matched:
+            return
+
+        print(f"\n🔍 Локаторы без единого срабатывания (версия {self.app_version}):")
+        for screen, list_name, locator_key, misses, miss_time in never_matched:
+            print(f"   {screen}.{list_name}: {locator_key} - промахов {misses}, потеряно {miss_time:.1f}с")
@@ -0,0 +1,184 @@
+"""
+Фоновый сбор памяти процесса игры из dumpsys meminfo: PSS, Java/Native heap, графика и GL
+"""
+
+import json
+import re
+import threading
+import time
+import numpy as np
+from config.settings import APPIUM_CONFIG, MEMORY_SAMPLING
+from utils.adb import adb_shell
+from utils.screenshot_writer import get_screenshot_writer
+
+# Строки раздела App Summary (значение PSS в КБ)
+SUMMARY_FIELDS = {
+    'java_heap': 'Java Heap',
+    'native_heap': 'Native Heap',
+    'code': 'Code',
+    'stack': 'Stack',
+    'graphics': 'Graphics',
+    'private_other': 'Private Other',
+    'system': 'System'
+}
+
+# Строки основной таблицы (первый столбец - Pss Total в КБ)
+TABLE_FIELDS = {
+    'gl_mtrack': 'GL mtrack',
+    'egl_mtrack': 'EGL mtrack',
+    'gfx_dev': 'Gfx dev'
+}
+
+METRICS = ['pss_total'] + list(SUMMARY_FIELDS) + list(TABLE_FIELDS)
+
+
+def parse_meminfo(output):
+    """Вывод dumpsys meminfo <пакет> -> {метрика: КБ} или None, если процесса нет"""
+    if 'MEMINFO in pid' not in output:
+        return None
+
+    sample = {}
+    total = re.search(r'TOTAL PSS:\s+(\d+)', output) or re.search(r'^\s*TOTAL:?\s+(\d+)', output, re.MULTILINE)
+    if total:
+        sample['pss_total'] = int(total.group(1))
+
+    for name, label in SUMMARY_FIELDS.items():
+        match = re.search(rf'^\s*{re.escape(label)}:\s+(\d+)', output, re.MULTILINE)
+        if match:
+            sample[name] = int(match.group(1))
+
+    for name, label in TABLE_FIELDS.items():
+        match = re.search(rf'^\s*{re.escape(label)}\s+(\d+)', output, re.MULTILINE)
+        if match:
+            sample[name] = int(match.group(1))
+
+    pid = re.search(r'MEMINFO in pid (\d+)', output)
+    sample['pid'] = int(pid.group(1))
+    return sample
+
+def memory_summary(samples):
+    """По каждой метрике: начало, конец, минимум, максимум, рост (%) и наклон (КБ/мин)
+
+    Все метрики METRICS есть в сводке всегда; None - у метрики нет ни одного значения.
+    """
+    summary = {'samples': len(samples), 'duration_s': 0.0, 'restarts': 0}
+    summary.update({metric: None for metric in METRICS})
+    if not samples:
+        return summary
+
+    times = np.array([sample['timestamp'] for sample in samples])
+    for metric in METRICS:
+        values = np.array([sample[metric] for sample in samples if metric in sample], dtype=np.float64)
+        if not len(values):
+            continue
+        metric_times = np.array([sample['timestamp'] for sample in samples if metric in sample])
+
+        slope = 0.0
+        if len(values) >= 2 and metric_times[-1] > metric_times[0]:
+            slope = float(np.polyfit(metric_times, values, 1)[0]) * 60
+
+        summary[metric] = {
+            'initial': int(values[0]),
+            'final': int(values[-1]),
+            'min': int(values.min()),
+            'max': int(values.max()),
+            'growth_percent': round(float((values[-1] - values[0]) / values[0] * 100), 2) if values[0] else 0.0,
+            'slope_kb_per_min': round(slope, 1)
+        }
+
+    summary['duration_s'] = round(float(times[-1] - times[0]), 2)
+    summary['restarts'] = len({sample['pid'] for sample in samples}) - 1
+    return summary
+
+
+class MemorySampler:
+    """Поток, снимающий dumpsys meminfo игры каждые interval секунд"""
+
+    def __init__(self, package=None, udid=None, interval=None):
+        self.package = package or APPIUM_CONFIG['app_package']
+        self.udid = udid
+        self.interval = interval or MEMORY_SAMPLING['interval']
+        self._samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.started_at = None
+        self.errors = 0
+
+    def _dumpsys(self):
+        return adb_shell(["dumpsys", "meminfo", self.package], udid=self.udid, timeout=15)
+
+    def sample(self):
+        """Один снимок памяти с меткой времени (секунды от старта сборщика) или None"""
+        try:
+            sample = parse_meminfo(self._dumpsys())
+        except Exception as e:
+            print(f"⚠️ dumpsys meminfo не выполнен: {e}")
+            sample = None
+
+        if sample is None:
+            self.errors += 1
+            return None
+
+        sample['timestamp'] = round(time.perf_counter() - self.started_at, 3)
+        sample['time'] = time.time()
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def _run(self):
+        while not self._stop.is_set():
+            start_time = time.perf_counter()
+            self.sample()
+            # Ровный шаг: время самого dumpsys (0.2-0.5 с) не сдвигает расписание
+            self._stop.wait(max(self.interval - (time.perf_counter() - start_time), 0))
+
+    def start(self):
+        """Запустить сбор в отдельном потоке"""
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        print(f"💾 Сбор памяти {self.package} каждые {self.interval}с")
+        return self
+
+    def stop(self):
+        """Остановить сбор и снять последний образец"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 15)
+            self._thread = None
+            self.sample()
+
+    @property
+    def samples(self):
+        """Копия собранных образцов"""
+        with self._lock:
+            return list(self._samples)
+
+    def wait_for_samples(self, count, timeout=None):
+        """Дождаться count образцов"""
+        deadline = time.perf_counter() + (timeout if timeout is not None else self.interval * count + 15)
+        while len(self.samples) < count and time.perf_counter() < deadline:
+            time.sleep(0.1)
+        return self.samples
+
+    def summary(self):
+        return memory_summary(self.samples)
+
+    def save(self, name="memory"):
+        """Временной ряд и сводка в reports/<имя>_*.json, вернуть имя файла"""
+        report = {
+            'package': self.package,
+            'interval': self.interval,
+            'summary': self.summary(),
+            'samples': self.samples
+        }
+        return get_screenshot_writer().save_text(json.dumps(report, indent=2, ensure_ascii=False), name, "json")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
@@ -0,0 +1,95 @@
+"""
+Снимок page_source: все XPath-локаторы страницы проверяются локально за один запрос
+"""
+
+import re
+from appium.webdriver.common.appiumby import AppiumBy
+from lxml import etree
+
+BOUNDS_RE = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+# Скомпилированные XPath выражения (локаторы page objects не меняются)
+_compiled_xpaths = {}
+
+
+def parse_bounds(bounds):
+    """'[x1,y1][x2,y2]' -> (x1, y1, x2, y2) или None"""
+    match = BOUNDS_RE.match(bounds or '')
+    if not match:
+        return None
+    return tuple(int(value) for value in match.groups())
+
+def _compile(xpath):
+    compiled = _compiled_xpaths.get(xpath)
+    if compiled is None:
+        compiled = etree.XPath(xpath)
+        _compiled_xpaths[xpath] = compiled
+    return compiled
+
+
+class SnapshotElement:
+    """Элемент снимка: атрибуты и границы без обращений к устройству"""
+
+    def __init__(self, node):
+        self.tag = node.tag
+        self.attributes = dict(node.attrib)
+        self.bounds = parse_bounds(self.attributes.get('bounds'))
+
+    def get_attribute(self, name):
+        """Атрибут как у WebElement.get_attribute"""
+        return self.attributes.get(name)
+
+    @property
+    def text(self):
+        return self.attributes.get('text', '')
+
+    @property
+    def center(self):
+        """Центр элемента (x, y) для тапа"""
+        if not self.bounds:
+            return None
+        x1, y1, x2, y2 = self.bounds
+        return (x1 + x2) // 2, (y1 + y2) // 2
+
+    def __repr__(self):
+        return f"<SnapshotElement {self.tag} bounds={self.bounds}>"
+
+
+class PageSnapshot:
+    """Разобранный page_source, по которому локаторы ищутся без сетевых запросов"""
+
+    def __init__(self, page_source):
+        self.page_source = page_source
+        parser = etree.XMLParser(huge_tree=True, recover=True)
+        self.root = etree.fromstring(page_source.encode('utf-8'), parser)
+
+    @classmethod
+    def capture(cls, driver):
+        """Один запрос page_source к устройству"""
+        return cls(driver.page_source)
+
+    def find_all(self, xpath):
+        """Все элементы по XPath"""
+        if self.root is None:
+            return []
+        return [SnapshotElement(node) for node in _compile(xpath)(self.root) if isinstance(node, etree._Element)]
+
+    def find_first(self, locators):
+        """Первый сработавший локатор из списка: (номер, элементы) или (None, [])"""
+        for i, (by, value) in enumerate(locators):
+            if by != AppiumBy.XPATH:
+                continue
+            elements = self.find_all(value)
+            if elements:
+                return i, elements
+        return None, []
+
+    def evaluate_locators(self, page):
+        """Проверить все списки *_LOCATORS page object: {имя списка: (номер, элементы)}"""
+        results = {}
+
+        for name in dir(type(page)):
+            if name.endswith('_LOCATORS'):
+                results[name] = self.find_first(getattr(page, name))
+
+        return results
@@ -0,0 +1,249 @@
+"""
+Запись и воспроизведение HTTP-трафика Appium для прогонов без устройства
+
+Запись (прокси между тестами и настоящим Appium):
+    python -m utils.replay_server record --upstream http://localhost:4723 --port 4724 --cassette data/recordings/session.json
+
+Воспроизведение (подставной сервер вместо Appium):
+    python -m utils.replay_server replay --cassette data/recordings/session.json --port 4724 --latency recorded
+
+Тесты направляются на сервер через APPIUM_SERVER_URL=http://localhost:4724
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+
+SESSION_PATH_RE = re.compile(r'/session/[^/]+')
+
+LATENCY_MODELS = ['none', 'fixed', 'recorded']
+
+
+def normalize_path(path):
+    """Убрать id сессии из пути, чтобы запись подходила к любой сессии"""
+    return SESSION_PATH_RE.sub('/session/{session}', path.split('?')[0].rstrip('/'))
+
+def normalize_body(body):
+    """Канонический вид тела запроса для сравнения"""
+    if not body:
+        return ''
+    try:
+        return json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        return body
+
+def w3c_error(error, message):
+    """Тело ответа с ошибкой в формате W3C WebDriver"""
+    return json.dumps({'value': {'error': error, 'message': message, 'stacktrace': ''}}, ensure_ascii=False)
+
+def load_cassette(path):
+    """Загрузить записанную сессию"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cassette(path, interactions):
+    """Сохранить записанную сессию"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'interactions': interactions}, f, ensure_ascii=False)
+
+
+class Cassette:
+    """Записанные ответы, выдаваемые в порядке записи для каждого запроса"""
+
+    def __init__(self, interactions):
+        self._exact = defaultdict(list)
+        self._by_path = defaultdict(list)
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+
+        for interaction in interactions:
+            path = normalize_path(interaction['path'])
+            self._exact[(interaction['method'], path, normalize_body(interaction.get('body')))].append(interaction)
+            self._by_path[(interaction['method'], path)].append(interaction)
+
+    def next_response(self, method, path, body):
+        """Следующий ответ на запрос; после конца записи повторяется последний"""
+        path = normalize_path(path)
+        key = (method, path, normalize_body(body))
+        candidates = self._exact.get(key)
+
+        # Команды с другим телом (например, другие capabilities) ищем по пути
+        if not candidates:
+            key = (method, path)
+            candidates = self._by_path.get(key)
+        if not candidates:
+            return None
+
+        with self._lock:
+            position = self._positions[key]
+            self._positions[key] = position + 1
+
+        return candidates[min(position, len(candidates) - 1)]
+
+
+def _make_handler(respond):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _handle(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8') if length else ''
+
+            status, payload = respond(self.command, self.path, body)
+
+            data = payload.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_DELETE = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class _BackgroundServer:
+    """HTTP-сервер в фоновом потоке; respond(method, path, body) -> (статус, тело ответа)"""
+
+    def __init__(self, respond, port=0, host='localhost'):
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(respond))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class ReplayServer(_BackgroundServer):
+    """Подставной Appium: отвечает записанными ответами с заданной моделью задержки"""
+
+    def __init__(self, cassette_path, port=0, latency='none', fixed_latency_ms=50, latency_scale=1.0):
+        if latency not in LATENCY_MODELS:
+            raise ValueError(f"Неизвестная модель задержки: {latency}, доступны: {LATENCY_MODELS}")
+
+        super().__init__(self.respond, port)
+        self.cassette = Cassette(load_cassette(cassette_path)['interactions'])
+        self.latency = latency
+        self.fixed_latency_ms = fixed_latency_ms
+        self.latency_scale = latency_scale
+        self.unmatched = []
+
+    def respond(self, method, path, body):
+        interaction = self.cassette.next_response(method, path, body)
+
+        if interaction is None:
+            self.unmatched.append((method, path))
+            return 404, w3c_error('unknown command', f"Нет записи для {method} {path}")
+
+        if self.latency == 'fixed':
+            time.sleep(self.fixed_latency_ms / 1000 * self.latency_scale)
+        elif self.latency == 'recorded':
+            time.sleep(interaction.get('duration', 0) * self.latency_scale)
+
+        return interaction['status'], interaction['response']
+
+
+class RecordingProxy(_BackgroundServer):
+    """Прокси к настоящему Appium, записывающий каждую команду и ответ"""
+
+    def __init__(self, upstream, cassette_path, port=0):
+        super().__init__(self.respond, port)
+        self.upstream = upstream.rstrip('/')
+        self.cassette_path = cassette_path
+        self.interactions = []
+        self._lock = threading.Lock()
+
+    def respond(self, method, path, body):
+        start_time = time.perf_counter()
+        try:
+            response = requests.request(
+                method, self.upstream + path, data=body.encode('utf-8') if body else None,
+                headers={'Content-Type': 'application/json; charset=utf-8'}
+            )
+        except requests.RequestException as e:
+            # Appium недоступен: клиент получает ошибку W3C, а не оборванное соединение; в запись не попадает
+            print(f"❌ Appium {self.upstream} не ответил на {method} {path}: {e}")
+            return 500, w3c_error('unknown error', f"Appium {self.upstream} недоступен: {e}")
+        duration = time.perf_counter() - start_time
+
+        with self._lock:
+            self.interactions.append({
+                'method': method,
+                'path': path,
+                'body': body,
+                'status': response.status_code,
+                'response': response.text,
+                'duration': round(duration, 4)
+            })
+
+        return response.status_code, response.text
+
+    def save(self):
+        """Записать накопленные команды на диск"""
+        with self._lock:
+            save_cassette(self.cassette_path, self.interactions)
+        print(f"💾 Записано команд: {len(self.interactions)} -> {self.cassette_path}")
+
+    def stop(self):
+        super().stop()
+        self.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Запись и воспроизведение сессий Appium")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", required=True, help="Файл записи")
+    parser.add_argument("--port", type=int, default=4724, help="Порт подставного сервера")
+    parser.add_argument("--upstream", default="http://localhost:4723", help="Настоящий Appium (для записи)")
+    parser.add_argument("--latency", choices=LATENCY_MODELS, default="none", help="Модель задержки (для воспроизведения)")
+    parser.add_argument("--fixed-latency-ms", type=float, default=50)
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        server = RecordingProxy(args.upstream, args.cassette, port=args.port)
+        print(f"🔴 Запись {args.upstream} через {server.url}")
+    else:
+        server = ReplayServer(args.cassette, port=args.port, latency=args.latency,
+                              fixed_latency_ms=args.fixed_latency_ms, latency_scale=args.latency_scale)
+        print(f"▶️ Воспроизведение {args.cassette} на {server.url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Остановка сервера")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Определение смены экрана по разнице уменьшенных скриншотов и хешу page_source с адаптивным опросом
+"""
+
+import hashlib
+import io
+import time
+from PIL import Image, ImageDraw
+from config.settings import SCREEN_CHANGE
+from utils.app_readiness import reduced_luma, luma_difference
+from utils.frames import Frame
+
+
+def screen_pixels(image, ignore_regions=None):
+    """Уменьшенная копия в оттенках серого; маскированные области закрашены"""
+    image = image.convert('L')
+
+    if ignore_regions:
+        width, height = image.size
+        draw = ImageDraw.Draw(image)
+        for x1, y1, x2, y2 in ignore_regions:
+            draw.rectangle([x1 * width, y1 * height, x2 * width, y2 * height], fill=0)
+
+    return reduced_luma(image)
+
+def screenshot_pixels(png, ignore_regions=None):
+    """Уменьшенная копия скриншота PNG"""
+    return screen_pixels(Image.open(io.BytesIO(png)), ignore_regions)
+
+def screens_differ(pixels_a, pixels_b):
+    """Средняя разница яркости выше порога (шум сжатия сменой не считается)"""
+    return luma_difference(pixels_a, pixels_b) > SCREEN_CHANGE['diff_threshold']
+
+def source_hash(page_source):
+    """Хеш page_source"""
+    return hashlib.blake2b(page_source.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ScreenChangeDetector:
+    """Сравнивает текущий экран с исходным состоянием: скриншот по порогу, page_source по хешу
+
+    Исходное состояние снимается до действия (capture_baseline), ожидание - после.
+    """
+
+    def __init__(self, driver, ignore_regions=None):
+        self.driver = driver
+        self.ignore_regions = SCREEN_CHANGE['ignore_regions'] + list(ignore_regions or [])
+        self.baseline = None
+        self.polls = 0
+
+    def screen_state(self):
+        """Уменьшенная копия текущего скриншота"""
+        with Frame.capture(self.driver) as frame:
+            return screen_pixels(frame.image, self.ignore_regions)
+
+    def source_state(self):
+        """Хеш page_source"""
+        return source_hash(self.driver.page_source)
+
+    def capture_baseline(self, initial_source=None):
+        """Запомнить исходное состояние (page_source можно передать уже полученный)"""
+        source = source_hash(initial_source) if initial_source is not None else self.source_state()
+        self.baseline = (self.screen_state(), source)
+        return self
+
+    def use_source_baseline(self, initial_source):
+        """Исходное состояние только по page_source, снятому до действия (скриншот не сравнивается)"""
+        self.baseline = (None, source_hash(initial_source))
+        return self
+
+    def changed(self):
+        """Экран отличается от исходного; page_source запрашивается, только если скриншот не изменился"""
+        self.polls += 1
+        if self.baseline[0] is not None and screens_differ(self.screen_state(), self.baseline[0]):
+            return True
+        return self.source_state() != self.baseline[1]
+
+    def wait_for_change(self, timeout=10):
+        """Ждать смены экрана относительно исходного состояния, вернуть время до ее обнаружения в мс или None"""
+        if self.baseline is None:
+            raise RuntimeError("Исходное состояние экрана не снято: вызовите capture_baseline() до действия")
+
+        interval = SCREEN_CHANGE['initial_poll_interval']
+        start_time = time.perf_counter()
+        self.polls = 0
+
+        while True:
+            if self.changed():
+                elapsed_ms = round((time.perf_counter() - start_time) * 1000, 1)
+                print(f"✅ Экран изменился через {elapsed_ms:.1f}мс (опросов: {self.polls})")
+                return elapsed_ms
+
+            remaining = timeout - (time.perf_counter() - start_time)
+            if remaining <= 0:
+                return None
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * SCREEN_CHANGE['backoff'], SCREEN_CHANGE['max_poll_interval'])
@@ -0,0 +1,112 @@
+"""
+Кэш геометрии экрана на сессию и легкая проверка отзывчивости
+"""
+
+import time
+from config.settings import GEOMETRY_CONFIG
+
+# Геометрия по id сессии Appium
+_geometries = {}
+
+
+def get_screen_geometry(driver):
+    """Геометрия экрана для сессии драйвера (одна на сессию)"""
+    session_id = driver.session_id
+    geometry = _geometries.get(session_id)
+
+    if geometry is None or geometry.driver is not driver:
+        geometry = ScreenGeometry(driver)
+        _geometries[session_id] = geometry
+
+    return geometry
+
+
+class ScreenGeometry:
+    """Размер окна, плотность и ориентация экрана без повторных запросов к устройству"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._size = None
+        self._density = None
+        self._orientation = None
+        self.probe_latencies = []
+
+    def window_size(self, refresh=False):
+        """Размер окна {'width', 'height'}; запрашивается только после сброса кэша"""
+        if self._size is None or refresh:
+            size = self.driver.get_window_size()
+            self._size = {'width': size['width'], 'height': size['height']}
+        return dict(self._size)
+
+    def density(self):
+        """Плотность экрана (dpi) или None, если драйвер ее не отдает"""
+        if self._density is None:
+            try:
+                self._density = self.driver.get_display_density()
+            except Exception as e:
+                print(f"⚠️ Не удалось получить плотность экрана: {e}")
+        return self._density
+
+    def orientation(self):
+        """Текущая ориентация 'PORTRAIT' / 'LANDSCAPE'"""
+        if self._orientation is None:
+            self._orientation = self.driver.orientation
+        return self._orientation
+
+    def set_orientation(self, orientation):
+        """Сменить ориентацию и сбросить кэш размеров (даже если смена не удалась)"""
+        try:
+            self.driver.orientation = orientation
+        finally:
+            self.invalidate()
+
+    def invalidate(self):
+        """Сбросить кэш (смена ориентации или разрешения)"""
+        self._size = None
+        self._density = None
+        self._orientation = None
+
+    def resolution_changed(self):
+        """Проверить, не сменилось ли разрешение; при смене кэш обновляется"""
+        cached = self._size
+        current = self.window_size(refresh=True)
+        if cached is not None and cached != current:
+            print(f"📱 Разрешение сменилось: {cached} -> {current}")
+            self._density = None
+            self._orientation = None
+            return True
+        return False
+
+    def probe(self):
+        """Легкий запрос для замера отзывчивости, время в секундах"""
+        start_time = time.perf_counter()
+
+        if GEOMETRY_CONFIG['probe_command'] == 'status':
+            self.driver.get_status()
+        else:
+            self.driver.current_package
+
+        latency = time.perf_counter() - start_time
+        self.probe_latencies.append(latency)
+        return latency
+
+    def probe_histogram(self):
+        """Гистограмма задержек проверок {'<=50мс': n, ...}"""
+        buckets = GEOMETRY_CONFIG['probe_buckets_ms']
+        histogram = {f"<={limit}мс": 0 for limit in buckets}
+        histogram[f">{buckets[-1]}мс"] = 0
+
+        for latency in self.probe_latencies:
+            latency_ms = latency * 1000
+            for limit in buckets:
+                if latency_ms <= limit:
+                    histogram[f"<={limit}мс"] += 1
+                    break
+            else:
+                histogram[f">{buckets[-1]}мс"] += 1
+
+        return histogram
+
+    def reset_probes(self):
+        """Очистить замеры перед следующим тестом"""
+        self.probe_latencies = []
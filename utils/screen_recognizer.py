@@ -0,0 +1,134 @@
+"""
+Определение текущего экрана по перцептивному хешу кадра (dHash) без XPath
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from PIL import Image
+from config.settings import SCREEN_RECOGNITION
+from utils.frames import Frame
+
+_recognizer = None
+
+
+def dhash(image, hash_size=None):
+    """Разностный хеш: знаки перепадов яркости соседних пикселей уменьшенного кадра (упакованные биты)"""
+    hash_size = hash_size or SCREEN_RECOGNITION['hash_size']
+    pixels = np.asarray(image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    bits = pixels[:, 1:] > pixels[:, :-1]
+    return np.packbits(bits.flatten())
+
+def hamming_distances(hashes, value):
+    """Расстояния Хэмминга от хеша до каждой строки матрицы хешей"""
+    return np.unpackbits(np.bitwise_xor(hashes, value), axis=1).sum(axis=1)
+
+def get_screen_recognizer():
+    """Общий распознаватель с индексом из data/screen_index.json"""
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = ScreenRecognizer(ScreenIndex.load())
+    return _recognizer
+
+
+class ScreenIndex:
+    """Размеченные эталонные кадры: метка экрана и его хеш"""
+
+    def __init__(self, hash_size=None, path=None):
+        self.hash_size = hash_size or SCREEN_RECOGNITION['hash_size']
+        self.path = path or SCREEN_RECOGNITION['index_file']
+        self.labels = []
+        self.hashes = np.zeros((0, self.hash_size * self.hash_size // 8), dtype=np.uint8)
+
+    @classmethod
+    def load(cls, path=None):
+        """Загрузить индекс (пустой, если файла нет)"""
+        path = path or SCREEN_RECOGNITION['index_file']
+        if not os.path.exists(path):
+            return cls(path=path)
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        index = cls(data.get('hash_size'), path)
+        for screen in data.get('screens', []):
+            index._append(screen['label'], np.frombuffer(bytes.fromhex(screen['hash']), dtype=np.uint8))
+        return index
+
+    def _append(self, label, value):
+        self.labels.append(label)
+        self.hashes = np.vstack([self.hashes, value[np.newaxis, :]])
+
+    def add(self, label, image):
+        """Добавить эталонный кадр экрана"""
+        self._append(label, dhash(image, self.hash_size))
+
+    def save(self):
+        """Записать индекс"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        screens = [{'label': label, 'hash': value.tobytes().hex()} for label, value in zip(self.labels, self.hashes)]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'hash_size': self.hash_size, 'screens': screens}, f, indent=2, ensure_ascii=False)
+
+    def has_label(self, label):
+        return label in self.labels
+
+    def nearest(self, value):
+        """Ближайший эталон: (метка, расстояние) или (None, None) для пустого индекса"""
+        if not self.labels:
+            return None, None
+        distances = hamming_distances(self.hashes, value)
+        best = int(distances.argmin())
+        return self.labels[best], int(distances[best])
+
+
+class ScreenRecognizer:
+    """Ответ на вопрос "какой это экран" по одному кадру"""
+
+    def __init__(self, index):
+        self.index = index
+
+    def recognize_image(self, image):
+        """(метка, расстояние) ближайшего эталона; метка None, если эталон слишком далеко"""
+        start_time = time.perf_counter()
+        label, distance = self.index.nearest(dhash(image, self.index.hash_size))
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        if label is None or distance > SCREEN_RECOGNITION['max_distance']:
+            return None, distance
+
+        print(f"🧭 Экран распознан: {label} (расстояние {distance}, {elapsed_ms:.1f}мс)")
+        return label, distance
+
+    def recognize(self, driver):
+        """Распознать текущий экран по одному скриншоту"""
+        if not self.index.labels:
+            return None, None
+        with Frame.capture(driver) as frame:
+            return self.recognize_image(frame.image)
+
+
+def main():
+    """Пополнение индекса: python -m utils.screen_recognizer <метка> <скриншот.png> [...]"""
+    parser = argparse.ArgumentParser(description="Добавить эталонные скриншоты экрана в индекс")
+    parser.add_argument("label", help="Метка экрана (main_menu, level_map, game_board, ...)")
+    parser.add_argument("screenshots", nargs='+', help="PNG скриншоты этого экрана")
+    args = parser.parse_args()
+
+    index = ScreenIndex.load()
+    for path in args.screenshots:
+        with Image.open(path) as image:
+            index.add(args.label, image)
+        print(f"✅ {path} -> {args.label}")
+
+    index.save()
+    print(f"📁 Индекс сохранен: {index.path} ({len(index.labels)} кадров)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Сохранение скриншотов в фоне: тест только получает кадр, декодирование и запись - в пуле потоков
+"""
+
+import base64
+import io
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from PIL import Image
+from config.settings import CAPTURE, DEVICE_CONFIG, SCREENSHOTS
+from utils.framebuffer import get_framebuffer
+
+# Порядковый номер файла в процессе (несколько снимков в одну миллисекунду)
+_file_counter = itertools.count(1)
+_writer = None
+
+
+def unique_filename(name, extension, directory=None):
+    """reports/<имя>_<дата_время_мс>_<номер>.<расширение> - без перезаписи снимков одной секунды"""
+    directory = directory or SCREENSHOTS['directory']
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+    return f"{directory}/{name}_{timestamp}_{next(_file_counter)}.{extension}"
+
+def get_screenshot_writer():
+    """Общий пул записи скриншотов процесса"""
+    global _writer
+    if _writer is None:
+        _writer = ScreenshotWriter(SCREENSHOTS['writer_workers'], SCREENSHOTS['max_pending'])
+    return _writer
+
+def shutdown_screenshot_writer():
+    """Дописать все файлы и остановить пул (конец сессии)"""
+    global _writer
+    if _writer is not None:
+        _writer.shutdown()
+        _writer = None
+
+
+class ScreenshotWriter:
+    """Ограниченный пул записи: при max_pending незаписанных кадров тест ждет освобождения места"""
+
+    def __init__(self, workers=2, max_pending=8):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="screenshot-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = []
+        self.errors = []
+        self.written = 0
+
+    def capture(self, driver, name="screenshot"):
+        """Получить скриншот (в потоке теста) и поставить запись в очередь, вернуть имя файла"""
+        if CAPTURE['backend'] == 'adb_raw':
+            try:
+                return self.save_pixels(get_framebuffer(DEVICE_CONFIG['udid']).capture(), name)
+            except Exception as e:
+                print(f"⚠️ screencap недоступен, скриншот через Appium: {e}")
+
+        filename = unique_filename(name, "png")
+        self._submit(self._write_base64, filename, driver.get_screenshot_as_base64())
+        return filename
+
+    def save_pixels(self, pixels, name="screenshot"):
+        """Поставить в очередь кодирование RGBA пикселей в PNG и запись"""
+        filename = unique_filename(name, "png")
+        self._submit(self._write_pixels, filename, pixels)
+        return filename
+
+    def save_png(self, png, name="screenshot"):
+        """Поставить в очередь запись уже полученного PNG"""
+        filename = unique_filename(name, "png")
+        self._submit(self._write_bytes, filename, png)
+        return filename
+
+    def save_text(self, text, name, extension):
+        """Поставить в очередь запись текста (page_source и т.п.)"""
+        filename = unique_filename(name, extension)
+        self._submit(self._write_bytes, filename, text.encode('utf-8'))
+        return filename
+
+    def _submit(self, write, filename, data):
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write, filename, data)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda done: self._slots.release())
+        with self._lock:
+            self._pending.append((filename, future))
+
+    def _write_base64(self, filename, data):
+        self._write_bytes(filename, base64.b64decode(data))
+
+    def _write_pixels(self, filename, pixels):
+        buffer = io.BytesIO()
+        Image.fromarray(pixels, 'RGBA').save(buffer, format='PNG')
+        self._write_bytes(filename, buffer.getvalue())
+
+    def _write_bytes(self, filename, data):
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'wb') as f:
+            f.write(data)
+
+    def flush(self):
+        """Дождаться записи всех файлов, вернуть список ошибок [(файл, ошибка)]"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        errors = []
+        for filename, future in pending:
+            error = future.exception()
+            if error is None:
+                self.written += 1
+            else:
+                errors.append((filename, error))
+                print(f"❌ Не удалось сохранить {filename}: {error}")
+
+        self.errors.extend(errors)
+        return errors
+
+    def shutdown(self):
+        """Дописать очередь и остановить потоки"""
+        self.flush()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,240 @@
+"""
+Поиск кнопок по шаблонам изображений: пирамида масштабов, нормированная кросс-корреляция и кэш позиций
+"""
+
+import os
+import numpy as np
+from PIL import Image
+from config.settings import TEMPLATE_MATCHING
+from utils.frames import Frame
+
+# Стратегия локатора: ('template', '<имя шаблона>') - файл data/templates/<имя>.png
+TEMPLATE = 'template'
+
+_locator = None
+
+
+def gray_array(image):
+    """Яркость изображения в float32"""
+    return np.asarray(image.convert('L'), dtype=np.float32)
+
+def resize_array(array, scale):
+    """Масштабировать массив яркости"""
+    height, width = array.shape
+    size = (max(int(round(width * scale)), 1), max(int(round(height * scale)), 1))
+    return np.asarray(Image.fromarray(array).resize(size, Image.BILINEAR), dtype=np.float32)
+
+def _window_sums(values, height, width):
+    """Суммы по всем окнам height x width через интегральное изображение"""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0, dtype=np.float64).cumsum(axis=1)
+    return (integral[height:, width:] - integral[:-height, width:]
+            - integral[height:, :-width] + integral[:-height, :-width])
+
+def ncc_map(image, template):
+    """Нормированная кросс-корреляция шаблона во всех позициях изображения (режим valid)"""
+    height, width = template.shape
+    if height > image.shape[0] or width > image.shape[1]:
+        return None
+
+    centered = template - template.mean()
+    template_norm = np.sqrt((centered ** 2).sum())
+    if template_norm == 0:
+        return None
+
+    # Числитель через FFT: шаблон с нулевым средним, среднее окна не нужно
+    shape = image.shape
+    numerator = np.fft.irfft2(np.fft.rfft2(image, shape) * np.conj(np.fft.rfft2(centered, shape)), shape)
+    numerator = numerator[:shape[0] - height + 1, :shape[1] - width + 1]
+
+    count = height * width
+    sums = _window_sums(image, height, width)
+    variance = _window_sums(image.astype(np.float64) ** 2, height, width) - sums ** 2 / count
+    denominator = np.sqrt(np.maximum(variance, 0)) * template_norm
+
+    result = np.zeros(numerator.shape, dtype=np.float32)
+    valid = denominator > 1e-3 * template_norm
+    result[valid] = numerator[valid] / denominator[valid]
+    return result
+
+def ncc_at(image, template, x, y):
+    """Корреляция шаблона в одной позиции (повторная проверка кэша)"""
+    height, width = template.shape
+    window = image[y:y + height, x:x + width]
+    if window.shape != template.shape:
+        return 0.0
+
+    a = window - window.mean()
+    b = template - template.mean()
+    denominator = np.sqrt((a ** 2).sum() * (b ** 2).sum())
+    return float((a * b).sum() / denominator) if denominator > 0 else 0.0
+
+def get_template_locator():
+    """Общий поиск по шаблонам процесса (шаблоны и кэш позиций загружаются один раз)"""
+    global _locator
+    if _locator is None:
+        _locator = TemplateLocator()
+    return _locator
+
+
+class TemplateMatch:
+    """Найденная по шаблону кнопка; ведет себя как элемент для click()"""
+
+    def __init__(self, name, box, score, scale, cached=False, driver=None):
+        self.name = name
+        self.box = box  # (x, y, ширина, высота) в координатах экрана
+        self.score = score
+        self.scale = scale
+        self.cached = cached
+        self.driver = driver
+        self.text = ''
+
+    @property
+    def center(self):
+        """Точка тапа (x, y)"""
+        x, y, width, height = self.box
+        return x + width // 2, y + height // 2
+
+    @property
+    def rect(self):
+        x, y, width, height = self.box
+        return {'x': x, 'y': y, 'width': width, 'height': height}
+
+    def to_screen(self, image_size, window_size):
+        """Пересчитать из пикселей скриншота в координаты окна Appium"""
+        sx = window_size['width'] / image_size[0]
+        sy = window_size['height'] / image_size[1]
+        x, y, width, height = self.box
+        self.box = (int(x * sx), int(y * sy), int(width * sx), int(height * sy))
+        return self
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        """Тап в центр найденной кнопки"""
+        self.driver.tap([self.center])
+
+    def __repr__(self):
+        return f"<TemplateMatch {self.name} box={self.box} score={self.score:.2f} scale={self.scale:.2f}>"
+
+
+class TemplateLocator:
+    """Шаблоны кнопок из data/templates и кэш позиций по (разрешение, экран, шаблон)"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or TEMPLATE_MATCHING['directory']
+        self._templates = {}
+        self._scaled = {}
+        self._cache = {}  # {(ширина, высота, экран, шаблон): (x, y, масштаб)}
+        self._missing = set()
+
+    def template(self, name):
+        """Шаблон в оттенках серого или None, если файла нет"""
+        if name not in self._templates:
+            path = os.path.join(self.directory, f"{name}.png")
+            if not os.path.exists(path):
+                if name not in self._missing:
+                    print(f"⚠️ Нет шаблона {path}")
+                    self._missing.add(name)
+                return None
+            with Image.open(path) as image:
+                self._templates[name] = gray_array(image)
+        return self._templates[name]
+
+    def _scaled_template(self, name, scale):
+        key = (name, round(scale, 4))
+        if key not in self._scaled:
+            self._scaled[key] = resize_array(self._templates[name], scale)
+        return self._scaled[key]
+
+    def _verify_cached(self, gray, name, key):
+        x, y, scale = self._cache[key]
+        template = self._scaled_template(name, scale)
+        score = ncc_at(gray, template, x, y)
+        if score < TEMPLATE_MATCHING['verify_threshold']:
+            return None
+        height, width = template.shape
+        return TemplateMatch(name, (x, y, width, height), score, scale, cached=True)
+
+    def _search(self, gray, name):
+        """Грубый поиск по всем масштабам на уменьшенном кадре, уточнение в окрестности на полном"""
+        template = self._templates[name]
+        base = gray.shape[1] / TEMPLATE_MATCHING['reference_width']
+
+        reduce = min(TEMPLATE_MATCHING['analysis_max_side'] / max(gray.shape), 1.0)
+        small = resize_array(gray, reduce) if reduce < 1.0 else gray
+
+        best = None
+        for factor in TEMPLATE_MATCHING['scales']:
+            scale = base * factor
+            scores = ncc_map(small, resize_array(template, scale * reduce))
+            if scores is None:
+                continue
+            y, x = np.unravel_index(int(scores.argmax()), scores.shape)
+            if best is None or scores[y, x] > best[0]:
+                best = (float(scores[y, x]), x, y, scale)
+
+        if best is None:
+            return None
+
+        score, x, y, scale = best
+        full = self._scaled_template(name, scale)
+        height, width = full.shape
+
+        # Уточнение: окно вокруг грубой позиции на кадре полного размера
+        margin = int(np.ceil(1 / reduce)) + TEMPLATE_MATCHING['refine_margin']
+        x0 = max(int(x / reduce) - margin, 0)
+        y0 = max(int(y / reduce) - margin, 0)
+        x1 = min(int(x / reduce) + width + margin, gray.shape[1])
+        y1 = min(int(y / reduce) + height + margin, gray.shape[0])
+        scores = ncc_map(gray[y0:y1, x0:x1], full)
+        if scores is not None:
+            dy, dx = np.unravel_index(int(scores.argmax()), scores.shape)
+            score, x, y = float(scores[dy, dx]), x0 + dx, y0 + dy
+        else:
+            x, y = int(x / reduce), int(y / reduce)
+
+        if score < TEMPLATE_MATCHING['threshold']:
+            return None
+        return TemplateMatch(name, (int(x), int(y), width, height), score, scale)
+
+    def locate(self, image, name, screen=None):
+        """Найти шаблон на кадре: TemplateMatch в пикселях кадра или None"""
+        if self.template(name) is None:
+            return None
+
+        gray = gray_array(image)
+        key = (image.size[0], image.size[1], screen, name)
+
+        if key in self._cache:
+            match = self._verify_cached(gray, name, key)
+            if match is not None:
+                return match
+
+        match = self._search(gray, name)
+        if match is None:
+            self._cache.pop(key, None)
+            return None
+
+        self._cache[key] = (match.box[0], match.box[1], match.scale)
+        return match
+
+    def find(self, driver, name, screen=None, window_size=None):
+        """Найти шаблон на текущем экране: TemplateMatch в координатах окна или None"""
+        if self.template(name) is None:
+            return None
+
+        with Frame.capture(driver) as frame:
+            match = self.locate(frame.image, name, screen)
+            image_size = frame.size
+
+        if match is None:
+            return None
+
+        match.driver = driver
+        if window_size:
+            match.to_screen(image_size, window_size)
+        return match
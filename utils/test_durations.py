@@ -0,0 +1,84 @@
+"""
+История длительностей тестов и шардирование по устройствам (LPT)
+"""
+
+import heapq
+import json
+import os
+from config.settings import PARALLEL_CONFIG
+
+
+def load_durations(path=None):
+    """Загрузить историю длительностей {nodeid: секунды}"""
+    path = path or PARALLEL_CONFIG['durations_file']
+
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Не удалось прочитать историю длительностей: {e}")
+        return {}
+
+def merge_durations(history, measured):
+    """Обновить историю новыми замерами со сглаживанием"""
+    weight = PARALLEL_CONFIG['duration_smoothing']
+    merged = dict(history)
+
+    for nodeid, duration in measured.items():
+        if nodeid in merged:
+            merged[nodeid] = (1 - weight) * merged[nodeid] + weight * duration
+        else:
+            merged[nodeid] = duration
+
+    return merged
+
+def save_durations(measured, path=None):
+    """Дописать замеры текущего прогона в историю"""
+    path = path or PARALLEL_CONFIG['durations_file']
+    merged = merge_durations(load_durations(path), measured)
+
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+    return merged
+
+def estimate_duration(nodeid, durations):
+    """Оценка длительности теста: история теста, затем среднее по файлу, затем дефолт"""
+    if nodeid in durations:
+        return durations[nodeid]
+
+    test_file = nodeid.split("::")[0]
+    same_file = [d for n, d in durations.items() if n.split("::")[0] == test_file]
+    if same_file:
+        return sum(same_file) / len(same_file)
+
+    return PARALLEL_CONFIG['default_test_duration']
+
+def shard_tests(test_ids, durations, workers_count):
+    """Разложить тесты по воркерам: самый длинный - на наименее загруженный"""
+    shards = [[] for _ in range(workers_count)]
+    loads = [0.0] * workers_count
+
+    if workers_count == 0:
+        return shards, loads
+
+    estimated = sorted(
+        ((estimate_duration(nodeid, durations), nodeid) for nodeid in test_ids),
+        key=lambda item: (-item[0], item[1])
+    )
+
+    heap = [(0.0, i) for i in range(workers_count)]
+    for duration, nodeid in estimated:
+        load, i = heapq.heappop(heap)
+        shards[i].append(nodeid)
+        loads[i] = load + duration
+        heapq.heappush(heap, (loads[i], i))
+
+    return shards, loads
@@ -0,0 +1,186 @@
+"""
+Трассировка команд драйвера и пауз с экспортом в формат Chrome trace (Perfetto)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+
+# Свойства драйвера, чтение которых - это HTTP-команда к Appium
+TRACED_PROPERTIES = {
+    'page_source', 'orientation', 'current_activity', 'current_package',
+    'contexts', 'current_context', 'capabilities'
+}
+
+# Откуда берем метку "метод page object / хелпера" для спана
+_TAG_DIRS = (os.sep + 'pages' + os.sep, os.sep + 'utils' + os.sep)
+
+# Сводка по всем тестам сессии: {команда: [длительности в нс]}
+_session_durations = defaultdict(list)
+
+_original_sleep = time.sleep
+
+
+def _caller_tag():
+    """Цепочка методов page object / хелперов, из которых вызвана команда"""
+    chain = []
+    frame = sys._getframe(2)
+
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if os.path.basename(filename).startswith('test_'):
+            break
+        if filename != __file__ and any(d in filename for d in _TAG_DIRS):
+            owner = frame.f_locals.get('self')
+            if owner is not None:
+                chain.append(f"{type(owner).__name__}.{frame.f_code.co_name}")
+            else:
+                module = os.path.splitext(os.path.basename(filename))[0]
+                chain.append(f"{module}.{frame.f_code.co_name}")
+        frame = frame.f_back
+
+    return " > ".join(reversed(chain)) or None
+
+
+class CommandTracer:
+    """Спаны команд драйвера и пауз одного теста"""
+
+    def __init__(self, test_name):
+        self.test_name = test_name
+        self.spans = []
+        self._start_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._test_thread = None
+
+    def record(self, name, category, start_ns, end_ns, tag=None):
+        """Записать один спан"""
+        with self._lock:
+            self.spans.append({
+                'name': name,
+                'cat': category,
+                'start_ns': start_ns,
+                'end_ns': end_ns,
+                'tid': threading.get_ident(),
+                'tag': tag
+            })
+
+    def traced_sleep(self, seconds):
+        """Замена time.sleep, которая пишет в трассу паузы потока теста"""
+        # Фоновые потоки (запись скриншотов, сбор памяти, поток кадров) - не паузы теста
+        if threading.get_ident() != self._test_thread:
+            return _original_sleep(seconds)
+
+        tag = _caller_tag()
+        start_ns = time.perf_counter_ns()
+        try:
+            _original_sleep(seconds)
+        finally:
+            self.record('time.sleep', 'sleep', start_ns, time.perf_counter_ns(), tag)
+
+    def patch_sleep(self):
+        """Подменить time.sleep; трассируются только паузы вызвавшего потока"""
+        self._test_thread = threading.get_ident()
+        time.sleep = self.traced_sleep
+
+    def restore_sleep(self):
+        time.sleep = _original_sleep
+
+    def to_chrome_trace(self):
+        """События в формате Chrome trace (ts/dur в микросекундах)"""
+        end_ns = time.perf_counter_ns()
+        events = [{
+            'name': self.test_name, 'cat': 'test', 'ph': 'X', 'pid': 1,
+            'tid': threading.get_ident(), 'ts': 0, 'dur': (end_ns - self._start_ns) / 1000
+        }]
+
+        for span in self.spans:
+            args = {'test': self.test_name}
+            if span['tag']:
+                args['page_method'] = span['tag']
+            events.append({
+                'name': span['name'],
+                'cat': span['cat'],
+                'ph': 'X',
+                'pid': 1,
+                'tid': span['tid'],
+                'ts': (span['start_ns'] - self._start_ns) / 1000,
+                'dur': (span['end_ns'] - span['start_ns']) / 1000,
+                'args': args
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, directory):
+        """Сохранить трассу теста и добавить ее в сводку сессии"""
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', self.test_name)
+        path = os.path.join(directory, f"trace_{safe_name}.json")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+        for span in self.spans:
+            _session_durations[span['name']].append(span['end_ns'] - span['start_ns'])
+
+        return path
+
+
+class TracingDriver:
+    """Обертка над драйвером Appium, которая замеряет каждую команду"""
+
+    def __init__(self, driver, tracer):
+        object.__setattr__(self, '_driver', driver)
+        object.__setattr__(self, '_tracer', tracer)
+
+    def __getattr__(self, name):
+        if name in TRACED_PROPERTIES:
+            tag = _caller_tag()
+            start_ns = time.perf_counter_ns()
+            try:
+                return getattr(self._driver, name)
+            finally:
+                self._tracer.record(name, 'driver', start_ns, time.perf_counter_ns(), tag)
+
+        value = getattr(self._driver, name)
+        if name.startswith('_') or not callable(value):
+            return value
+
+        def traced(*args, **kwargs):
+            tag = _caller_tag()
+            start_ns = time.perf_counter_ns()
+            try:
+                return value(*args, **kwargs)
+            finally:
+                self._tracer.record(name, 'driver', start_ns, time.perf_counter_ns(), tag)
+
+        return traced
+
+    def __setattr__(self, name, value):
+        start_ns = time.perf_counter_ns()
+        try:
+            setattr(self._driver, name, value)
+        finally:
+            self._tracer.record(f"set {name}", 'driver', start_ns, time.perf_counter_ns(), _caller_tag())
+
+
+def print_trace_summary(top_n=10):
+    """Самые затратные типы команд за всю сессию"""
+    if not _session_durations:
+        return
+
+    rows = []
+    for name, durations in _session_durations.items():
+        ordered = sorted(durations)
+        total_ms = sum(ordered) / 1e6
+        p95_ms = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] / 1e6
+        rows.append((total_ms, name, len(ordered), total_ms / len(ordered), p95_ms))
+
+    rows.sort(reverse=True)
+
+    print(f"\n🔬 Топ-{top_n} команд по суммарному времени:")
+    print(f"   {'команда':<28}{'вызовов':>9}{'всего, с':>11}{'среднее, мс':>14}{'p95, мс':>10}")
+    for total_ms, name, count, mean_ms, p95_ms in rows[:top_n]:
+        print(f"   {name:<28}{count:>9}{total_ms / 1000:>11.2f}{mean_ms:>14.1f}{p95_ms:>10.1f}")
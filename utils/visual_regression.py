@@ -0,0 +1,180 @@
+"""
+Сравнение кадров с эталонами: поблочная разница яркости, маски анимаций и тепловая карта отличий
+"""
+
+import hashlib
+import os
+import re
+import numpy as np
+from PIL import Image
+from config.settings import VISUAL_REGRESSION
+from utils.screenshot_writer import get_screenshot_writer
+
+
+def state_slug(state):
+    """Имя файла эталона по названию состояния"""
+    slug = re.sub(r'[^\w]+', '_', state.lower(), flags=re.UNICODE).strip('_')
+    return slug or 'state'
+
+def reduction_factor(size):
+    """Во сколько раз (степень двойки) кадр уменьшается для анализа"""
+    factor = 1
+    while max(size) // factor > VISUAL_REGRESSION['analysis_max_side']:
+        factor *= 2
+    return factor
+
+def luma_array(image):
+    """Яркость кадра, уменьшенного вдвое нужное число раз"""
+    image = image.convert('L')
+
+    factor = reduction_factor(image.size)
+    if factor > 1:
+        image = image.reduce(factor)
+
+    return np.asarray(image)
+
+def ignore_mask(shape, ignore_regions):
+    """Маска блоков (True - не сравнивать) по областям в долях экрана"""
+    rows, cols = shape
+    mask = np.zeros(shape, dtype=bool)
+
+    for x1, y1, x2, y2 in ignore_regions or []:
+        mask[int(y1 * rows):int(np.ceil(y2 * rows)), int(x1 * cols):int(np.ceil(x2 * cols))] = True
+
+    return mask
+
+def tile_differences(baseline, current, tile_size, mask=None):
+    """Средняя разница яркости по блокам tile_size x tile_size; одинаковые блоки пропускаются"""
+    rows = baseline.shape[0] // tile_size
+    cols = baseline.shape[1] // tile_size
+    shape = (rows, tile_size, cols, tile_size)
+
+    tiles_a = baseline[:rows * tile_size, :cols * tile_size].reshape(shape).swapaxes(1, 2)
+    tiles_b = current[:rows * tile_size, :cols * tile_size].reshape(shape).swapaxes(1, 2)
+
+    differences = np.zeros((rows, cols), dtype=np.float32)
+    changed = ~(tiles_a == tiles_b).all(axis=(2, 3))
+    if mask is not None:
+        changed &= ~mask
+
+    if changed.any():
+        diff = np.abs(tiles_a[changed].astype(np.int16) - tiles_b[changed].astype(np.int16))
+        differences[changed] = diff.mean(axis=(1, 2))
+
+    return differences
+
+def render_heatmap(image, differences, threshold, tile_pixels):
+    """Кадр с наложенными красным блоками, где разница выше порога (RGBA массив)
+
+    Блок (row, col) закрашивается в точности на своем месте кадра: с (col * tile, row * tile),
+    последние строка и столбец обрезаются по краю; остаток кадра вне сетки не закрашивается.
+    """
+    rgba = np.array(image.convert('RGBA'))
+    height, width = rgba.shape[:2]
+
+    intensity = (np.clip(differences / max(threshold, 1e-6), 0, 2) / 2).astype(np.float32)
+    tiles = np.repeat(np.repeat(intensity, tile_pixels, axis=0), tile_pixels, axis=1)[:height, :width]
+    overlay = np.zeros((height, width), dtype=np.float32)
+    overlay[:tiles.shape[0], :tiles.shape[1]] = tiles
+
+    alpha = overlay * 0.7
+    rgba[..., 0] = rgba[..., 0] * (1 - alpha) + 255 * alpha
+    rgba[..., 1] = rgba[..., 1] * (1 - alpha)
+    rgba[..., 2] = rgba[..., 2] * (1 - alpha)
+    return rgba
+
+
+class BaselineStore:
+    """Эталонные кадры по состояниям экрана и разрешению устройства в data/baselines"""
+
+    def __init__(self, directory=None):
+        self.directory = directory or VISUAL_REGRESSION['baseline_dir']
+
+    def path(self, state, size):
+        """Файл эталона: <состояние>_<ширина>x<высота>.png"""
+        width, height = size
+        return os.path.join(self.directory, f"{state_slug(state)}_{width}x{height}.png")
+
+    def load(self, state, size):
+        """Эталон состояния для разрешения или None"""
+        path = self.path(state, size)
+        if not os.path.exists(path):
+            return None
+        with Image.open(path) as image:
+            image.load()
+            return image.copy()
+
+    def save(self, state, image):
+        """Записать эталон для разрешения кадра"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(state, image.size)
+        image.save(path, format='PNG')
+        return path
+
+
+class VisualRegression:
+    """Сравнение кадров состояний с эталонами; эталоны записываются только в режиме update"""
+
+    def __init__(self, store=None, update=None):
+        self.store = store or BaselineStore()
+        self.update = VISUAL_REGRESSION['update_baselines'] if update is None else update
+        self._baseline_cache = {}
+
+    def _baseline(self, state, size):
+        key = (state, size)
+        if key not in self._baseline_cache:
+            baseline = self.store.load(state, size)
+            self._baseline_cache[key] = None if baseline is None else luma_array(baseline)
+        return self._baseline_cache[key]
+
+    def compare(self, state, image, ignore_regions=None):
+        """Сравнить кадр с эталоном состояния, вернуть результат сравнения"""
+        if self.update:
+            path = self.store.save(state, image)
+            self._baseline_cache.pop((state, image.size), None)
+            print(f"   🆕 Эталон сохранен: {path}")
+            return {'state': state, 'status': 'new', 'passed': True, 'baseline': path}
+
+        baseline = self._baseline(state, image.size)
+        if baseline is None:
+            path = self.store.path(state, image.size)
+            print(f"   ⚠️ Нет эталона {path} (UPDATE_BASELINES=1 - записать)")
+            return {'state': state, 'status': 'missing', 'passed': False, 'baseline': path}
+
+        current = luma_array(image)
+
+        if baseline.shape != current.shape:
+            return {'state': state, 'status': 'size_mismatch', 'passed': False,
+                    'baseline_size': baseline.shape, 'current_size': current.shape}
+
+        # Полностью одинаковые кадры - без поблочного сравнения
+        if hashlib.blake2b(baseline.tobytes()).digest() == hashlib.blake2b(current.tobytes()).digest():
+            return {'state': state, 'status': 'identical', 'passed': True, 'changed_ratio': 0.0, 'max_tile_diff': 0.0}
+
+        tile_size = VISUAL_REGRESSION['tile_size']
+        grid = (baseline.shape[0] // tile_size, baseline.shape[1] // tile_size)
+        regions = list(VISUAL_REGRESSION['ignore_regions']) + list(ignore_regions or [])
+        mask = ignore_mask(grid, regions)
+
+        differences = tile_differences(baseline, current, tile_size, mask)
+        threshold = VISUAL_REGRESSION['tile_threshold']
+        changed = differences > threshold
+        compared_tiles = max(int((~mask).sum()), 1)
+        changed_ratio = float(changed.sum()) / compared_tiles
+
+        result = {
+            'state': state,
+            'status': 'compared',
+            'changed_tiles': int(changed.sum()),
+            'changed_ratio': changed_ratio,
+            'max_tile_diff': float(differences.max()),
+            'mean_diff': float(differences[~mask].mean()) if (~mask).any() else 0.0,
+            'passed': changed_ratio <= VISUAL_REGRESSION['max_changed_ratio']
+        }
+
+        if changed.any():
+            tile_pixels = tile_size * reduction_factor(image.size)
+            heatmap = render_heatmap(image, differences, threshold, tile_pixels)
+            result['heatmap'] = get_screenshot_writer().save_pixels(heatmap, f"diff_{state_slug(state)}")
+
+        return result
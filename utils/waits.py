@@ -0,0 +1,163 @@
+"""
+Единый движок ожиданий: бюджет времени на тест, отключение неявных ожиданий, общий опрос условий
+"""
+
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from config.settings import TIMEOUTS, WAITS
+
+# Движок ожиданий по id сессии Appium
+_engines = {}
+
+# Ошибки "элемента пока нет" - условие просто не выполнено; остальные (сессия умерла) пробрасываются
+RETRY_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+
+def get_wait_engine(driver):
+    """Движок ожиданий для сессии драйвера"""
+    session_id = driver.session_id
+    engine = _engines.get(session_id)
+
+    if engine is None or engine.driver is not driver:
+        engine = WaitEngine(driver)
+        _engines[session_id] = engine
+
+    return engine
+
+def start_test_waits(driver, budget=None):
+    """Новый движок с бюджетом на тест (вызывается из фикстуры driver)"""
+    engine = WaitEngine(driver, budget if budget is not None else WAITS['test_budget'])
+    _engines[driver.session_id] = engine
+    return engine
+
+
+# Условия: функция от драйвера, возвращающая результат или пустое значение
+
+def presence(by, value):
+    """Первый найденный элемент"""
+    def condition(driver):
+        elements = driver.find_elements(by, value)
+        return elements[0] if elements else None
+    return condition
+
+def all_present(by, value):
+    """Все найденные элементы"""
+    def condition(driver):
+        return driver.find_elements(by, value)
+    return condition
+
+def clickable(by, value):
+    """Первый видимый и доступный элемент"""
+    def condition(driver):
+        for element in driver.find_elements(by, value):
+            if element.is_displayed() and element.is_enabled():
+                return element
+        return None
+    return condition
+
+def absence(by, value):
+    """Элементов больше нет"""
+    def condition(driver):
+        return not driver.find_elements(by, value)
+    return condition
+
+
+class WaitEngine:
+    """Ожидания теста: общий бюджет, опрос без неявных ожиданий и метрики по условиям"""
+
+    def __init__(self, driver, budget=None):
+        self.driver = driver
+        self.budget = budget
+        self.spent = 0.0
+        self.metrics = {}  # {условие: {'calls', 'time' (время проверок условия), 'timeouts'}}
+        self.last_eval_times = {}
+        self._suspended = 0
+        self._budget_warned = False
+
+    def remaining(self):
+        """Сколько секунд бюджета осталось (None - без ограничения)"""
+        if self.budget is None:
+            return None
+        return max(self.budget - self.spent, 0.0)
+
+    @contextmanager
+    def implicit_wait_suspended(self):
+        """Неявное ожидание 0 на время опроса, затем возвращается значение из настроек"""
+        if self._suspended == 0:
+            self.driver.implicitly_wait(0)
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+            if self._suspended == 0:
+                self.driver.implicitly_wait(TIMEOUTS['implicit_wait'])
+
+    def _limit_timeout(self, timeout):
+        remaining = self.remaining()
+        if remaining is None or timeout <= remaining:
+            return timeout
+
+        if not self._budget_warned:
+            print(f"⚠️ Бюджет ожиданий теста ({self.budget}с) исчерпан, дальше только одна проверка")
+            self._budget_warned = True
+        return remaining
+
+    def _evaluate(self, condition):
+        try:
+            return condition(self.driver)
+        except RETRY_EXCEPTIONS:
+            return None
+
+    def wait_any(self, conditions, timeout=None):
+        """Опрашивать несколько условий за один цикл; вернуть (имя, результат) первого выполненного
+
+        conditions - список пар (имя, условие); в каждом цикле условия проверяются по порядку.
+        Если ни одно не выполнилось за timeout, возвращается (None, None).
+        """
+        timeout = self._limit_timeout(TIMEOUTS['element_wait'] if timeout is None else timeout)
+        self.last_eval_times = {name: 0.0 for name, condition in conditions}
+        start_time = time.perf_counter()
+        found_name, found_value = None, None
+
+        with self.implicit_wait_suspended():
+            while found_name is None:
+                for name, condition in conditions:
+                    eval_start = time.perf_counter()
+                    value = self._evaluate(condition)
+                    self.last_eval_times[name] += time.perf_counter() - eval_start
+                    if value:
+                        found_name, found_value = name, value
+                        break
+
+                elapsed = time.perf_counter() - start_time
+                if found_name is not None or elapsed >= timeout:
+                    break
+                time.sleep(min(WAITS['poll_interval'], timeout - elapsed))
+
+        elapsed = time.perf_counter() - start_time
+        self.spent += elapsed
+
+        for name, condition in conditions:
+            metric = self.metrics.setdefault(name, {'calls': 0, 'time': 0.0, 'timeouts': 0})
+            metric['calls'] += 1
+            metric['time'] = round(metric['time'] + self.last_eval_times[name], 3)
+            if found_name is None:
+                metric['timeouts'] += 1
+
+        return found_name, found_value
+
+    def until(self, name, condition, timeout=None):
+        """Ждать одно условие, вернуть его результат или None"""
+        found_name, value = self.wait_any([(name, condition)], timeout)
+        return value
+
+    def check(self, name, condition):
+        """Одна проверка без ожидания"""
+        return self.until(name, condition, timeout=0)
+
+    def summary(self):
+        """Метрики для отчета: общее время ожиданий и самые затратные условия"""
+        top = sorted(self.metrics.items(), key=lambda item: -item[1]['time'])[:WAITS['report_top_n']]
+        return {'total_wait_time': round(self.spent, 3), 'conditions': dict(top)}